@@ -0,0 +1,131 @@
+# src/api/executor.py
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Callable, Dict, Optional
+from src.utils.pools import spawn_pool
+
+logger = logging.getLogger(__name__)
+
+
+class Overloaded(Exception):
+    """The pool already holds max_workers running plus max_queue waiting calls."""
+    def __init__(self, pool: str, retry_after: int = 1):
+        super().__init__(f"The {pool} pool is at capacity, retry later")
+        self.pool = pool
+        self.retry_after = retry_after
+
+
+class WorkloadTimeout(Exception):
+    """A call did not finish within the pool's timeout."""
+    def __init__(self, pool: str, timeout: float):
+        super().__init__(f"The {pool} request did not finish within {timeout:g}s")
+        self.pool = pool
+        self.timeout = timeout
+
+
+def _init_process(torch_threads: Optional[int]):
+    if torch_threads:
+        import torch
+        torch.set_num_threads(torch_threads)
+
+
+class WorkloadPool:
+    """
+    Bounded executor for one class of endpoint work (e.g. online queries vs. fits), so a
+    slow class cannot take the threads of another.
+
+    At most `max_workers` calls run and `max_queue` wait; beyond that submit raises
+    Overloaded right away instead of queueing without limit. A call that exceeds `timeout`
+    raises WorkloadTimeout: a queued call is dropped, a running one cannot be interrupted,
+    so it keeps its slot until it finishes and still counts against the limit.
+
+    With processes, functions and arguments must be picklable; worker processes set
+    their torch intra-op threads to `torch_threads`.
+    """
+    def __init__(self, name: str, max_workers: int = 2, max_queue: int = 8, timeout: Optional[float] = None,
+                 processes: bool = False, torch_threads: Optional[int] = None):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.processes = processes
+        self.torch_threads = torch_threads
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._rejected = 0
+
+    def _ensure_executor(self) -> Executor:
+        if self._executor is None:
+            if self.processes:
+                self._executor = spawn_pool(self.max_workers, initializer=_init_process,
+                                            initargs=(self.torch_threads,))
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix=f"rcie-{self.name}")
+        return self._executor
+
+    def _release(self, _future: Future):
+        with self._lock:
+            self._in_flight -= 1
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise Overloaded(self.name, retry_after=max(1, int(self.timeout or 1) // 10))
+            self._in_flight += 1
+            try:
+                future = self._ensure_executor().submit(fn, *args, **kwargs)
+            except Exception:
+                self._in_flight -= 1
+                raise
+        future.add_done_callback(self._release)
+        return future
+
+    def call(self, fn: Callable, *args, **kwargs):
+        """Blocking call, for code that already runs on a worker thread."""
+        future = self.submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            future.cancel()
+            raise WorkloadTimeout(self.name, self.timeout)
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """Awaitable call; the event loop stays free while the pool works."""
+        future = asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+        try:
+            # Cancelling the wrapper on timeout also cancels the call if it is still queued
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            raise WorkloadTimeout(self.name, self.timeout)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"running": min(self._in_flight, self.max_workers),
+                    "queued": max(0, self._in_flight - self.max_workers),
+                    "max_workers": self.max_workers, "max_queue": self.max_queue,
+                    "rejected": self._rejected}
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def offload(pool: WorkloadPool):
+    """
+    Turns a blocking endpoint into an async one that runs on `pool`.
+    FastAPI reads the wrapped signature, so request parsing is unchanged.
+    """
+    def decorator(fn: Callable):
+        @functools.wraps(fn)
+        async def endpoint(*args, **kwargs):
+            return await pool.run(fn, *args, **kwargs)
+        return endpoint
+    return decorator
@@ -7,19 +7,38 @@ import numpy as np
 import os
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi import UploadFile, File 
 import shutil
+import copy
+import json
+import hashlib
+import torch
 from pydantic import BaseModel
 from contextlib import asynccontextmanager
 
 
 from src.utils.auth_db import create_user, verify_user, save_history, get_history, delete_history, init_db
-from src.utils.db import Database 
+from src.utils.datasets import get_dataset_manager
+from src.utils.db import Query
+from src.utils.graph import make_acyclic
+from src.causal_discovery.cache import DiscoveryCache
 from src.causal_discovery.discovery import CausalDiscoveryEngine
+from src.causal_discovery.incremental import IncrementalDiscovery
+from src.causal_discovery.stats import SufficientStats
 from src.scm.estimator import CausalSCM
+from src.scm.registry import DEFAULT_MODEL, ModelRegistry, parse_model_id
+from src.scm.stats import RunningStats
 from src.counterfactuals.engine import CounterfactualEngine
 from src.simulator.simulator import CausalSimulator
+from src.simulator.cache import SimulationCache, summarize
+from src.simulator.streaming import stream_summary
+from src.optimization.search import grid_search, adaptive_search
+from src.optimization.optimizer import InterventionOptimizer, Objective
 from src.llm.client import CausalLLM
+from src.jobs.manager import JobManager, SUCCEEDED
+from src.jobs.tasks import fit_scm_task, discover_task, run_discovery
+from src.api.executor import Overloaded, WorkloadPool, WorkloadTimeout, offload
 from src.api.schemas import *
 from dotenv import load_dotenv
 
@@ -29,8 +48,39 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("api")
 
 # Global Variables
-MODEL_PATH = "data/models/latest_model.pkl"
-ACTIVE_MODEL = None
+MODEL_DIR = "data/models"
+# Single-model files written by earlier versions; imported as the default model on startup
+LEGACY_MODEL_PATHS = ("data/models/latest_model.scm", "data/models/latest_model.pkl")
+INCREMENTAL_DIR = "data/discovery"
+MODELS = ModelRegistry(os.path.join(MODEL_DIR, "registry"),
+                       max_bytes=int(os.getenv("RCIE_MODEL_CACHE_MB", "1024")) * 1024 * 1024)
+SIM_BACKEND = os.getenv("RCIE_SIM_BACKEND", "fused")
+# Job status lives on disk too, so any API worker can answer for a job another one started
+JOBS = JobManager(max_workers=int(os.getenv("RCIE_JOB_WORKERS", "2")),
+                  state_dir=os.getenv("RCIE_JOB_STATE_DIR", "data/jobs"))
+
+def pool_from_env(name: str, max_workers: int, max_queue: int, timeout: float, **kwargs) -> WorkloadPool:
+    """WorkloadPool sized by RCIE_<NAME>_WORKERS, RCIE_<NAME>_QUEUE and RCIE_<NAME>_TIMEOUT (seconds)."""
+    prefix = f"RCIE_{name.upper()}_"
+    return WorkloadPool(name,
+                        max_workers=int(os.getenv(prefix + "WORKERS", max_workers)),
+                        max_queue=int(os.getenv(prefix + "QUEUE", max_queue)),
+                        timeout=float(os.getenv(prefix + "TIMEOUT", timeout)),
+                        **kwargs)
+
+# Separate bounded pools per workload class: fits and discoveries cannot take the
+# threads that serve what-if queries, and a full queue answers 429 instead of piling up.
+ONLINE = pool_from_env("online", 4, 32, 30)           # simulate, counterfactual, optimize
+TRAINING = pool_from_env("training", 1, 4, 900)      # fit_scm, ingest, in-process discovery
+# Discovery algorithms are mostly pure Python and hold the GIL, so they run in processes
+DISCOVERY = pool_from_env("discovery", 2, 4, 900, processes=True,
+                          torch_threads=int(os.getenv("RCIE_DISCOVERY_TORCH_THREADS", "1")))
+POOLS = (ONLINE, TRAINING, DISCOVERY)
+DISCOVERY_CACHE = DiscoveryCache(max_bytes=int(os.getenv("RCIE_DISCOVERY_CACHE_MB", "64")) * 1024 * 1024)
+# Above RCIE_SIM_STREAM_ROWS samples, /simulate streams chunks instead of holding every row
+SIM_CACHE = SimulationCache(max_bytes=int(os.getenv("RCIE_SIM_CACHE_MB", "256")) * 1024 * 1024,
+                            ttl=float(os.getenv("RCIE_SIM_CACHE_TTL", "600")),
+                            max_pool_rows=int(os.getenv("RCIE_SIM_STREAM_ROWS", "200000")))
 
 # --- LIFESPAN MANAGER (Handles Startup/Shutdown) ---
 @asynccontextmanager
@@ -44,22 +94,35 @@ async def lifespan(app: FastAPI):
         print(f"❌ Error creating database tables: {e}")
 
     # 2. Model Loading
-    global ACTIVE_MODEL
-    if os.path.exists(MODEL_PATH):
-        try:
-            ACTIVE_MODEL = CausalSCM.load(MODEL_PATH)
-            # Fix graph cycles on load if necessary
-            ACTIVE_MODEL.graph = make_acyclic(ACTIVE_MODEL.graph)
+    # Several workers share the cores: give each its share of torch threads
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    threads = os.getenv("RCIE_TORCH_THREADS")
+    if threads or workers > 1:
+        torch.set_num_threads(int(threads) if threads else max(1, (os.cpu_count() or 1) // workers))
+
+    try:
+        # Workers start together; only one of them imports a legacy model
+        with MODELS.publish_lock(DEFAULT_MODEL):
+            if MODELS.current_version(DEFAULT_MODEL) is None:
+                legacy = [p for p in LEGACY_MODEL_PATHS if os.path.exists(p)]
+                if legacy:
+                    MODELS.register(DEFAULT_MODEL, scm=CausalSCM.load(legacy[0]))
+                    print(f"✅ Imported {legacy[0]} into the model registry.")
+        if MODELS.current_version(DEFAULT_MODEL) is not None:
+            # Warm the default model; other models load on first use
+            MODELS.get(DEFAULT_MODEL)
             print("✅ Model loaded successfully from disk.")
-        except Exception as e:
-            print(f"⚠️ Failed to load model: {e}")
-            ACTIVE_MODEL = None
-    else:
-        print("ℹ️ No model found on disk. Starting empty.")
+        else:
+            print("ℹ️ No model found on disk. Starting empty.")
+    except Exception as e:
+        print(f"⚠️ Failed to load model: {e}")
     
     yield 
     
     print("🛑 Shutting down RCIE System...")
+    JOBS.shutdown()
+    for pool in POOLS:
+        pool.shutdown()
 
 # --- APP DEFINITION ---
 app = FastAPI(title="RCIE System", lifespan=lifespan)
@@ -73,24 +136,12 @@ app.add_middleware(
 )
 
 # --- HELPER FUNCTIONS ---
-def make_acyclic(g: nx.DiGraph) -> nx.DiGraph:
-    """
-    Detects cycles and removes the back-edge to ensure DAG properties.
-    Required for SCM and Counterfactual math.
-    """
-    g_copy = g.copy()
-    while not nx.is_directed_acyclic_graph(g_copy):
-        try:
-            # Find a cycle (e.g., A -> B -> A)
-            cycle = nx.find_cycle(g_copy)
-            # Heuristic: Remove the last edge in the cycle sequence
-            source, target = cycle[-1][0], cycle[-1][1]
-            g_copy.remove_edge(source, target)
-            logger.warning(f"Cycle detected! Removed edge {source} -> {target} to enforce DAG.")
-        except Exception as e:
-            logger.warning(f"Cycle removal error: {e}")
-            break
-    return g_copy
+def edge_confidence(g: nx.DiGraph):
+    """Per-edge 'confidence' attributes in edge order, or None when the method does not score edges."""
+    confidence = [d.get("confidence") for _, _, d in g.edges(data=True)]
+    if not confidence or any(c is None for c in confidence):
+        return None
+    return confidence
 
 def sanitize_value(v):
     if v is None: return None
@@ -104,11 +155,168 @@ def sanitize_value(v):
 def sanitize_dict(d):
     return {k: sanitize_value(v) for k, v in d.items()}
 
+def sanitize_matrix(m: np.ndarray):
+    return [[sanitize_value(v) for v in row] for row in m.tolist()]
+
+def resolve_source(dataset_path: str) -> str:
+    """The 'events' table if it exists, otherwise the file at dataset_path."""
+    try:
+        get_dataset_manager().columns("events")
+        return "events"
+    except Exception:
+        if not os.path.exists(dataset_path):
+            raise FileNotFoundError(dataset_path)
+        return dataset_path
+
+def dataset_query(source: str, columns=None) -> Query:
+    query = Query(source)
+    if columns is not None:
+        available = set(get_dataset_manager().columns(source))
+        query.select(*[c for c in columns if c in available])
+    return query
+
+def load_dataset(dataset_path: str, columns=None, sample_rows=None, sample_seed: int = 42,
+                 numeric: bool = False) -> pd.DataFrame:
+    """
+    The 'events' table if it exists, otherwise the file at dataset_path.
+    Only the requested columns (those present in the source) and an optional
+    deterministic row sample are read. Results are cached per process until the
+    source changes; treat them as read-only. With `numeric`, the frame is backed by
+    one float64 matrix (see DatasetManager.fetch_matrix).
+    """
+    query = dataset_query(resolve_source(dataset_path), columns)
+    if sample_rows:
+        query.sample(sample_rows, seed=sample_seed)
+    datasets = get_dataset_manager()
+    return datasets.fetch_matrix(query) if numeric else datasets.fetch(query)
+
+def stream_dataset(dataset_path: str, columns, chunk_rows: int = 100_000):
+    """
+    Re-iterable chunked reader for CausalSCM.fit_stream plus normalization stats
+    computed in one SQL aggregate, so the source never has to fit in memory.
+    """
+    datasets = get_dataset_manager()
+    query = dataset_query(resolve_source(dataset_path), columns)
+    summary = datasets.summarize(query.source, query.columns)
+    stats = RunningStats.from_moments(
+        list(summary),
+        [s['count'] for s in summary.values()],
+        [s['mean'] for s in summary.values()],
+        [s['std'] for s in summary.values()],
+    )
+    return (lambda: datasets.iter_batches(query, chunk_rows)), stats
+
+def graph_nodes(dag_edges) -> list:
+    return list(dict.fromkeys(node for edge in dag_edges for node in edge[:2]))
+
+def observed_ranges(dataset_path: str, nodes):
+    """
+    Observed (min, max) per node, used as default search bounds. Falls back to (0, 1).
+    Computed with SQL aggregates, without loading the table.
+    """
+    ranges = {node: (0.0, 1.0) for node in nodes}
+    datasets = get_dataset_manager()
+    for source in ("events", dataset_path):
+        try:
+            available = set(datasets.columns(source))
+            summary = datasets.summarize(source, [node for node in nodes if node in available])
+        except Exception:
+            continue
+        for node, stats in summary.items():
+            if stats['min'] is not None:
+                ranges[node] = (stats['min'], stats['max'])
+        break
+    return ranges
+
+def model_name(model_id) -> str:
+    """Registry name a fit/ingest publishes to; versions are assigned by the registry."""
+    try:
+        name, version = parse_model_id(model_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if version is not None:
+        raise HTTPException(status_code=400, detail="Publish to a model name, not a version")
+    return name
+
+def get_model(model_id, missing_detail: str = "Model not trained.") -> CausalSCM:
+    """
+    Registry model for 'name' (current version) or 'name:version'; the default model when omitted.
+    The returned object is never mutated by the registry, so it stays consistent for this request.
+    """
+    return get_versioned_model(model_id, missing_detail)[0]
+
+def get_versioned_model(model_id, missing_detail: str = "Model not trained."):
+    """(model, 'name:version') with the current version resolved once, e.g. to key caches on it."""
+    try:
+        name, version = parse_model_id(model_id)
+        if version is None:
+            version = MODELS.current_version(name)
+            if version is None:
+                raise KeyError(name)
+        return MODELS.get(name, version), f"{name}:{version}"
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except KeyError:
+        if model_id is None:
+            raise HTTPException(status_code=400, detail=missing_detail)
+        raise HTTPException(status_code=404, detail=f"Model {model_id} not found")
+
+def load_or_train_model(dataset_path: str, dag_edges, model_id=None):
+    """
+    Returns the requested model, training and publishing one on the fly from the request DAG
+    if the name has no version yet. Training holds the name's publish lock, so concurrent
+    first requests (from any worker) train once and all get that model.
+    """
+    try:
+        name, version = parse_model_id(model_id)
+        return MODELS.get(name, version)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except KeyError:
+        if version is not None:
+            raise HTTPException(status_code=404, detail=f"Model {model_id} not found")
+
+    with MODELS.publish_lock(name):
+        # Another request may have published a version while this one waited for the lock
+        try:
+            return MODELS.get(name)
+        except KeyError:
+            pass
+
+        try:
+            df = load_dataset(dataset_path, columns=graph_nodes(dag_edges))
+
+            g = nx.DiGraph()
+            for edge in dag_edges:
+                g.add_edge(edge[0], edge[1])
+
+            g = make_acyclic(g)
+
+            scm = CausalSCM(g)
+            scm.fit(df, epochs=50)
+            MODELS.register(name, scm=scm)
+        except Exception as e:
+             raise HTTPException(status_code=400, detail=f"Model not trained and auto-train failed: {str(e)}")
+    return scm
+
 # --- ENDPOINTS ---
 
+@app.exception_handler(Overloaded)
+def overloaded_handler(request, exc: Overloaded):
+    return JSONResponse(status_code=429, content={"detail": str(exc)},
+                        headers={"Retry-After": str(exc.retry_after)})
+
+@app.exception_handler(WorkloadTimeout)
+def timeout_handler(request, exc: WorkloadTimeout):
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+@app.get("/pools")
+def pool_stats():
+    return {pool.name: pool.stats() for pool in POOLS}
+
 @app.get("/")
 def read_root():
-    status = "Model Loaded" if ACTIVE_MODEL else "No Model Trained"
+    status = "Model Loaded" if MODELS.current_version(DEFAULT_MODEL) is not None else "No Model Trained"
     return {"status": "Online", "model_status": status}
 
 @app.post("/upload")
@@ -152,40 +360,160 @@ def save_analysis_history(item: HistoryItem):
 def get_user_history(email: str):
     return get_history(email)
 
-@app.post("/discover", response_model=GraphResponse)
-def discover_graph(req: DiscoveryRequest):
+def load_discovery_inputs(req: DiscoveryRequest):
+    """Returns (data, algorithm options); data-loading options are consumed here."""
+    options = dict(req.options or {})
+    columns = options.pop("columns", None)
+    sample_rows = options.pop("sample_rows", None)
+    sample_seed = options.pop("sample_seed", 42)
+
     try:
-        try:
-            db = Database()
-            df = db.get_data("events")
-        except Exception: 
-            df = pd.read_csv(req.dataset_path)
+        # Ensemble and partition dump the data as one float64 matrix; load it in that form
+        df = load_dataset(req.dataset_path, columns=columns, sample_rows=sample_rows, sample_seed=sample_seed,
+                          numeric=req.method.lower() in ("ensemble", "partition"))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    return df, options
+
+def discover_from_stats(req: DiscoveryRequest) -> nx.DiGraph:
+    """
+    Discovery from a covariance matrix accumulated over streamed chunks of the source;
+    the source is never loaded whole. Sampling options are ignored.
+    """
+    options = dict(req.options or {})
+    columns = options.pop("columns", None)
+    options.pop("sample_rows", None)
+    options.pop("sample_seed", None)
 
+    try:
+        source = resolve_source(req.dataset_path)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Dataset not found")
+    datasets = get_dataset_manager()
+    if columns is None:
+        columns = datasets.columns(source)
+
+    n, mean, cov = datasets.covariance(source, columns)
+    if n <= len(columns) + 3:
+        raise ValueError("Not enough complete rows for discovery")
+    stats = SufficientStats.from_moments(columns, n, mean, cov)
+    return CausalDiscoveryEngine(method=req.method, options=options).run_from_stats(stats)
+
+def discover_incremental(req: DiscoveryRequest) -> nx.DiGraph:
+    """
+    Incremental discovery: state (running statistics + previous result) is kept on disk per
+    method, source, columns and options; only rows appended since the last call are read.
+    Sampling options are ignored because the statistics cover every row.
+    """
+    options = dict(req.options or {})
+    columns = options.pop("columns", None)
+    options.pop("sample_rows", None)
+    options.pop("sample_seed", None)
 
-    engine = CausalDiscoveryEngine(method=req.method, options=req.options)
     try:
-        graph = engine.run(df)
-        
+        source = resolve_source(req.dataset_path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    datasets = get_dataset_manager()
+    if columns is None:
+        columns = datasets.columns(source)
+
+    key = json.dumps([req.method.lower(), source, columns, options], sort_keys=True, default=str)
+    path = os.path.join(INCREMENTAL_DIR, hashlib.sha1(key.encode()).hexdigest()[:16] + ".pkl")
+    state = IncrementalDiscovery.load(path) if os.path.exists(path) else None
+
+    # A source that shrank, or whose already-read rows changed (e.g. re-uploaded), was rewritten,
+    # so the accumulated statistics no longer apply
+    if state is not None and (datasets.row_count(source) < state.rows_seen or
+                              getattr(state, "source_digest", None) !=
+                              datasets.prefix_digest(source, columns, state.rows_seen)):
+        state = None
+    if state is None:
+        state = IncrementalDiscovery(req.method, columns, options)
+
+    for chunk in datasets.iter_batches(dataset_query(source, columns).offset(state.rows_seen)):
+        state.add(chunk)
+    state.source_digest = datasets.prefix_digest(source, columns, state.rows_seen)
+    graph = state.rediscover()
+    state.save(path)
+    return graph
+
+def activate_model(path: str, name: str = DEFAULT_MODEL) -> dict:
+    """
+    Publishes a freshly trained model file as the next version of `name` and makes it current.
+    The registry swaps versions atomically, so requests see either the old or the new model.
+    """
+    with MODELS.publish_lock(name):
+        version = MODELS.register(name, path=path)
+    scm = MODELS.get(name, version)
+    return {"model_id": f"{name}:{version}", "model_path": MODELS.path(name, version),
+            "num_edges": scm.graph.number_of_edges()}
+
+def discovery_cache_key(req: DiscoveryRequest):
+    """
+    Cache key from the source fingerprint (version, row count, sample hash), method and options;
+    None when the source does not exist. Appends to 'events' change the fingerprint.
+    """
+    options = dict(req.options or {})
+    try:
+        source = resolve_source(req.dataset_path)
+    except FileNotFoundError:
+        return None
+    columns = dataset_query(source, options.get("columns")).columns
+    fingerprint = get_dataset_manager().fingerprint(source, columns)
+    options["sufficient_stats"] = req.sufficient_stats
+    return DISCOVERY_CACHE.key(fingerprint, req.method, options)
+
+@app.post("/discover", response_model=GraphResponse)
+def discover_graph(req: DiscoveryRequest):
+    # Runs on the default threadpool; the heavy part waits on the TRAINING or DISCOVERY pool
+    # Incremental state already reuses previous work and only reads new rows
+    cache_key = discovery_cache_key(req) if req.use_cache and not req.incremental else None
+    if cache_key is not None:
+        cached = DISCOVERY_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+    if req.incremental or req.sufficient_stats:
+        try:
+            graph = TRAINING.call(discover_incremental if req.incremental else discover_from_stats, req)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         graph = make_acyclic(graph)
-        
-        edges = [list(e) for e in graph.edges()]
-        nodes = df.columns.tolist()
-        return {"edges": edges, "nodes": nodes, "method": req.method}
-    except Exception as e:
-        logger.error(f"Discovery failed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        result = {"edges": [list(e) for e in graph.edges()], "nodes": list(graph.nodes()), "method": req.method}
+    else:
+        df, options = load_discovery_inputs(req)
+
+        try:
+            graph = DISCOVERY.call(run_discovery, df, req.method, options)
+            
+            graph = make_acyclic(graph)
+            
+            edges = [list(e) for e in graph.edges()]
+            nodes = df.columns.tolist()
+            result = {"edges": edges, "nodes": nodes, "method": req.method, "confidence": edge_confidence(graph)}
+        except (Overloaded, WorkloadTimeout):
+            raise
+        except Exception as e:
+            logger.error(f"Discovery failed: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    if cache_key is not None:
+        DISCOVERY_CACHE.put(cache_key, result)
+    return result
 
 @app.post("/fit_scm", response_model=SCMStatusResponse)
+@offload(TRAINING)
 def fit_scm(req: FitSCMRequest):
-    global ACTIVE_MODEL
+    name = model_name(req.model_id)
+    if req.batch_size and (req.mode != "sequential" or req.n_jobs):
+        raise HTTPException(status_code=400, detail="batch_size streams a sequential fit; it cannot be combined "
+                                                    f"with mode '{req.mode}' or n_jobs.")
     try:
-        try:
-            db = Database()
-            df = db.get_data("events")
-        except Exception:
-            df = pd.read_csv(req.dataset_path)
+        if req.batch_size:
+            batches, stats = stream_dataset(req.dataset_path, graph_nodes(req.dag_edges))
+        else:
+            df = load_dataset(req.dataset_path, columns=graph_nodes(req.dag_edges))
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Dataset not found")
 
@@ -196,44 +524,174 @@ def fit_scm(req: FitSCMRequest):
     g = make_acyclic(g)
     
     scm = CausalSCM(g)
-    scm.fit(df, epochs=req.epochs)
+    try:
+        if req.batch_size:
+            scm.fit_stream(batches, epochs=req.epochs, batch_size=req.batch_size, stats=stats,
+                           shuffle_buffer=req.shuffle_buffer, patience=req.patience)
+        else:
+            scm.fit(df, epochs=req.epochs, mode=req.mode, n_jobs=req.n_jobs)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # Ensure directory exists before saving
-    os.makedirs(os.path.dirname(MODEL_PATH), exist_ok=True)
-    scm.save(MODEL_PATH)
-    ACTIVE_MODEL = scm
+    with MODELS.publish_lock(name):
+        version = MODELS.register(name, scm=scm)
     
-    return {"status": "success", "message": f"SCM trained on {len(g.edges())} edges and saved."}
+    return {"status": "success", "message": f"SCM trained on {len(g.edges())} edges and saved as {name}:{version}."}
+
+# --- BACKGROUND JOBS ---
+
+@app.post("/jobs/fit_scm", response_model=JobStatusResponse)
+def submit_fit_job(req: FitSCMRequest):
+    name = model_name(req.model_id)
+    try:
+        df = load_dataset(req.dataset_path, columns=graph_nodes(req.dag_edges))
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    g = make_acyclic(nx.DiGraph([(edge[0], edge[1]) for edge in req.dag_edges]))
+    output_path = os.path.join(MODEL_DIR, "jobs", f"{os.urandom(8).hex()}.scm")
+
+    job = JOBS.submit("fit_scm", fit_scm_task, df, [list(e) for e in g.edges()], req.epochs, output_path,
+                      mode=req.mode, n_jobs=req.n_jobs, on_success=lambda path: activate_model(path, name))
+    return job.to_dict()
+
+@app.post("/ingest", response_model=IngestResponse)
+@offload(TRAINING)
+def ingest(req: IngestRequest):
+    """
+    Absorbs new event rows: optionally appends them to the 'events' table, then either
+    warm-starts the model on them (published as its next version) or, when drift is too
+    large, queues a full refit job.
+    """
+    get_model(req.model_id, "Model not trained")
+    name, _ = parse_model_id(req.model_id)
+    if not req.rows:
+        raise HTTPException(status_code=400, detail="No rows to ingest")
+    batch = pd.DataFrame(req.rows)
+
+    appended = False
+    datasets = get_dataset_manager()
+    if req.append and datasets.read_only:
+        # Updating the model from rows no refit will see would let the two silently diverge
+        raise HTTPException(status_code=409, detail="Database is read-only (RCIE_DB_READ_ONLY); rows cannot be "
+                                                    "appended. Ingest with append=false to update the model only.")
+    if req.append:
+        try:
+            datasets.columns("events")
+        except Exception:
+            logger.warning("No 'events' table; ingested rows are not persisted.")
+        else:
+            try:
+                datasets.database().append_df(batch, "events")
+            except Exception as e:
+                raise HTTPException(status_code=400, detail=f"Could not append rows: {e}")
+            appended = True
+
+    # Read, update and publish under the name's publish lock (every publisher takes it),
+    # so a concurrent ingest or refit is never replaced by a version built on the model it superseded
+    with MODELS.publish_lock(name):
+        current, model_key = get_versioned_model(req.model_id, "Model not trained")
+        base_version = int(model_key.rsplit(":", 1)[1])
+        if MODELS.current_version(name) != base_version:
+            raise HTTPException(status_code=409,
+                                detail=f"{model_key} is not the current version of {name}; ingest into {name}")
+
+        # Update a copy so in-flight requests keep a consistent model
+        scm = copy.deepcopy(current)
+        report = scm.partial_fit(batch, epochs=req.epochs, max_mean_shift=req.max_mean_shift,
+                                 max_loss_ratio=req.max_loss_ratio, force=req.force)
+        if report['updated']:
+            MODELS.register(name, scm=scm)
+
+    job_id = None
+    if not report['updated']:
+        # A refit reads dataset_path, which only holds the batch if it was appended (or the caller put it there)
+        if req.auto_refit and (appended or not req.append):
+            dag_edges = [list(e) for e in scm.graph.edges()]
+            job = submit_fit_job(FitSCMRequest(dataset_path=req.dataset_path, dag_edges=dag_edges,
+                                               epochs=req.refit_epochs, mode="fused", model_id=name))
+            job_id = job["job_id"]
+        status = "refit_queued" if job_id else "refit_required"
+    else:
+        status = "updated"
+
+    return {
+        "status": status,
+        "rows": len(batch),
+        "appended": appended,
+        "job_id": job_id,
+        "reasons": report['reasons'],
+        "mean_shift": sanitize_dict(report['mean_shift']),
+        "loss_ratio": sanitize_dict(report['loss_ratio']),
+    }
+
+@app.post("/jobs/discover", response_model=JobStatusResponse)
+def submit_discovery_job(req: DiscoveryRequest):
+    df, options = load_discovery_inputs(req)
+
+    def on_success(result: dict) -> dict:
+        graph = nx.DiGraph()
+        graph.add_nodes_from(result["nodes"])
+        confidence = result.get("confidence") or [None] * len(result["edges"])
+        for (u, v), c in zip(result["edges"], confidence):
+            graph.add_edge(u, v, **({} if c is None else {"confidence": c}))
+        graph = make_acyclic(graph)
+        result["edges"] = [list(e) for e in graph.edges()]
+        result["confidence"] = edge_confidence(graph)
+        return result
+
+    job = JOBS.submit("discover", discover_task, df, req.method, options, on_success=on_success)
+    return job.to_dict()
+
+@app.get("/jobs/{job_id}", response_model=JobStatusResponse)
+def get_job_status(job_id: str):
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+@app.get("/jobs/{job_id}/result", response_model=JobResultResponse)
+def get_job_result(job_id: str):
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"Job is {job.to_dict()['status']}")
+    return {"job_id": job.id, "kind": job.kind, "result": job.result}
+
+@app.delete("/jobs/{job_id}", response_model=JobStatusResponse)
+def cancel_job(job_id: str):
+    job = JOBS.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+# --- MODEL REGISTRY ---
+
+@app.get("/models", response_model=ModelListResponse)
+def list_models():
+    return {"models": MODELS.describe(), "loaded": MODELS.loaded()}
+
+@app.post("/models/{name}/activate/{version}", response_model=ModelListResponse)
+def activate_model_version(name: str, version: int):
+    """Makes an existing version current, e.g. to roll back."""
+    try:
+        parse_model_id(name)
+        with MODELS.publish_lock(name):
+            MODELS.activate(name, version)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Model {name}:{version} not found")
+    return list_models()
 
 @app.post("/counterfactual", response_model=CounterfactualResponse)
+@offload(ONLINE)
 def query_counterfactual(req: CounterfactualRequest):
-    global ACTIVE_MODEL
-    
     # Check if model is loaded (from Lifespan). If not, try to train one on the fly.
-    if not ACTIVE_MODEL:
-        try:
-            try:
-                db = Database()
-                df = db.get_data("events")
-            except Exception:
-                df = pd.read_csv(req.dataset_path)
-                
-            g = nx.DiGraph()
-            for edge in req.dag_edges:
-                g.add_edge(edge[0], edge[1])
-            
-            g = make_acyclic(g)
-            
-            scm = CausalSCM(g)
-            scm.fit(df, epochs=50)
-            
-            os.makedirs(os.path.dirname(MODEL_PATH), exist_ok=True)
-            scm.save(MODEL_PATH)
-            ACTIVE_MODEL = scm
-        except Exception as e:
-             raise HTTPException(status_code=400, detail=f"Model not trained and auto-train failed: {str(e)}")
+    model = load_or_train_model(req.dataset_path, req.dag_edges, req.model_id)
 
-    cf_engine = CounterfactualEngine(ACTIVE_MODEL)
+    cf_engine = CounterfactualEngine(model)
     obs_series = pd.Series(req.observation)
     
     try:
@@ -248,43 +706,54 @@ def query_counterfactual(req: CounterfactualRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Math Error: {str(e)}")
     
+@app.post("/counterfactual/batch", response_model=BatchCounterfactualResponse)
+@offload(ONLINE)
+def query_counterfactual_batch(req: BatchCounterfactualRequest):
+    model = load_or_train_model(req.dataset_path, req.dag_edges, req.model_id)
+
+    if any(len(row) != len(req.columns) for row in req.observations):
+        raise HTTPException(status_code=400, detail="Every observation row must match the number of columns.")
+
+    cf_engine = CounterfactualEngine(model)
+    observations = pd.DataFrame(req.observations, columns=req.columns, dtype=float)
+
+    try:
+        cf_results = cf_engine.estimate_counterfactual_batch(observations, req.interventions)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Math Error: {str(e)}")
+
+    return {
+        "nodes": cf_results[0].columns.tolist() if cf_results else list(model.graph.nodes()),
+        "results": [
+            {"intervention": intervention, "counterfactual": sanitize_matrix(cf.to_numpy())}
+            for intervention, cf in zip(req.interventions, cf_results)
+        ]
+    }
+
 @app.post("/optimize", response_model=OptimizeResponse)
+@offload(ONLINE)
 def optimize_target(req: OptimizeRequest):
-    global ACTIVE_MODEL
-    
-    if not ACTIVE_MODEL:
-         raise HTTPException(status_code=400, detail="Model not trained.")
+    model = get_model(req.model_id, "Model not trained.")
 
-    try:
-        try:
-            db = Database()
-            df = db.get_data("events")
-        except Exception:
-            df = pd.read_csv(req.dataset_path)
-            
-        min_val = df[req.control_node].min()
-        max_val = df[req.control_node].max()
-    except Exception:
-        min_val, max_val = 0.0, 1.0 
+    min_val, max_val = observed_ranges(req.dataset_path, [req.control_node])[req.control_node]
 
-    candidates = np.linspace(min_val, max_val,  50)
-    best_diff = float('inf')
-    best_val = candidates[0]
-    best_pred = 0.0
-    
-    sim = CausalSimulator(ACTIVE_MODEL)
-    
-    for val in candidates:
-        # Runs a mini-simulation for this value
-        # We use a smaller sample size (n=100) for speed during search
-        df_sim = sim.run_do_query({req.control_node: val}, n_samples=100)
-        pred = df_sim[req.target_node].mean()
-        
-        diff = abs(pred - req.target_value)
-        if diff < best_diff:
-            best_diff = diff
-            best_val = val
-            best_pred = pred
+    sim = CausalSimulator(model, backend=SIM_BACKEND)
+
+    # All candidates of a search round are simulated as one (candidates x samples) batch,
+    # with the same noise for every candidate and round so comparisons are not Monte Carlo noise
+    def predict(values: np.ndarray) -> np.ndarray:
+        return sim.expected_outcomes(req.control_node, values, req.target_node, n_samples=req.n_samples,
+                                     seed=req.seed)
+
+    try:
+        if req.search == "adaptive":
+            best_val, best_pred = adaptive_search(predict, req.target_value, min_val, max_val, req.n_candidates)
+        elif req.search == "grid":
+            best_val, best_pred = grid_search(predict, req.target_value, min_val, max_val, req.n_candidates)
+        else:
+            raise HTTPException(status_code=400, detail=f"Unknown search mode: {req.search}")
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return {
         "suggested_value": sanitize_value(best_val),
@@ -292,27 +761,61 @@ def optimize_target(req: OptimizeRequest):
         "message": f"Optimal {req.control_node} found."
     }
 
+@app.post("/optimize/multi", response_model=MultiOptimizeResponse)
+@offload(ONLINE)
+def optimize_multi(req: MultiOptimizeRequest):
+    model = get_model(req.model_id, "Model not trained.")
+
+    ranges = observed_ranges(req.dataset_path, [c.node for c in req.controls])
+    bounds = {
+        c.node: (ranges[c.node][0] if c.low is None else c.low,
+                 ranges[c.node][1] if c.high is None else c.high)
+        for c in req.controls
+    }
+    costs = {c.node: c.cost for c in req.controls}
+
+    try:
+        objectives = [Objective(o.node, o.goal, o.target_value, o.weight) for o in req.objectives]
+        optimizer = InterventionOptimizer(model, n_samples=req.n_samples,
+                                          n_restarts=req.n_restarts, steps=req.steps)
+        result = optimizer.optimize(bounds, objectives, costs=costs, budget=req.budget)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "suggested_values": sanitize_dict(result['values']),
+        "predicted_outcomes": sanitize_dict(result['outcomes']),
+        "total_cost": sanitize_value(result['cost']),
+        "message": f"Optimized {len(bounds)} controls."
+    }
+
 @app.post("/simulate", response_model=SimulationResponse)
+@offload(ONLINE)
 def run_simulation(req: SimulationRequest):
-    global ACTIVE_MODEL
-    
-    if not ACTIVE_MODEL:
-         raise HTTPException(status_code=400, detail="Model not trained. Please go to Tab 2 and train first.")
+    model, model_key = get_versioned_model(req.model_id, "Model not trained. Please go to Tab 2 and train first.")
+    if req.n_samples < 1:
+        raise HTTPException(status_code=400, detail="n_samples must be positive")
         
-    sim = CausalSimulator(ACTIVE_MODEL)
+    sim = CausalSimulator(model, backend=SIM_BACKEND)
     try:
-        df_sim = sim.run_do_query(req.intervention, n_samples=req.n_samples)
-        
-        means = df_sim.mean().to_dict()
-        
-        lower = df_sim.quantile(0.05).to_dict()
-        upper = df_sim.quantile(0.95).to_dict()
+        # Cached per model version, rounded intervention and seed; larger n extends the cached pool
+        if req.use_cache:
+            summary = SIM_CACHE.summary(sim, model_key, req.intervention, req.n_samples, seed=req.seed)
+        elif req.n_samples > SIM_CACHE.max_pool_rows:
+            summary = stream_summary(sim, SIM_CACHE.round(req.intervention), req.n_samples, seed=req.seed)
+        else:
+            df_sim = sim.run_do_query(SIM_CACHE.round(req.intervention), n_samples=req.n_samples, seed=req.seed)
+            summary = summarize(df_sim.to_numpy(), df_sim.columns)
         
         return {
-            "mean_outcomes": sanitize_dict(means),
-            "lower_ci": sanitize_dict(lower),
-            "upper_ci": sanitize_dict(upper)
+            "mean_outcomes": sanitize_dict(summary["mean"]),
+            "lower_ci": sanitize_dict(summary["lower"]),
+            "upper_ci": sanitize_dict(summary["upper"]),
+            "std_outcomes": sanitize_dict(summary["std"])
         }
+    except (KeyError, ValueError) as e:
+        # Bad requests, e.g. an intervention on a node the model does not have
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Simulation error: {e}")
         raise HTTPException(status_code=500, detail=f"Sim Error: {str(e)}")
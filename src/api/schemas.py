@@ -10,12 +10,46 @@ class OptimizeRequest(BaseModel):
     control_node: str        
     dataset_path: str
     dag_edges: List[List[str]]
+    search: str = "grid"        # 'grid' or 'adaptive'
+    n_candidates: int = 50      # candidate budget (total across rounds for 'adaptive')
+    n_samples: int = 100
+    seed: int = 0               # noise shared by every candidate and search round (common random numbers)
+    model_id: Optional[str] = None   # 'name' (current version) or 'name:version'; default model if omitted
+
+class ControlSpec(BaseModel):
+    node: str
+    low: Optional[float] = None     # defaults to the observed min/max of the node
+    high: Optional[float] = None
+    cost: float = 0.0               # cost per unit (negative if it pays back), used with MultiOptimizeRequest.budget
+
+class ObjectiveSpec(BaseModel):
+    node: str
+    goal: str = "target"            # 'target', 'maximize' or 'minimize'
+    target_value: Optional[float] = None
+    weight: float = 1.0
+
+class MultiOptimizeRequest(BaseModel):
+    controls: List[ControlSpec]
+    objectives: List[ObjectiveSpec]
+    budget: Optional[float] = None
+    dataset_path: str
+    dag_edges: List[List[str]]
+    n_samples: int = 256
+    n_restarts: int = 8
+    steps: int = 200
+    model_id: Optional[str] = None
 
 class OptimizeResponse(BaseModel):
     suggested_value: float
     predicted_outcome: float
     message: str
     
+class MultiOptimizeResponse(BaseModel):
+    suggested_values: Dict[str, float]
+    predicted_outcomes: Dict[str, Optional[float]]
+    total_cost: Optional[float] = None
+    message: str
+    
 class UserAuth(BaseModel):
     email: str
     password: str
@@ -27,33 +61,71 @@ class HistoryItem(BaseModel):
     inputs: Dict[str, Any]
     results: Dict[str, Any]
 
-# Simulation Response
-class SimulationResponse(BaseModel):
-    mean_outcomes: Dict[str, Optional[float]]
-    lower_ci: Dict[str, Optional[float]] = {} 
-    upper_ci: Dict[str, Optional[float]] = {}
-
 class DiscoveryRequest(BaseModel):
     dataset_path: str 
     method: str = "pc"
     options: Optional[Dict[str, Any]] = {}
+    incremental: bool = False   # reuse running statistics and the previous result ('pc' or 'notears')
+    sufficient_stats: bool = False   # discover from a covariance computed in SQL; raw rows are never loaded
+    use_cache: bool = True   # reuse a stored result for the same data fingerprint, method and options
 
 class FitSCMRequest(BaseModel):
     dataset_path: str
     dag_edges: List[List[str]]
     epochs: int = 100
+    mode: str = "sequential"    # 'sequential', 'parallel' or 'fused'
+    n_jobs: Optional[int] = None
+    batch_size: Optional[int] = None   # /fit_scm only: stream mini-batches instead of loading the source;
+                                       # streamed fits are sequential, so mode and n_jobs must stay unset
+    shuffle_buffer: int = 65536
+    patience: int = 3
+    model_id: Optional[str] = None     # registry name to publish the fitted model under
+
+class IngestRequest(BaseModel):
+    rows: List[Dict[str, Optional[float]]]
+    dataset_path: str                # used when a full refit is queued
+    append: bool = True              # also insert the rows into the 'events' table (409 when the DB is read-only);
+                                     # without append, dataset_path must already hold the rows for an auto refit
+    epochs: int = 20
+    max_mean_shift: float = 0.5      # in historical standard deviations
+    max_loss_ratio: float = 2.0
+    force: bool = False              # warm-start even when drift is detected
+    auto_refit: bool = True
+    refit_epochs: int = 100
+    model_id: Optional[str] = None
+
+class IngestResponse(BaseModel):
+    status: str                      # 'updated', 'refit_queued' or 'refit_required'
+    rows: int
+    appended: bool
+    job_id: Optional[str] = None
+    reasons: List[str]
+    mean_shift: Dict[str, Optional[float]]
+    loss_ratio: Dict[str, Optional[float]]
 
 class CounterfactualRequest(BaseModel):
     observation: Dict[str, float] 
     intervention: Dict[str, float]
     dataset_path: str
     dag_edges: List[List[str]]
+    model_id: Optional[str] = None
+
+class BatchCounterfactualRequest(BaseModel):
+    columns: List[str]
+    observations: List[List[Optional[float]]]
+    interventions: List[Dict[str, float]]
+    dataset_path: str
+    dag_edges: List[List[str]]
+    model_id: Optional[str] = None
 
 class SimulationRequest(BaseModel):
     intervention: Dict[str, float]
     n_samples: int = 1000
     dataset_path: str
     dag_edges: List[List[str]]
+    model_id: Optional[str] = None
+    seed: int = 0                    # same model version, intervention, n_samples and seed -> same result
+    use_cache: bool = True
 
 class ExplanationRequest(BaseModel):
     edges: List[List[str]]
@@ -65,6 +137,7 @@ class GraphResponse(BaseModel):
     edges: List[List[str]]
     nodes: List[str]
     method: str
+    confidence: Optional[List[float]] = None   # per edge, in the order of `edges` ('ensemble' only)
 
 class SCMStatusResponse(BaseModel):
     status: str
@@ -75,9 +148,40 @@ class CounterfactualResponse(BaseModel):
     counterfactual: Dict[str, Optional[float]]
     delta: Dict[str, Optional[float]]
 
+class BatchCounterfactualResult(BaseModel):
+    intervention: Dict[str, float]
+    counterfactual: List[List[Optional[float]]]
+
+class BatchCounterfactualResponse(BaseModel):
+    nodes: List[str]
+    results: List[BatchCounterfactualResult]
+
 class SimulationResponse(BaseModel):
     mean_outcomes: Dict[str, Optional[float]]
+    lower_ci: Dict[str, Optional[float]] = {}     # 5% quantile
+    upper_ci: Dict[str, Optional[float]] = {}     # 95% quantile
+    std_outcomes: Dict[str, Optional[float]] = {}
     uplift: Optional[float] = None
 
+class ModelVersions(BaseModel):
+    current: Optional[int] = None
+    versions: List[int]
+
+class ModelListResponse(BaseModel):
+    models: Dict[str, ModelVersions]
+    loaded: List[str]                  # 'name:version' entries currently held in memory
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    kind: str
+    status: str
+    progress: Dict[str, Any] = {}
+    error: Optional[str] = None
+
+class JobResultResponse(BaseModel):
+    job_id: str
+    kind: str
+    result: Dict[str, Any]
+
 class ExplanationResponse(BaseModel):
     narrative: str
\ No newline at end of file
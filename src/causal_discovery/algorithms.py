@@ -1,37 +1,102 @@
-import torch
+import logging
 import numpy as np
 import networkx as nx
+import scipy.linalg as slin
+import scipy.optimize as sopt
+from typing import List, Optional, Tuple
 
-def run_notears(X: np.ndarray, lambda1=0.1, max_iter=100) -> nx.DiGraph:
+logger = logging.getLogger(__name__)
+
+# Solver settings that discovery `options` may pass through
+NOTEARS_OPTIONS = ("lambda1", "max_iter", "h_tol", "rho_max", "ftol")
+
+def notears_weights(C: np.ndarray,
+                    lambda1: float = 0.1,
+                    max_iter: int = 100,
+                    h_tol: float = 1e-8,
+                    rho_max: float = 1e16,
+                    ftol: float = 1e-6,
+                    w_init: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Linear NOTEARS (Zheng et al., 2018) on the (d x d) second-moment matrix C = X^T X / n.
+    The least-squares term 0.5/n ||X - XW||^2 equals 0.5 tr((I - W)^T C (I - W)),
+    so running statistics are enough.
+
+    Augmented Lagrangian on h(W) = tr(exp(W * W)) - d: each outer step minimizes
+    loss + rho/2 h^2 + alpha h + lambda1 |W|_1 with L-BFGS-B, where W = W+ - W- with
+    W+, W- >= 0 makes the L1 term smooth; rho grows 10x until h shrinks by 4x, then
+    alpha += rho h. Stops once h <= h_tol. Each inner solve starts from the last one and
+    stops at relative objective change `ftol`. `w_init` warm-starts from a previous solution.
+    """
+    C = np.asarray(C, dtype=np.float64)
+    d = C.shape[0]
+
+    def _adj(w: np.ndarray) -> np.ndarray:
+        return (w[:d * d] - w[d * d:]).reshape(d, d)
+
+    def _loss(W: np.ndarray) -> Tuple[float, np.ndarray]:
+        R = np.eye(d) - W
+        CR = C @ R
+        return 0.5 * np.sum(R * CR), -CR
+
+    def _h(W: np.ndarray) -> Tuple[float, np.ndarray]:
+        E = slin.expm(W * W)
+        return np.trace(E) - d, E.T * W * 2
+
+    def _func(w: np.ndarray) -> Tuple[float, np.ndarray]:
+        W = _adj(w)
+        loss, G_loss = _loss(W)
+        h, G_h = _h(W)
+        obj = loss + 0.5 * rho * h * h + alpha * h + lambda1 * w.sum()
+        G_smooth = G_loss + (rho * h + alpha) * G_h
+        return obj, np.concatenate([(G_smooth + lambda1).ravel(), (-G_smooth + lambda1).ravel()])
+
+    if w_init is None:
+        w_est = np.zeros(2 * d * d)
+    else:
+        W0 = np.asarray(w_init, dtype=np.float64)
+        w_est = np.concatenate([np.maximum(W0, 0).ravel(), np.maximum(-W0, 0).ravel()])
+
+    # No self-loops: diagonal entries of both halves are pinned to zero
+    bounds = [(0, 0) if i == j else (0, None) for _ in range(2) for i in range(d) for j in range(d)]
+    rho, alpha, h = 1.0, 0.0, np.inf
+
+    for step in range(max_iter):
+        w_new, h_new = w_est, h
+        while rho < rho_max:
+            sol = sopt.minimize(_func, w_new, method="L-BFGS-B", jac=True, bounds=bounds,
+                                options={"ftol": ftol})
+            w_new = sol.x
+            h_new, _ = _h(_adj(w_new))
+            if h_new > 0.25 * h:
+                rho *= 10
+            else:
+                break
+        w_est, h = w_new, h_new
+        alpha += rho * h
+        if h <= h_tol or rho >= rho_max:
+            logger.info(f"NOTEARS converged after {step + 1} dual steps (h={h:.2e}, rho={rho:.0e}).")
+            break
+
+    return _adj(w_est)
+
+def weights_to_graph(W: np.ndarray, threshold=0.3, labels: Optional[List[str]] = None) -> nx.DiGraph:
+    """Graph with i -> j wherever |W[i, j]| >= threshold, labelled by `labels` when given."""
+    labels = list(range(W.shape[0])) if labels is None else list(labels)
+    G = nx.DiGraph()
+    G.add_nodes_from(labels)
+    for i, j in zip(*np.nonzero(np.abs(W) >= threshold)):
+        G.add_edge(labels[i], labels[j], weight=float(W[i, j]))
+    return G
+
+def run_notears(X: np.ndarray, lambda1=0.1, max_iter=100, h_tol=1e-8, rho_max=1e16, ftol=1e-6, w_threshold=0.3,
+                w_init: np.ndarray = None, labels: Optional[List[str]] = None) -> nx.DiGraph:
     """
-    PyTorch implementation of NOTEARS (DAGs with NO TEARS).
-    Continuous optimization for structure learning.
+    NOTEARS (DAGs with NO TEARS): continuous optimization for structure learning.
+    X is (n x d), ideally standardized; edges with |w| < w_threshold are dropped.
     """
     n, d = X.shape
-    X_torch = torch.from_numpy(X).float()
-    
-    # Adjacency matrix (learnable weights)
-    adj = torch.zeros(d, d, requires_grad=True)
-    
-    optimizer = torch.optim.LBFGS([adj], max_iter=max_iter)
-
-    def loss_func():
-        optimizer.zero_grad()
-        # Loss = Least Squares + Acyclicity Constraint + Sparsity
-        # (Simplified for brevity - standard formulation)
-        X_hat = X_torch @ adj
-        mse = 0.5 / n * torch.sum((X_torch - X_hat) ** 2)
-        h = torch.trace(torch.matrix_exp(adj * adj)) - d # Acyclicity
-        loss = mse + lambda1 * torch.norm(adj, 1) + 0.5 * h * h
-        loss.backward()
-        return loss
-
-    optimizer.step(loss_func)
-    
-    # Thresholding to remove weak edges
-    adj_np = adj.detach().numpy()
-    adj_np[np.abs(adj_np) < 0.3] = 0 # Filter weak edges
-    
-    G = nx.DiGraph(adj_np)
-    mapping = {i: col for i, col in enumerate(range(d))} # Need column mapping
-    return G
\ No newline at end of file
+    X = X - X.mean(axis=0)
+    W = notears_weights(X.T @ X / n, lambda1=lambda1, max_iter=max_iter, h_tol=h_tol, rho_max=rho_max,
+                        ftol=ftol, w_init=w_init)
+    return weights_to_graph(W, w_threshold, labels)
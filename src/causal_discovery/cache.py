@@ -0,0 +1,74 @@
+# src/causal_discovery/cache.py
+import os
+import json
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DiscoveryCache:
+    """
+    Content-addressed store of discovery results, one JSON file per key.
+    The key hashes the dataset fingerprint with the method and options, so a changed
+    source never hits an old entry. Hits refresh the file's mtime and the least
+    recently used files are evicted once the directory exceeds `max_bytes`.
+    """
+    def __init__(self, directory: str = "data/discovery_cache", max_bytes: int = 64 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(fingerprint: str, method: str, options: Dict[str, Any]) -> str:
+        payload = json.dumps([fingerprint, method.lower(), options], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                result = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(result, f)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                total -= size
+                logger.info(f"Evicted discovery cache entry {os.path.basename(path)}")
+
+    def clear(self):
+        with self._lock:
+            if os.path.isdir(self.directory):
+                for entry in os.scandir(self.directory):
+                    if entry.name.endswith(".json"):
+                        os.remove(entry.path)
@@ -7,7 +7,9 @@ import mlflow
 from typing import Dict, Any
 from causallearn.search.ConstraintBased.PC import pc
 from causallearn.search.ScoreBased.GES import ges
-from src.causal_discovery.algorithms import run_notears
+from src.causal_discovery.algorithms import NOTEARS_OPTIONS, run_notears, notears_weights, weights_to_graph
+from src.causal_discovery.pc import cpdag_to_digraph, pc_from_corr
+from src.causal_discovery.stats import SufficientStats
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -17,7 +19,8 @@ class CausalDiscoveryEngine:
     def __init__(self, method: str = "pc", options: Dict[str, Any] = None):
         """
         Args:
-            method: 'pc', 'notears', or 'ges'
+            method: 'pc', 'notears', 'ges', 'ensemble' (bootstrap resamples of several methods)
+                    or 'partition' (a base method on overlapping clusters of a wide table)
             options: dictionary of parameters (e.g., {'alpha': 0.05})
         """
         self.method = method.lower()
@@ -31,14 +34,7 @@ class CausalDiscoveryEngine:
             mlflow.log_param("method", self.method)
             mlflow.log_param("num_samples", len(data))
             
-            if self.method == "notears":
-                G = self._run_notears(data)
-            elif self.method == "ges":
-                G = self._run_ges(data)
-            elif self.method == "pc":
-                G = self._run_pc(data)
-            else:
-                raise ValueError(f"Unknown method: {self.method}")
+            G = self.discover(data)
             
             # Log results
             num_edges = G.number_of_edges()
@@ -47,24 +43,95 @@ class CausalDiscoveryEngine:
             
             return G
 
+    def discover(self, data: pd.DataFrame) -> nx.DiGraph:
+        """Runs the algorithm without MLflow tracking (e.g. once per bootstrap resample)."""
+        if self.method == "notears":
+            return self._run_notears(data)
+        elif self.method == "ges":
+            return self._run_ges(data)
+        elif self.method == "pc":
+            return self._run_pc(data)
+        elif self.method == "ensemble":
+            return self._run_ensemble(data)
+        elif self.method == "partition":
+            return self._run_partition(data)
+        raise ValueError(f"Unknown method: {self.method}")
+
+    def run_from_stats(self, stats: SufficientStats) -> nx.DiGraph:
+        """
+        Discovery from (covariance, n) alone, never touching the raw rows.
+        Valid for Gaussian tests/scores: fisher-z PC, BIC GES and least-squares NOTEARS.
+        """
+        logger.info(f"Running causal discovery using {self.method} on sufficient statistics (n={stats.n})...")
+
+        mlflow.set_experiment("RCIE_Discovery")
+        with mlflow.start_run(nested=True):
+            mlflow.log_param("method", self.method)
+            mlflow.log_param("num_samples", stats.n)
+            mlflow.log_param("sufficient_stats", True)
+
+            labels = stats.columns
+            if self.method == "pc":
+                result = pc_from_corr(stats.corr(), stats.n, self.options.get("alpha", 0.05),
+                                      n_jobs=self.options.get("n_jobs", 1))
+                G = cpdag_to_digraph(result.graph, labels)
+            elif self.method == "ges":
+                record = ges(cov=stats.cov(), n=stats.n, score_func="local_score_BIC")
+                G = cpdag_to_digraph(record['G'].graph, labels)
+            elif self.method == "notears":
+                W = notears_weights(stats.corr(), **self._notears_options())
+                G = weights_to_graph(W, self.options.get("w_threshold", 0.3), labels)
+            else:
+                raise ValueError(f"Unknown method: {self.method}")
+
+            num_edges = G.number_of_edges()
+            mlflow.log_metric("num_edges_found", num_edges)
+            logger.info(f"Discovery complete. Found {num_edges} edges.")
+
+            return G
+
+    def _notears_options(self) -> Dict[str, Any]:
+        return {k: self.options[k] for k in NOTEARS_OPTIONS if k in self.options}
+
     def _run_notears(self, data: pd.DataFrame) -> nx.DiGraph:
-        """Score-based optimization using PyTorch"""
+        """Score-based continuous optimization (augmented Lagrangian NOTEARS)"""
         # Normalize data for better optimization
         data_norm = (data - data.mean()) / data.std()
         data_np = data_norm.fillna(0).values
-        
-        G_int = run_notears(data_np)
-        
-        # Remap integer indices back to column names
-        G = nx.DiGraph()
-        labels = data.columns.tolist()
-        G.add_nodes_from(labels)
-        
-        for i, j in G_int.edges():
-            # NOTEARS returns A[i,j] != 0 implies i -> j
-            G.add_edge(labels[i], labels[j])
-            
-        return G
+
+        # NOTEARS returns W[i, j] != 0 as i -> j, labelled with the column names
+        return run_notears(data_np, w_threshold=self.options.get("w_threshold", 0.3),
+                           labels=data.columns.tolist(), **self._notears_options())
+
+    def _run_ensemble(self, data: pd.DataFrame) -> nx.DiGraph:
+        """Edges found stably across bootstrap resamples of several methods, with a 'confidence' attribute"""
+        from src.causal_discovery.ensemble import EnsembleDiscovery
+
+        options = dict(self.options)
+        ensemble = EnsembleDiscovery(
+            methods=options.pop("methods", EnsembleDiscovery.METHODS),
+            n_bootstrap=options.pop("n_bootstrap", 20),
+            threshold=options.pop("threshold", 0.5),
+            n_workers=options.pop("n_workers", None),
+            seed=options.pop("seed", 0),
+            options=options,
+        )
+        return ensemble.run(data)
+
+    def _run_partition(self, data: pd.DataFrame) -> nx.DiGraph:
+        """Divide and conquer: screening, overlapping clusters discovered in parallel, merged into a DAG"""
+        from src.causal_discovery.partition import PartitionedDiscovery
+
+        options = dict(self.options)
+        partitioned = PartitionedDiscovery(
+            method=options.pop("base_method", "pc"),
+            max_cluster_size=options.pop("max_cluster_size", 50),
+            max_overlap=options.pop("max_overlap", None),
+            screen_alpha=options.pop("screen_alpha", 0.01),
+            n_workers=options.pop("n_workers", None),
+            options=options,
+        )
+        return partitioned.run(data)
 
     def _run_ges(self, data: pd.DataFrame) -> nx.DiGraph:
         """Greedy Equivalence Search (Score-based)"""
@@ -73,23 +140,9 @@ class CausalDiscoveryEngine:
         
         # Returns: {'G': GeneralGraph, 'score': float}
         record = ges(data_np)
-        adj_matrix = record['G'].graph
-        
-        G = nx.DiGraph()
-        G.add_nodes_from(labels)
-        
-        # Parse causal-learn GES adjacency matrix
-        # 1: tail (-), 2: arrowhead (>)
-        # edge i -> j means graph[j, i] == 1 and graph[i, j] == 2
-        n = len(labels)
-        for i in range(n):
-            for j in range(n):
-                if adj_matrix[i, j] == 2 and adj_matrix[j, i] == 1:
-                     G.add_edge(labels[j], labels[i])
-                elif adj_matrix[i, j] == -1 and adj_matrix[j, i] == 1:
-                     G.add_edge(labels[j], labels[i])
-                     
-        return G
+
+        # Same CPDAG encoding as PC: graph[i, j] == -1 and graph[j, i] == 1 is i -> j
+        return cpdag_to_digraph(record['G'].graph, labels)
 
     def _run_pc(self, data: pd.DataFrame) -> nx.DiGraph:
         """Peter-Clark (Constraint-based)"""
@@ -98,21 +151,21 @@ class CausalDiscoveryEngine:
         
         # 0.05 is default alpha
         alpha = self.options.get("alpha", 0.05)
+
+        # 'batched': vectorized fisher-z tests per depth (optionally over n_jobs threads);
+        # 'causal-learn': the library's one-test-at-a-time implementation
+        backend = self.options.get("backend", "batched")
+        if backend == "batched":
+            stats = SufficientStats.from_data(data)
+            result = pc_from_corr(stats.corr(), stats.n, alpha, n_jobs=self.options.get("n_jobs", 1))
+            return cpdag_to_digraph(result.graph, labels)
+        if backend != "causal-learn":
+            raise ValueError(f"Unknown PC backend: {backend}")
+
         cg = pc(data_np, alpha, "fisherz", True, 0, -1)
         
         # Parse adjacency
-        adj_matrix = cg.G.graph
-        G = nx.DiGraph()
-        G.add_nodes_from(labels)
-        
-        n = len(labels)
-        for i in range(n):
-            for j in range(n):
-                # -1 -> 1 implies i -> j
-                if adj_matrix[i, j] == 1 and adj_matrix[j, i] == -1:
-                    G.add_edge(labels[j], labels[i])
-                    
-        return G
+        return cpdag_to_digraph(cg.G.graph, labels)
 
 if __name__ == "__main__":
     # Quick test
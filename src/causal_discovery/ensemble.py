@@ -0,0 +1,105 @@
+# src/causal_discovery/ensemble.py
+import os
+import shutil
+import logging
+import tempfile
+import numpy as np
+import networkx as nx
+import pandas as pd
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from src.utils.pools import spawn_pool
+
+logger = logging.getLogger(__name__)
+
+
+def bootstrap_indices(n_rows: int, seed: int, b: int) -> np.ndarray:
+    """Row indices of resample b, sorted so reads from the memory map stay sequential."""
+    rng = np.random.default_rng((seed, b))
+    return np.sort(rng.integers(0, n_rows, n_rows))
+
+
+def _resample_worker(path: str, columns: List[str], method: str, options: Dict[str, Any],
+                     seed: int, b: int) -> List[Tuple[str, str]]:
+    """Runs one method on one resample of the memory-mapped data (in a worker process)."""
+    from src.causal_discovery.discovery import CausalDiscoveryEngine
+
+    X = np.load(path, mmap_mode="r")
+    data = pd.DataFrame(X[bootstrap_indices(len(X), seed, b)], columns=columns)
+    return list(CausalDiscoveryEngine(method=method, options=options).discover(data).edges())
+
+
+class EnsembleDiscovery:
+    """
+    Stability selection over methods and bootstrap resamples.
+    Every (method, resample) pair is one discovery run; an edge's confidence is the
+    fraction of runs that found it. All methods see the same resamples.
+    The data is written once as a .npy file that workers memory-map, so only
+    (path, method, seed) travels to each worker instead of a pickled frame.
+    """
+    METHODS = ("pc", "ges", "notears")
+
+    def __init__(self,
+                 methods: Sequence[str] = METHODS,
+                 n_bootstrap: int = 20,
+                 threshold: float = 0.5,
+                 n_workers: Optional[int] = None,
+                 seed: int = 0,
+                 options: Dict[str, Any] = None):
+        self.methods = [m.lower() for m in methods]
+        unknown = set(self.methods) - set(self.METHODS)
+        if unknown or not self.methods:
+            raise ValueError(f"Ensemble methods must be among {self.METHODS}, got {list(methods)}")
+        if n_bootstrap < 1:
+            raise ValueError("n_bootstrap must be at least 1")
+        self.n_bootstrap = int(n_bootstrap)
+        self.threshold = threshold
+        self.n_workers = n_workers
+        self.seed = seed
+        self.options = options or {}
+        self.frequencies: Dict[Tuple[str, str], float] = {}
+        self.method_frequencies: Dict[str, Dict[Tuple[str, str], float]] = {}
+
+    def run(self, data: pd.DataFrame) -> nx.DiGraph:
+        """Graph of edges with confidence >= threshold; every edge carries a 'confidence' attribute."""
+        columns = data.columns.tolist()
+        tmp_dir = tempfile.mkdtemp(prefix="rcie_ensemble_")
+        try:
+            path = os.path.join(tmp_dir, "data.npy")
+            np.save(path, data.to_numpy(dtype=np.float64))
+            runs = self._run_all(path, columns)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        counts = {m: Counter() for m in self.methods}
+        for method, edges in runs:
+            counts[method].update(edges)
+        total = Counter()
+        for c in counts.values():
+            total.update(c)
+
+        self.method_frequencies = {m: {e: k / self.n_bootstrap for e, k in c.items()} for m, c in counts.items()}
+        self.frequencies = {e: k / (self.n_bootstrap * len(self.methods)) for e, k in total.items()}
+
+        G = nx.DiGraph()
+        G.add_nodes_from(columns)
+        for (u, v), confidence in sorted(self.frequencies.items(), key=lambda item: -item[1]):
+            if confidence >= self.threshold:
+                G.add_edge(u, v, confidence=confidence)
+        logger.info(f"Ensemble of {len(runs)} runs: {G.number_of_edges()} of {len(self.frequencies)} edges "
+                    f"kept at confidence >= {self.threshold}.")
+        return G
+
+    def _run_all(self, path: str, columns: List[str]) -> List[Tuple[str, List[Tuple[str, str]]]]:
+        jobs = [(method, b) for b in range(self.n_bootstrap) for method in self.methods]
+        n_workers = min(self.n_workers or os.cpu_count() or 1, len(jobs))
+
+        if n_workers <= 1:
+            return [(m, _resample_worker(path, columns, m, self.options, self.seed, b)) for m, b in jobs]
+
+        with spawn_pool(n_workers) as pool:
+            futures = [
+                (m, pool.submit(_resample_worker, path, columns, m, self.options, self.seed, b))
+                for m, b in jobs
+            ]
+            return [(m, f.result()) for m, f in futures]
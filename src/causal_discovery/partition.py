@@ -0,0 +1,170 @@
+# src/causal_discovery/partition.py
+import os
+import shutil
+import logging
+import tempfile
+import numpy as np
+import networkx as nx
+import pandas as pd
+from collections import Counter, deque
+from scipy.stats import norm
+from typing import Any, Dict, List, Optional, Tuple
+from src.causal_discovery.stats import SufficientStats
+from src.utils.pools import spawn_pool
+
+logger = logging.getLogger(__name__)
+
+
+def screen(corr: np.ndarray, n: int, alpha: float = 0.01) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Candidate dependencies for an estimate of the moral graph (every Markov blanket).
+    With enough rows, X_i - X_j is kept when their partial correlation given all other
+    variables is significant (fisher-z on the inverse correlation matrix); otherwise
+    marginal correlations are tested instead. Returns (adjacency, |correlation| used).
+    """
+    d = corr.shape[0]
+    depth = d - 2
+    if n - depth - 3 >= 10:
+        prec = np.linalg.pinv(corr)
+        scale = np.sqrt(np.abs(np.diag(prec)))
+        scale[scale == 0] = 1.0
+        r = -prec / np.outer(scale, scale)
+    else:
+        r, depth = corr.copy(), 0
+
+    r = np.clip(r, -1 + 1e-7, 1 - 1e-7)
+    stat = np.sqrt(max(n - depth - 3, 1)) * np.abs(np.arctanh(r))
+    adj = 2 * (1 - norm.cdf(stat)) < alpha
+    np.fill_diagonal(adj, False)
+    strength = np.abs(r)
+    np.fill_diagonal(strength, 0.0)
+    return adj, strength
+
+
+def partition(adj: np.ndarray, strength: np.ndarray, max_cluster_size: int = 50,
+              max_overlap: Optional[int] = None) -> List[Tuple[List[int], List[int]]]:
+    """
+    Splits the screened graph into disjoint cores of at most max_cluster_size variables
+    (breadth-first from the highest-degree unassigned variable), then widens each core
+    with its strongest outside neighbours (up to max_overlap) so edges across cores are
+    seen by both sides. Variables without any candidate dependency are left out.
+    Returns [(core, cluster)] as lists of column indices.
+    """
+    d = adj.shape[0]
+    max_overlap = max_cluster_size if max_overlap is None else max_overlap
+    neighbours = [np.flatnonzero(adj[i]) for i in range(d)]
+    degree = adj.sum(axis=1)
+    assigned = np.zeros(d, dtype=bool)
+
+    clusters = []
+    for seed in np.argsort(-degree, kind="stable"):
+        if assigned[seed] or degree[seed] == 0:
+            continue
+        core, frontier = [], deque([seed])
+        while frontier and len(core) < max_cluster_size:
+            v = frontier.popleft()
+            if assigned[v]:
+                continue
+            assigned[v] = True
+            core.append(int(v))
+            frontier.extend(neighbours[v])
+
+        in_core = np.zeros(d, dtype=bool)
+        in_core[core] = True
+        outside = np.flatnonzero(adj[core].any(axis=0) & ~in_core)
+        ranked = outside[np.argsort(-strength[np.ix_(core, outside)].max(axis=0), kind="stable")]
+        clusters.append((sorted(core), sorted(core + ranked[:max_overlap].tolist())))
+    return clusters
+
+
+def _cluster_worker(path: str, columns: List[str], cluster: List[int], method: str,
+                    options: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Runs the base method on one cluster's columns of the memory-mapped data (in a worker process)."""
+    from src.causal_discovery.discovery import CausalDiscoveryEngine
+
+    X = np.load(path, mmap_mode="r")
+    data = pd.DataFrame(X[:, cluster], columns=[columns[k] for k in cluster])
+    return list(CausalDiscoveryEngine(method=method, options=options).discover(data).edges())
+
+
+class PartitionedDiscovery:
+    """
+    Divide-and-conquer discovery for wide tables.
+    Variables are screened for candidate dependencies, partitioned into overlapping
+    clusters and the base method runs on each cluster in a process pool. A cluster only
+    reports edges touching its core; edges outside the screened graph are dropped, and
+    the rest are merged by vote, adding the best-supported edges first and skipping any
+    edge that would close a cycle, so the result is a DAG.
+    """
+    METHODS = ("pc", "ges", "notears")
+
+    def __init__(self,
+                 method: str = "pc",
+                 max_cluster_size: int = 50,
+                 max_overlap: Optional[int] = None,
+                 screen_alpha: float = 0.01,
+                 n_workers: Optional[int] = None,
+                 options: Dict[str, Any] = None):
+        self.method = method.lower()
+        if self.method not in self.METHODS:
+            raise ValueError(f"Partitioned discovery supports {self.METHODS}, not {method}")
+        if max_cluster_size < 2:
+            raise ValueError("max_cluster_size must be at least 2")
+        self.max_cluster_size = int(max_cluster_size)
+        self.max_overlap = max_overlap
+        self.screen_alpha = screen_alpha
+        self.n_workers = n_workers
+        self.options = options or {}
+        self.clusters: List[Tuple[List[int], List[int]]] = []
+
+    def run(self, data: pd.DataFrame) -> nx.DiGraph:
+        columns = data.columns.tolist()
+        stats = SufficientStats.from_data(data)
+        if stats.n <= 3:
+            raise ValueError("Not enough complete rows for discovery")
+        adj, strength = screen(stats.corr(), stats.n, self.screen_alpha)
+        self.clusters = partition(adj, strength, self.max_cluster_size, self.max_overlap)
+        logger.info(f"Partitioned {len(columns)} variables ({int(adj.sum()) // 2} candidate pairs) "
+                    f"into {len(self.clusters)} clusters.")
+
+        tmp_dir = tempfile.mkdtemp(prefix="rcie_partition_")
+        try:
+            # Column-major so each worker reads its columns contiguously from the memory map
+            # (already the layout of frames loaded with DatasetManager.fetch_matrix, so no copy)
+            path = os.path.join(tmp_dir, "data.npy")
+            np.save(path, np.asfortranarray(data.to_numpy(dtype=np.float64)))
+            results = self._run_all(path, columns)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        index = {c: k for k, c in enumerate(columns)}
+        votes = Counter()
+        for (core, _), edges in zip(self.clusters, results):
+            core = set(core)
+            for u, v in edges:
+                i, j = index[u], index[v]
+                if (i in core or j in core) and adj[i, j]:
+                    votes[(u, v)] += 1
+        return self._merge(columns, votes)
+
+    def _run_all(self, path: str, columns: List[str]) -> List[List[Tuple[str, str]]]:
+        n_workers = min(self.n_workers or os.cpu_count() or 1, len(self.clusters))
+        if n_workers <= 1:
+            return [_cluster_worker(path, columns, cluster, self.method, self.options)
+                    for _, cluster in self.clusters]
+
+        with spawn_pool(n_workers) as pool:
+            futures = [pool.submit(_cluster_worker, path, columns, cluster, self.method, self.options)
+                       for _, cluster in self.clusters]
+            return [f.result() for f in futures]
+
+    @staticmethod
+    def _merge(columns: List[str], votes: Counter) -> nx.DiGraph:
+        G = nx.DiGraph()
+        G.add_nodes_from(columns)
+        # Opposite orientations compete: the better-supported direction is added first
+        for (u, v), k in sorted(votes.items(), key=lambda item: -item[1]):
+            if G.has_edge(v, u) or nx.has_path(G, v, u):
+                continue
+            G.add_edge(u, v, votes=k)
+        return G
@@ -0,0 +1,265 @@
+# src/causal_discovery/pc.py
+# PC-stable on a correlation matrix: fisher-z only needs (corr, n), so it can run
+# from running sufficient statistics and keep its intermediate state for reuse.
+import numpy as np
+import networkx as nx
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+from scipy.stats import norm
+from typing import Dict, Iterable, List, Optional, Tuple
+
+Pair = Tuple[int, int]
+
+
+def partial_corr(corr: np.ndarray, i: int, j: int, S: Tuple[int, ...]) -> float:
+    idx = [i, j, *S]
+    sub = corr[np.ix_(idx, idx)]
+    try:
+        prec = np.linalg.inv(sub)
+    except np.linalg.LinAlgError:
+        prec = np.linalg.pinv(sub)
+    r = -prec[0, 1] / np.sqrt(prec[0, 0] * prec[1, 1])
+    return float(np.clip(r, -1 + 1e-7, 1 - 1e-7))
+
+
+def fisher_z(corr: np.ndarray, n: int, i: int, j: int, S: Tuple[int, ...]) -> float:
+    """p-value of X_i _||_ X_j | X_S, same statistic as causal-learn's 'fisherz'."""
+    r = partial_corr(corr, i, j, S)
+    z = 0.5 * np.log((1 + r) / (1 - r))
+    stat = np.sqrt(max(n - len(S) - 3, 1)) * abs(z)
+    return float(2 * (1 - norm.cdf(stat)))
+
+
+def fisher_z_batch(corr: np.ndarray, n: int, tests: np.ndarray) -> np.ndarray:
+    """
+    p-values for a (B x (2 + depth)) array of [i, j, *S] rows sharing one depth,
+    from one batched inverse of the stacked correlation submatrices.
+    """
+    depth = tests.shape[1] - 2
+    sub = corr[tests[:, :, None], tests[:, None, :]]
+    try:
+        prec = np.linalg.inv(sub)
+    except np.linalg.LinAlgError:
+        prec = np.linalg.pinv(sub)
+    r = -prec[:, 0, 1] / np.sqrt(prec[:, 0, 0] * prec[:, 1, 1])
+    r = np.clip(r, -1 + 1e-7, 1 - 1e-7)
+    z = 0.5 * np.log((1 + r) / (1 - r))
+    stat = np.sqrt(max(n - depth - 3, 1)) * np.abs(z)
+    return 2 * (1 - norm.cdf(stat))
+
+
+def _run_tests(corr: np.ndarray, n: int, tests: np.ndarray, batch_size: int, n_jobs: int) -> np.ndarray:
+    chunks = [tests[k:k + batch_size] for k in range(0, len(tests), batch_size)]
+    if n_jobs > 1 and len(chunks) > 1:
+        # numpy releases the GIL inside the batched LAPACK calls, so threads scale
+        with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+            return np.concatenate(list(pool.map(lambda t: fisher_z_batch(corr, n, t), chunks)))
+    return np.concatenate([fisher_z_batch(corr, n, t) for t in chunks])
+
+
+class PCResult:
+    """
+    Skeleton and bookkeeping of a PC run, keyed by (i, j) with i < j:
+      sepsets:    first conditioning set that separated each removed pair
+      separators: every variable in any separating set found for the pair (used for colliders)
+      weakest:    for adjacent pairs, the tested set with the largest p-value (the test closest to removing the edge)
+    """
+    def __init__(self, d: int):
+        self.adj = ~np.eye(d, dtype=bool)
+        self.sepsets: Dict[Pair, Tuple[int, ...]] = {}
+        self.separators: Dict[Pair, set] = {}
+        self.weakest: Dict[Pair, Tuple[Tuple[int, ...], float]] = {}
+        self.graph = np.zeros((d, d), dtype=int)
+        self.n_tests = 0
+
+    def remove(self, i: int, j: int, S: Tuple[int, ...], separators: Optional[set] = None):
+        self.adj[i, j] = self.adj[j, i] = False
+        self.sepsets[(i, j)] = S
+        self.separators[(i, j)] = set(S) if separators is None else separators
+        self.weakest.pop((i, j), None)
+
+    def restore(self, i: int, j: int):
+        self.adj[i, j] = self.adj[j, i] = True
+        self.sepsets.pop((i, j), None)
+        self.separators.pop((i, j), None)
+        self.weakest.pop((i, j), None)
+
+
+def pc_skeleton(corr: np.ndarray, n: int, alpha: float = 0.05,
+                result: Optional[PCResult] = None,
+                pairs: Optional[Iterable[Pair]] = None,
+                max_depth: Optional[int] = None,
+                n_jobs: int = 1,
+                batch_size: int = 65536,
+                cache: Optional[Dict[Tuple[int, int, Tuple[int, ...]], float]] = None) -> PCResult:
+    """
+    PC-stable adjacency search (neighbourhoods are frozen per depth).
+    As in causal-learn's stable mode, every conditioning set of a depth is tested from both
+    endpoints and a removed pair remembers all variables of its separating sets. The tests of
+    a depth are collected first, de-duplicated (both endpoints often propose the same set)
+    and evaluated as batched partial-correlation solves.
+    With `result` and `pairs`, only those pairs are searched against the current skeleton.
+    `cache` collects every p-value keyed by (i, j, S) for reuse by later stages on the same data.
+    """
+    d = corr.shape[0]
+    result = result or PCResult(d)
+    adj = result.adj
+    if pairs is None:
+        pairs = [(i, j) for i in range(d) for j in range(i + 1, d) if adj[i, j]]
+    todo = sorted(set(pairs))
+
+    depth = 0
+    while todo and (max_depth is None or depth <= max_depth):
+        neighbours = [np.flatnonzero(adj[i]) for i in range(d)]
+
+        # Ordered conditioning sets per pair, and the unique tests of this depth
+        plans: Dict[Pair, List[Tuple[int, ...]]] = {}
+        index: Dict[Tuple[int, int, Tuple[int, ...]], int] = {}
+        for i, j in todo:
+            if not adj[i, j]:
+                continue
+            sets = []
+            for a, b in ((i, j), (j, i)):
+                candidates = [k for k in neighbours[a] if k != b]
+                if len(candidates) < depth:
+                    continue
+                for S in combinations(candidates, depth):
+                    sets.append(S)
+                    index.setdefault((i, j, S), len(index))
+            if sets:
+                plans[(i, j)] = sets
+        if not plans:
+            break
+
+        tests = np.array([[i, j, *S] for i, j, S in index], dtype=np.int64).reshape(len(index), depth + 2)
+        p_values = _run_tests(corr, n, tests, batch_size, n_jobs)
+        result.n_tests += len(index)
+        if cache is not None:
+            cache.update(zip(index, p_values.tolist()))
+
+        for (i, j), sets in plans.items():
+            p = p_values[[index[(i, j, S)] for S in sets]]
+            independent = np.flatnonzero(p > alpha)
+            if len(independent):
+                separators = {k for t in independent for k in sets[t]}
+                result.remove(i, j, sets[independent[0]], separators)
+                continue
+            t = int(np.argmax(p))
+            if p[t] > result.weakest.get((i, j), ((), -1.0))[1]:
+                result.weakest[(i, j)] = (sets[t], float(p[t]))
+        depth += 1
+    return result
+
+
+def _powerset(items) -> List[Tuple[int, ...]]:
+    items = list(items)
+    return [S for r in range(len(items) + 1) for S in combinations(items, r)]
+
+
+def orient(adj: np.ndarray, separators: Dict[Pair, set],
+           corr: Optional[np.ndarray] = None, n: Optional[int] = None,
+           cache: Optional[Dict[Tuple[int, int, Tuple[int, ...]], float]] = None) -> np.ndarray:
+    """
+    Unshielded colliders followed by Meek rules 1-3 (skipping orientations that would create a cycle).
+    Conflicting colliders are resolved like causal-learn's default (priority 3): with (corr, n),
+    triples x - y - z are applied in ascending order of max p(x _||_ z | S) over sets S of
+    x's or z's neighbours that contain y, and an edge already pointing away from y is kept.
+    Returns a CPDAG in causal-learn encoding: G[i, j] = -1, G[j, i] = 1 is i -> j; -1/-1 is undirected.
+    """
+    d = adj.shape[0]
+    # arrow[i, j] and not arrow[j, i]: i -> j; both set: undirected
+    arrow = adj.copy()
+
+    def directed(a, b):
+        return arrow[a, b] and not arrow[b, a]
+
+    def undirected(a, b):
+        return arrow[a, b] and arrow[b, a]
+
+    def is_ancestor(a, b):
+        """Directed path a -> ... -> b."""
+        stack, seen = [a], {a}
+        while stack:
+            c = stack.pop()
+            for e in np.flatnonzero(arrow[c] & ~arrow[:, c]):
+                if e == b:
+                    return True
+                if e not in seen:
+                    seen.add(e)
+                    stack.append(e)
+        return False
+
+    colliders = [
+        (x, y, z)
+        for x in range(d) for y in np.flatnonzero(adj[x]) for z in np.flatnonzero(adj[y])
+        if x < z and not adj[x, z] and y not in separators.get((x, z), ())
+    ]
+    if corr is not None and colliders:
+        scores = []
+        for x, y, z in colliders:
+            sets = set(_powerset(np.flatnonzero(adj[x]))) | set(_powerset(np.flatnonzero(adj[z])))
+            tests = [S for S in sets if y in S]
+            if cache is None:
+                scores.append(max(fisher_z(corr, n, x, z, S) for S in tests))
+                continue
+            for S in tests:
+                if (x, z, S) not in cache:
+                    cache[(x, z, S)] = fisher_z(corr, n, x, z, S)
+            scores.append(max(cache[(x, z, S)] for S in tests))
+        colliders = [colliders[t] for t in np.argsort(scores, kind="stable")]
+
+    for x, y, z in colliders:
+        if not directed(y, x) and not directed(y, z):
+            arrow[x, y] = arrow[z, y] = True
+            arrow[y, x] = arrow[y, z] = False
+
+    changed = True
+    while changed:
+        changed = False
+        for a in range(d):
+            for b in range(d):
+                if a == b or not undirected(a, b):
+                    continue
+                parents_a = [c for c in range(d) if directed(c, a)]
+                # R1: c -> a - b with c, b non-adjacent
+                r1 = any(not adj[c, b] for c in parents_a)
+                # R2: a -> c -> b
+                r2 = any(directed(a, c) and directed(c, b) for c in range(d))
+                # R3: a - c -> b and a - e -> b with c, e non-adjacent
+                spouses = [c for c in range(d) if undirected(a, c) and directed(c, b)]
+                r3 = any(not adj[c, e] for c, e in combinations(spouses, 2))
+                # Finite-sample colliders can be inconsistent; never close a directed cycle
+                if (r1 or r2 or r3) and not is_ancestor(b, a):
+                    arrow[b, a] = False
+                    changed = True
+
+    G = np.zeros((d, d), dtype=int)
+    for i, j in zip(*np.nonzero(np.triu(adj, 1))):
+        if directed(i, j):
+            G[i, j], G[j, i] = -1, 1
+        elif directed(j, i):
+            G[j, i], G[i, j] = -1, 1
+        else:
+            G[i, j] = G[j, i] = -1
+    return G
+
+
+def pc_from_corr(corr: np.ndarray, n: int, alpha: float = 0.05, max_depth: Optional[int] = None,
+                 n_jobs: int = 1) -> PCResult:
+    cache = {}
+    result = pc_skeleton(corr, n, alpha, max_depth=max_depth, n_jobs=n_jobs, cache=cache)
+    result.graph = orient(result.adj, result.separators, corr, n, cache)
+    return result
+
+
+def cpdag_to_digraph(adj_matrix: np.ndarray, labels: List[str]) -> nx.DiGraph:
+    """Directed edges of a causal-learn CPDAG matrix; undirected edges are dropped."""
+    G = nx.DiGraph()
+    G.add_nodes_from(labels)
+    n = len(labels)
+    for i in range(n):
+        for j in range(n):
+            # -1 -> 1 implies i -> j
+            if adj_matrix[i, j] == 1 and adj_matrix[j, i] == -1:
+                G.add_edge(labels[j], labels[i])
+    return G
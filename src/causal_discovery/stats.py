@@ -0,0 +1,73 @@
+# src/causal_discovery/stats.py
+import numpy as np
+import pandas as pd
+from typing import List, Union
+
+
+class SufficientStats:
+    """
+    Sample count, column means and centred cross-product (comoment) matrix,
+    accumulated batch by batch. This is all fisher-z PC and least-squares NOTEARS need.
+    Rows with a missing value in any column are skipped (complete cases only).
+    """
+    def __init__(self, columns: List[str]):
+        self.columns = list(columns)
+        d = len(self.columns)
+        self.n = 0
+        self.mean = np.zeros(d)
+        self.comoment = np.zeros((d, d))
+
+    @classmethod
+    def from_moments(cls, columns: List[str], n: int, mean: np.ndarray, cov: np.ndarray) -> "SufficientStats":
+        """Builds the statistics from a sample covariance (ddof=1), e.g. one computed in SQL."""
+        stats = cls(columns)
+        stats.n = int(n)
+        stats.mean = np.asarray(mean, dtype=np.float64)
+        stats.comoment = np.asarray(cov, dtype=np.float64) * max(0, stats.n - 1)
+        return stats
+
+    @classmethod
+    def from_data(cls, data: pd.DataFrame) -> "SufficientStats":
+        return cls(data.columns.tolist()).update(data)
+
+    def update(self, data: Union[pd.DataFrame, np.ndarray]) -> "SufficientStats":
+        if isinstance(data, pd.DataFrame):
+            if data.columns.tolist() != self.columns:
+                data = data.reindex(columns=self.columns)
+            data = data.to_numpy(dtype=np.float64)
+        X = np.asarray(data, dtype=np.float64)
+        complete = ~np.isnan(X).any(axis=1)
+        if not complete.all():
+            X = X[complete]
+        if not len(X):
+            return self
+
+        mean = X.mean(axis=0)
+        Xc = X - mean
+        return self._merge(len(X), mean, Xc.T @ Xc)
+
+    def merge(self, other: "SufficientStats") -> "SufficientStats":
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge statistics over different columns")
+        return self._merge(other.n, other.mean, other.comoment)
+
+    def _merge(self, n_b: int, mean_b: np.ndarray, comoment_b: np.ndarray) -> "SufficientStats":
+        if n_b == 0:
+            return self
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.comoment = self.comoment + comoment_b + np.outer(delta, delta) * (self.n * n_b / n)
+        self.mean = self.mean + delta * (n_b / n)
+        self.n = n
+        return self
+
+    def cov(self, ddof: int = 1) -> np.ndarray:
+        return self.comoment / max(1, self.n - ddof)
+
+    def corr(self) -> np.ndarray:
+        cov = self.cov()
+        std = np.sqrt(np.diag(cov))
+        std[std == 0] = 1.0
+        corr = cov / np.outer(std, std)
+        np.fill_diagonal(corr, 1.0)
+        return corr
@@ -1,9 +1,9 @@
 # src/counterfactuals/engine.py
 import numpy as np
 import pandas as pd
-import networkx as nx
 import torch
 import logging
+from typing import Dict, List
 from src.scm.estimator import CausalSCM
 
 logger = logging.getLogger(__name__)
@@ -16,75 +16,92 @@ class CounterfactualEngine:
 
     def _abduct_noise(self, observation: pd.Series) -> pd.Series:
         """
-        Step 1: Abduction. 
+        Step 1: Abduction.
         Infer noise (U) from observed data. If an observation is missing, assume U=0 (Average case).
         """
-        noise = {}
-        
-        full_obs = pd.Series(index=self.scm.graph.nodes(), dtype=float)
-        full_obs.update(observation)
-        
-        obs_norm = (full_obs - self.scm.data_stats['mean']) / self.scm.data_stats['std']
-        
-        for node in self.scm.graph.nodes():
-            parents = list(self.scm.graph.predecessors(node))
-            
-            if not parents:
-                pred_val = 0.0 
+        plan = self.scm.plan
+        obs_norm = plan.normalize(self._to_matrix(observation.to_frame().T))
+        noise = self._abduct_noise_batch(obs_norm)
+        return pd.Series(noise[0].astype(float), index=plan.nodes)
+
+    def estimate_counterfactual(self,
+                                observation: pd.Series,
+                                intervention: dict) -> pd.Series:
+        cf = self.estimate_counterfactual_batch(observation.to_frame().T, [intervention])[0]
+        result = cf.iloc[0].astype(float)
+
+        # Same index as before batching: the graph nodes plus every column of data_stats,
+        # where columns outside the graph are not modelled and stay NaN
+        return result.reindex(result.index.union(self.scm.data_stats['mean'].index))
+
+    def _to_matrix(self, observations: pd.DataFrame) -> np.ndarray:
+        """Aligns observation columns to plan node order (missing -> NaN)."""
+        return observations.reindex(columns=self.scm.plan.nodes).to_numpy(dtype=np.float32)
+
+    def _abduct_noise_batch(self, obs_norm: np.ndarray) -> np.ndarray:
+        """
+        Batched abduction over an (N x D) matrix of normalized observations.
+        One forward pass per node covers all rows; NaN marks an unobserved value (U=0).
+        """
+        plan = self.scm.plan
+        observed = ~np.isnan(obs_norm)
+        parent_input = np.nan_to_num(obs_norm, nan=0.0)
+        noise = np.zeros_like(obs_norm)
+
+        for i in range(len(plan)):
+            parents = plan.parents[i]
+
+            if len(parents) == 0:
+                pred = np.zeros(len(obs_norm), dtype=np.float32)
             else:
-                parent_vals = obs_norm[parents].fillna(0.0).values.astype(np.float32)
-                model = self.scm.models[node]
                 with torch.no_grad():
-                    pred_tensor = model(torch.tensor(parent_vals, dtype=torch.float32))
-                    pred_val = pred_tensor.item()
+                    pred = plan.models[i](torch.from_numpy(parent_input[:, parents])).numpy().ravel()
 
-            # If we observed the node, Noise = Actual - Predicted
-            if not pd.isna(obs_norm[node]):
-                noise[node] = obs_norm[node] - pred_val
-            else:
-                # If we didn't observe it, assume it was acting "normally" (Zero noise)
-                noise[node] = 0.0
-            
-        return pd.Series(noise)
+            # If we observed the node, Noise = Actual - Predicted; otherwise zero noise
+            noise[:, i] = np.where(observed[:, i], obs_norm[:, i] - pred, 0.0)
 
-    def estimate_counterfactual(self, 
-                                observation: pd.Series, 
-                                intervention: dict) -> pd.Series:
-        u_noise = self._abduct_noise(observation)
-        
+        return noise
+
+    def estimate_counterfactual_batch(self,
+                                      observations: pd.DataFrame,
+                                      interventions: List[Dict[str, float]]) -> List[pd.DataFrame]:
+        """
+        Vectorized counterfactuals for many observations at once.
+        Rows of `observations` are units, columns are node names (missing columns or NaN = unobserved).
+        Returns one DataFrame per intervention, aligned with the observation rows.
+        """
+        plan = self.scm.plan
+        encoded = [plan.encode(intervention) for intervention in interventions]
+
+        obs_norm = plan.normalize(self._to_matrix(observations))
+
+        # 1. Abduction (shared by every intervention)
+        u_noise = self._abduct_noise_batch(obs_norm)
         # Start state: Use observation if available, otherwise use Mean (0.0 normalized)
-        current_state = pd.Series(index=self.scm.graph.nodes(), dtype=float)
-        full_obs = pd.Series(index=self.scm.graph.nodes(), dtype=float)
-        full_obs.update(observation)
-        
-        # Normalize start state
-        current_state = (full_obs - self.scm.data_stats['mean']) / self.scm.data_stats['std']
-        current_state = current_state.fillna(0.0) # Fill unknown starts with Mean
-        
-        # Apply Intervention
-        for node, value in intervention.items():
-            norm_val = (value - self.scm.data_stats['mean'][node]) / self.scm.data_stats['std'][node]
-            current_state[node] = norm_val
-
-        # 3. Prediction (Propagate)
-        topo_order = list(nx.topological_sort(self.scm.graph))
-        
-        for node in topo_order:
-            if node in intervention:
-                continue
-                
-            parents = list(self.scm.graph.predecessors(node))
-            if not parents:
-                continue
-            
-            parent_vals = current_state[parents].values.astype(np.float32)
-            model = self.scm.models[node]
-            
-            with torch.no_grad():
-                pred_effect = model(torch.tensor(parent_vals, dtype=torch.float32)).item()
-
-            current_state[node] = pred_effect + u_noise[node]
-
-        # De-normalize
-        result = current_state * self.scm.data_stats['std'] + self.scm.data_stats['mean']
-        return result
\ No newline at end of file
+        start_state = np.nan_to_num(obs_norm, nan=0.0)
+
+        results = []
+        for intervention in encoded:
+            # 2. Action
+            current_state = start_state.copy()
+            for i, norm_val in intervention.items():
+                current_state[:, i] = norm_val
+
+            # 3. Prediction (Propagate), one batched forward pass per node
+            for i in plan.topo_order:
+                if i in intervention:
+                    continue
+
+                parents = plan.parents[i]
+                if len(parents) == 0:
+                    continue
+
+                with torch.no_grad():
+                    pred_effect = plan.models[i](torch.from_numpy(current_state[:, parents])).numpy().ravel()
+
+                current_state[:, i] = pred_effect + u_noise[:, i]
+
+            # De-normalize
+            results.append(pd.DataFrame(plan.denormalize(current_state), index=observations.index, columns=plan.nodes))
+
+        return results
@@ -0,0 +1,239 @@
+# src/jobs/manager.py
+import os
+import re
+import json
+import uuid
+import time
+import threading
+import logging
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from src.utils.pools import SPAWN, spawn_pool
+
+logger = logging.getLogger(__name__)
+
+PENDING, RUNNING, SUCCEEDED, FAILED, CANCELLED = "pending", "running", "succeeded", "failed", "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a task when its cancel flag is set."""
+
+
+# Minimum seconds between progress snapshots a running task writes to the state dir
+SNAPSHOT_INTERVAL = 1.0
+
+
+def _write_state(path: str, state: Dict[str, Any]):
+    """Atomically replaces the job state file at `path`."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, default=str)
+    os.replace(tmp_path, path)
+
+
+class JobContext:
+    """
+    Handed to every task. Progress is written to a shared dict the API can poll;
+    tasks call check_cancelled() at safe points to stop early. `cancel_path` is a marker
+    file another API process creates to cancel a job it does not own.
+
+    With `state_path`, report() also rewrites the job's state file (at most every
+    SNAPSHOT_INTERVAL seconds), so API processes that do not own the job see its progress.
+    """
+    def __init__(self, progress, cancel_event, cancel_path: Optional[str] = None,
+                 state_path: Optional[str] = None, job_id: Optional[str] = None, kind: Optional[str] = None):
+        self.progress = progress
+        self.cancel_event = cancel_event
+        self.cancel_path = cancel_path
+        self.state_path = state_path
+        self.job_id = job_id
+        self.kind = kind
+        self._saved_at = 0.0
+
+    def report(self, **info):
+        self.progress.update(info)
+        if self.state_path is None:
+            return
+        now = time.monotonic()
+        if now - self._saved_at < SNAPSHOT_INTERVAL and "status" not in info:
+            return
+        self._saved_at = now
+        progress = dict(self.progress)
+        progress.pop("status", None)
+        try:
+            _write_state(self.state_path, {"job_id": self.job_id, "kind": self.kind, "status": RUNNING,
+                                           "progress": progress, "error": None, "result": None})
+        except OSError as e:
+            logger.warning(f"Could not save progress of job {self.job_id}: {e}")
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set() or (self.cancel_path and os.path.exists(self.cancel_path)):
+            raise JobCancelled()
+
+
+def _run_task(fn: Callable, ctx: JobContext, args: tuple, kwargs: dict):
+    ctx.check_cancelled()
+    ctx.report(status=RUNNING, started_at=time.time())
+    return fn(ctx, *args, **kwargs)
+
+
+class Job:
+    def __init__(self, job_id: str, kind: str, progress, cancel_event):
+        self.id = job_id
+        self.kind = kind
+        self.progress = progress
+        self.cancel_event = cancel_event
+        self.status = PENDING
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.future: Optional[Future] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        progress = dict(self.progress)
+        status = self.status
+        if status == PENDING and progress.get("status") == RUNNING:
+            status = RUNNING
+        progress.pop("status", None)
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": status,
+            "progress": progress,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """
+    Runs long fits/discoveries in a process pool so API handlers return immediately.
+    Jobs are tracked in memory; the oldest finished jobs are forgotten beyond `max_history`.
+
+    With `state_dir`, each job's status (and result) is also written to <state_dir>/<id>.json
+    when it is submitted, while it reports progress and when it finishes, so other API
+    processes sharing the directory can answer status, result and cancel requests for it.
+    """
+    def __init__(self, max_workers: int = 2, max_history: int = 100, state_dir: Optional[str] = None):
+        self.max_workers = max_workers
+        self.max_history = max_history
+        self.state_dir = state_dir
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._sync = None
+
+    def _ensure_pool(self):
+        if self._pool is None:
+            self._sync = SPAWN.Manager()
+            self._pool = spawn_pool(self.max_workers)
+
+    def submit(self,
+               kind: str,
+               fn: Callable,
+               *args,
+               on_success: Optional[Callable[[Any], Any]] = None,
+               **kwargs) -> Job:
+        """
+        Schedules fn(ctx, *args, **kwargs) in a worker process.
+        `on_success` runs in the API process with the task result; its return value becomes the job result.
+        """
+        with self._lock:
+            self._ensure_pool()
+            job = Job(uuid.uuid4().hex, kind, self._sync.dict(), self._sync.Event())
+            ctx = JobContext(job.progress, job.cancel_event, self._state_path(job.id, ".cancel"),
+                             self._state_path(job.id), job.id, kind)
+            job.future = self._pool.submit(_run_task, fn, ctx, args, kwargs)
+            self._jobs[job.id] = job
+            self._prune()
+
+        self._save(job)
+        job.future.add_done_callback(lambda f: self._finish(job, f, on_success))
+        logger.info(f"Submitted {kind} job {job.id}")
+        return job
+
+    def _finish(self, job: Job, future: Future, on_success: Optional[Callable]):
+        try:
+            if future.cancelled():
+                job.status = CANCELLED
+                return
+            result = future.result()
+            job.result = on_success(result) if on_success else result
+            job.status = SUCCEEDED
+        except JobCancelled:
+            job.status = CANCELLED
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}")
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+            self._save(job)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        return job if job is not None else self._load(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancels a pending job outright; a running job stops at its next cancellation check."""
+        job = self.get(job_id)
+        if job is None or job.status in FINISHED:
+            return job
+        if job.future is None:
+            # Owned by another process: leave a marker its task checks
+            open(self._state_path(job_id, ".cancel"), "a").close()
+            return job
+        job.cancel_event.set()
+        if job.future.cancel():
+            job.status = CANCELLED
+        return job
+
+    # --- Shared state ---
+
+    def _state_path(self, job_id: str, suffix: str = ".json") -> Optional[str]:
+        if self.state_dir is None or not re.fullmatch(r"[0-9a-f]{32}", job_id):
+            return None
+        return os.path.join(self.state_dir, job_id + suffix)
+
+    def _save(self, job: Job):
+        path = self._state_path(job.id)
+        if path is None:
+            return
+        state = dict(job.to_dict(), result=job.result if job.status == SUCCEEDED else None)
+        try:
+            _write_state(path, state)
+        except OSError as e:
+            logger.warning(f"Could not save state of job {job.id}: {e}")
+
+    def _load(self, job_id: str) -> Optional[Job]:
+        path = self._state_path(job_id)
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except (TypeError, OSError, ValueError):
+            return None
+        job = Job(job_id, state["kind"], state["progress"], None)
+        job.status, job.error, job.result = state["status"], state["error"], state["result"]
+        return job
+
+    def _prune(self):
+        finished = [jid for jid, job in self._jobs.items() if job.status in FINISHED]
+        for jid in finished[:max(0, len(self._jobs) - self.max_history)]:
+            del self._jobs[jid]
+            for suffix in (".json", ".cancel"):
+                path = self._state_path(jid, suffix)
+                if path is not None and os.path.exists(path):
+                    os.remove(path)
+
+    def shutdown(self):
+        if self._pool is not None:
+            for job in list(self._jobs.values()):
+                if job.status not in FINISHED:
+                    job.cancel_event.set()
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._sync.shutdown()
+            self._pool = None
@@ -0,0 +1,55 @@
+# src/jobs/tasks.py
+# Task functions run in worker processes: top-level, picklable arguments only.
+import os
+import logging
+import networkx as nx
+import pandas as pd
+from typing import Any, Dict, List, Optional
+from src.jobs.manager import JobContext
+
+logger = logging.getLogger(__name__)
+
+
+def fit_scm_task(ctx: JobContext, df: pd.DataFrame, dag_edges: List[List[str]], epochs: int, output_path: str,
+                 mode: str = "sequential", n_jobs: Optional[int] = None) -> str:
+    """Fits a CausalSCM on an (already acyclic) edge list and saves it to output_path."""
+    from src.scm.estimator import CausalSCM
+
+    g = nx.DiGraph()
+    g.add_edges_from((edge[0], edge[1]) for edge in dag_edges)
+
+    def on_progress(info: Dict):
+        ctx.check_cancelled()
+        ctx.report(stage="fit", **info)
+
+    scm = CausalSCM(g)
+    scm.fit(df, epochs=epochs, callback=on_progress, mode=mode, n_jobs=n_jobs)
+
+    ctx.check_cancelled()
+    ctx.report(stage="save")
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    scm.save(output_path)
+    return output_path
+
+
+def run_discovery(df: pd.DataFrame, method: str, options: Dict[str, Any]) -> nx.DiGraph:
+    """Causal discovery without job bookkeeping, for the API's discovery process pool."""
+    from src.causal_discovery.discovery import CausalDiscoveryEngine
+
+    return CausalDiscoveryEngine(method=method, options=options).run(df)
+
+
+def discover_task(ctx: JobContext, df: pd.DataFrame, method: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Runs causal discovery; cancellation is honoured before and after the algorithm."""
+    from src.causal_discovery.discovery import CausalDiscoveryEngine
+
+    ctx.check_cancelled()
+    ctx.report(stage="discover", method=method, n_rows=len(df), n_columns=df.shape[1])
+    graph = CausalDiscoveryEngine(method=method, options=options).run(df)
+
+    ctx.check_cancelled()
+    edges = list(graph.edges(data=True))
+    result = {"edges": [[u, v] for u, v, _ in edges], "nodes": df.columns.tolist(), "method": method}
+    if edges and all("confidence" in d for _, _, d in edges):
+        result["confidence"] = [d["confidence"] for _, _, d in edges]
+    return result
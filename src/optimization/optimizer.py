@@ -0,0 +1,161 @@
+# src/optimization/optimizer.py
+import torch
+import logging
+from typing import Dict, List, Optional, Tuple
+from src.scm.estimator import CausalSCM
+from src.simulator.fused import FusedProgram
+
+logger = logging.getLogger(__name__)
+
+GOALS = ("target", "maximize", "minimize")
+
+
+class Objective:
+    """One term of the optimization goal, measured on the mean of `node`."""
+    def __init__(self, node: str, goal: str = "target", target_value: Optional[float] = None, weight: float = 1.0):
+        if goal not in GOALS:
+            raise ValueError(f"Unknown goal: {goal}")
+        if goal == "target" and target_value is None:
+            raise ValueError(f"Objective on {node} needs a target_value.")
+        self.node = node
+        self.goal = goal
+        self.target_value = target_value
+        self.weight = weight
+
+
+class InterventionOptimizer:
+    """
+    Optimizes several control nodes jointly by back-propagating through the
+    fused NodeEstimator chain. Each step simulates all restarts as one batch
+    with fixed noise (common random numbers), so the cost per step does not
+    depend on the number of controls.
+    """
+    def __init__(self,
+                 scm: CausalSCM,
+                 n_samples: int = 256,
+                 n_restarts: int = 8,
+                 steps: int = 200,
+                 lr: float = 0.05,
+                 seed: int = 0):
+        if not scm.is_fitted:
+            raise ValueError("SCM must be fitted before optimizing interventions.")
+        self.scm = scm
+        self.n_samples = n_samples
+        self.n_restarts = n_restarts
+        self.steps = steps
+        self.lr = lr
+        self.seed = seed
+
+    def optimize(self,
+                 bounds: Dict[str, Tuple[float, float]],
+                 objectives: List[Objective],
+                 costs: Optional[Dict[str, float]] = None,
+                 budget: Optional[float] = None) -> Dict:
+        """
+        Args:
+            bounds: {control node: (low, high)} box constraints in raw units
+            objectives: weighted terms; 'target' terms are squared errors in normalized units
+            costs/budget: linear constraint sum(costs[node] * value) <= budget
+        Returns:
+            {'values': {node: value}, 'outcomes': {node: mean}, 'cost': float or None, 'loss': float}
+        """
+        plan = self.scm.plan
+        program = FusedProgram.for_plan(plan)
+
+        controls = list(bounds.keys())
+        for node in controls + [obj.node for obj in objectives]:
+            if node not in plan.index:
+                raise ValueError(f"Unknown node: {node}")
+
+        ctrl_idx = [plan.index[node] for node in controls]
+        low = torch.tensor([bounds[n][0] for n in controls], dtype=torch.float32)
+        high = torch.tensor([bounds[n][1] for n in controls], dtype=torch.float32)
+        cost_vec = torch.tensor([(costs or {}).get(n, 0.0) for n in controls], dtype=torch.float32)
+        # Cheapest point of the box: low where a unit costs, high where it pays back
+        cheapest = torch.where(cost_vec >= 0, low, high)
+        if budget is not None and float(cost_vec @ cheapest) > budget:
+            raise ValueError("Budget is infeasible even at the cheapest bounds.")
+
+        mean = torch.from_numpy(plan.mean)
+        std = torch.from_numpy(plan.std)
+
+        # Unconstrained parameters, squashed into the box; restart 0 starts mid-box
+        gen = torch.Generator().manual_seed(self.seed)
+        z = torch.randn(self.n_restarts, len(controls), generator=gen)
+        z[0] = 0.0
+        z.requires_grad_(True)
+        optimizer = torch.optim.Adam([z], lr=self.lr)
+
+        for step in range(self.steps):
+            optimizer.zero_grad()
+            values = low + (high - low) * torch.sigmoid(z)
+            loss = self._loss(program, values, ctrl_idx, objectives, mean, std)
+
+            if budget is not None:
+                # Quadratic penalty that tightens over the run
+                excess = torch.relu(values @ cost_vec - budget) / max(abs(budget), 1.0)
+                loss = loss + 10.0 * (1 + step) * excess.pow(2)
+
+            loss.sum().backward()
+            optimizer.step()
+
+        with torch.no_grad():
+            values = low + (high - low) * torch.sigmoid(z)
+            if budget is not None:
+                values = self._repair_budget(values, cheapest, cost_vec, budget)
+            final_loss = self._loss(program, values, ctrl_idx, objectives, mean, std)
+            best = int(torch.argmin(final_loss))
+            best_values = values[best]
+
+            outcomes = self._simulate(program, best_values.unsqueeze(0), ctrl_idx, seed=self.seed + 1)
+            outcomes = outcomes.mean(dim=1)[0] * std + mean
+
+        logger.info(f"Optimized {len(controls)} controls; best restart {best} with loss {final_loss[best]:.4f}.")
+        return {
+            'values': {node: float(best_values[k]) for k, node in enumerate(controls)},
+            'outcomes': {node: float(outcomes[i]) for node, i in plan.index.items()},
+            'cost': float(best_values @ cost_vec) if costs else None,
+            'loss': float(final_loss[best]),
+        }
+
+    def _simulate(self, program: FusedProgram, values: torch.Tensor, ctrl_idx: List[int], seed: int) -> torch.Tensor:
+        """Normalized samples shaped (restarts x samples x nodes) for raw control `values`."""
+        plan = self.scm.plan
+        n_restarts = values.shape[0]
+        fixed = {}
+        for k, i in enumerate(ctrl_idx):
+            norm = (values[:, k] - float(plan.mean[i])) / float(plan.std[i])
+            fixed[i] = norm.repeat_interleave(self.n_samples)
+
+        gen = torch.Generator().manual_seed(seed)
+        samples = program.run(n_restarts * self.n_samples, fixed, generator=gen)
+        return samples.reshape(n_restarts, self.n_samples, -1)
+
+    def _loss(self, program, values, ctrl_idx, objectives, mean, std) -> torch.Tensor:
+        """Per-restart weighted objective, computed in normalized units."""
+        samples = self._simulate(program, values, ctrl_idx, seed=self.seed)
+        node_means = samples.mean(dim=1)
+        loss = torch.zeros(values.shape[0])
+
+        for obj in objectives:
+            i = self.scm.plan.index[obj.node]
+            m = node_means[:, i]
+            if obj.goal == "target":
+                loss = loss + obj.weight * (m - (obj.target_value - mean[i]) / std[i]).pow(2)
+            elif obj.goal == "maximize":
+                loss = loss - obj.weight * m
+            else:
+                loss = loss + obj.weight * m
+        return loss
+
+    @staticmethod
+    def _repair_budget(values: torch.Tensor, cheapest: torch.Tensor, cost_vec: torch.Tensor, budget: float) -> torch.Tensor:
+        """Shrinks over-budget rows toward the cheapest corner of the box until the constraint holds."""
+        spend = values @ cost_vec
+        base = cheapest @ cost_vec
+        over = spend > budget
+        if over.any():
+            t = ((budget - base) / (spend - base).clamp_min(1e-12)).clamp(0.0, 1.0)
+            shrunk = cheapest + t.unsqueeze(1) * (values - cheapest)
+            values = torch.where(over.unsqueeze(1), shrunk, values)
+        return values
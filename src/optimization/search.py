@@ -0,0 +1,59 @@
+# src/optimization/search.py
+import numpy as np
+import logging
+from typing import Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# predict(candidates) -> expected target value per candidate, evaluated as one batch
+Predictor = Callable[[np.ndarray], np.ndarray]
+
+
+def grid_search(predict: Predictor,
+                target_value: float,
+                low: float,
+                high: float,
+                n_candidates: int = 50) -> Tuple[float, float]:
+    """
+    Evaluates an evenly spaced grid in a single batched call.
+    Returns (best candidate, predicted outcome at that candidate).
+    """
+    candidates = np.linspace(low, high, n_candidates)
+    preds = predict(candidates)
+    k = int(np.argmin(np.abs(preds - target_value)))
+    return float(candidates[k]), float(preds[k])
+
+
+def adaptive_search(predict: Predictor,
+                    target_value: float,
+                    low: float,
+                    high: float,
+                    n_candidates: int = 50,
+                    n_rounds: int = 4) -> Tuple[float, float]:
+    """
+    Coarse-to-fine grid: each round evaluates a small batch, then zooms in on
+    the bracket around the best point. `n_candidates` is the total budget.
+    With the defaults (4 rounds of 12 points) the final step is range / 1830, about 37x finer
+    than a 50-point grid. `predict` should use common random numbers (the same noise on every
+    call, e.g. expected_outcomes with a seed); otherwise each round redraws Monte Carlo noise
+    and the zoom can follow the noise rather than the model.
+    """
+    per_round = max(5, n_candidates // n_rounds)
+    lower, upper = low, high
+    best_val, best_pred, best_diff = low, 0.0, float('inf')
+
+    for r in range(n_rounds):
+        candidates = np.linspace(low, high, per_round)
+        preds = predict(candidates)
+        diffs = np.abs(preds - target_value)
+        k = int(np.argmin(diffs))
+
+        if diffs[k] < best_diff:
+            best_val, best_pred, best_diff = float(candidates[k]), float(preds[k]), float(diffs[k])
+
+        # Next round searches the neighbouring grid cells of the best point
+        step = (high - low) / (per_round - 1)
+        low, high = max(lower, candidates[k] - step), min(upper, candidates[k] + step)
+        logger.debug(f"Adaptive round {r}: best={candidates[k]:.4f}, bracket=[{low:.4f}, {high:.4f}]")
+
+    return best_val, best_pred
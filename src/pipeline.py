@@ -17,7 +17,7 @@ def discover_structure(df):
 def train_model(df, graph):
     scm = CausalSCM(graph)
     scm.fit(df, epochs=100)
-    scm.save("data/models/automated_model.pkl")
+    scm.save("data/models/automated_model.scm")
     return scm
 
 @flow(name="RCIE Retraining Loop")
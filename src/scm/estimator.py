@@ -8,7 +8,12 @@ import logging
 import pickle
 import os
 import mlflow
-from typing import Dict
+from concurrent.futures import as_completed
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from src.scm.plan import SCMPlan
+from src.scm.serialization import is_scm_file, load_scm, save_scm
+from src.scm.stats import RunningStats
+from src.utils.pools import spawn_pool
 
 logger = logging.getLogger(__name__)
 
@@ -27,18 +32,209 @@ class NodeEstimator(nn.Module):
     def forward(self, x):
         return self.net(x)
 
+class StackedNodeEstimator(nn.Module):
+    """
+    K NodeEstimators packed into padded weight tensors so they run as one bmm program.
+    Input is (K, N, P) with P = max parent count; unused input slots carry zero weights.
+    """
+    def __init__(self, n_inputs: List[int], hidden: int = 16):
+        super().__init__()
+        self.n_inputs = list(n_inputs)
+        k, p = len(self.n_inputs), max(self.n_inputs)
+        fan_in = torch.tensor(self.n_inputs, dtype=torch.float32).reshape(k, 1, 1)
+        bound1 = 1.0 / fan_in.sqrt()
+        bound2 = 1.0 / np.sqrt(hidden)
+
+        # Same init distribution as nn.Linear, with the padded input rows zeroed
+        mask = (torch.arange(p).reshape(1, p, 1) < fan_in).float()
+        self.w1 = nn.Parameter(torch.empty(k, p, hidden).uniform_(-1, 1) * bound1 * mask)
+        self.b1 = nn.Parameter(torch.empty(k, 1, hidden).uniform_(-1, 1) * bound1)
+        self.w2 = nn.Parameter(torch.empty(k, hidden, 1).uniform_(-bound2, bound2))
+        self.b2 = nn.Parameter(torch.empty(k, 1, 1).uniform_(-bound2, bound2))
+
+    def forward(self, x):
+        h = torch.relu(torch.baddbmm(self.b1, x, self.w1))
+        return torch.baddbmm(self.b2, h, self.w2)
+
+    @classmethod
+    def from_estimators(cls, estimators: List[NodeEstimator]) -> "StackedNodeEstimator":
+        n_inputs = [est.net[0].in_features for est in estimators]
+        stacked = cls(n_inputs, hidden=estimators[0].net[0].out_features)
+        with torch.no_grad():
+            stacked.w1.zero_()
+            for k, est in enumerate(estimators):
+                lin1, lin2 = est.net[0], est.net[2]
+                stacked.w1[k, :n_inputs[k]] = lin1.weight.T
+                stacked.b1[k, 0] = lin1.bias
+                stacked.w2[k] = lin2.weight.T
+                stacked.b2[k, 0] = lin2.bias
+        return stacked
+
+    def to_estimators(self) -> List[NodeEstimator]:
+        estimators = []
+        with torch.no_grad():
+            for k, n in enumerate(self.n_inputs):
+                est = NodeEstimator(n)
+                lin1, lin2 = est.net[0], est.net[2]
+                lin1.weight.copy_(self.w1[k, :n].T)
+                lin1.bias.copy_(self.b1[k, 0])
+                lin2.weight.copy_(self.w2[k].T)
+                lin2.bias.copy_(self.b2[k, 0])
+                estimators.append(est)
+        return estimators
+
+def train_node(X: np.ndarray, y: np.ndarray, epochs: int, lr: float,
+               callback: Optional[Callable[[int], None]] = None) -> Tuple[NodeEstimator, float]:
+    """Full-batch Adam on one node's MLP. Top-level so process pools can pickle it."""
+    X = torch.from_numpy(X)
+    y = torch.from_numpy(y)
+
+    model = NodeEstimator(X.shape[1])
+    optimizer = optim.Adam(model.parameters(), lr=lr)
+    criterion = nn.MSELoss()
+
+    for epoch in range(epochs):
+        if callback and epoch % 10 == 0:
+            callback(epoch)
+        optimizer.zero_grad()
+        preds = model(X)
+        loss = criterion(preds, y)
+        loss.backward()
+        optimizer.step()
+
+    return model, loss.item()
+
+def _train_node_worker(X: np.ndarray, y: np.ndarray, epochs: int, lr: float):
+    # One intra-op thread per worker; the pool provides the parallelism
+    torch.set_num_threads(1)
+    model, loss = train_node(X, y, epochs, lr)
+    return model.state_dict(), loss
+
+def _split_chunks(chunks: Iterable[pd.DataFrame], nodes: List[str], mean: np.ndarray, std: np.ndarray,
+                  holdout_fraction: float, seed: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Normalizes each chunk into (train rows, held-out rows).
+    The held-out mask depends only on (seed, chunk position), so it is the same every epoch.
+    """
+    for i, chunk in enumerate(chunks):
+        rows = chunk.reindex(columns=nodes).to_numpy(dtype=np.float32)
+        rows = np.nan_to_num((rows - mean) / std, nan=0.0)
+        if holdout_fraction <= 0:
+            yield rows, rows[:0]
+            continue
+        held = np.random.default_rng((seed, i)).random(len(rows)) < holdout_fraction
+        yield rows[~held], rows[held]
+
+class ShuffleBuffer:
+    """
+    Approximate shuffling for streamed rows: rows accumulate until `size` is reached,
+    then the buffer is permuted and emitted as mini-batches; the remainder carries over.
+    """
+    def __init__(self, batch_size: int, size: int, rng: np.random.Generator):
+        self.batch_size = batch_size
+        self.size = max(size, batch_size)
+        self.rng = rng
+        self._parts: List[np.ndarray] = []
+        self._n = 0
+
+    def add(self, rows: np.ndarray) -> Iterator[np.ndarray]:
+        self._parts.append(rows)
+        self._n += len(rows)
+        if self._n >= self.size:
+            yield from self._drain(keep_tail=True)
+
+    def flush(self) -> Iterator[np.ndarray]:
+        yield from self._drain(keep_tail=False)
+
+    def _drain(self, keep_tail: bool) -> Iterator[np.ndarray]:
+        if not self._n:
+            return
+        rows = np.concatenate(self._parts)
+        rows = rows[self.rng.permutation(len(rows))]
+        n_full = len(rows) - len(rows) % self.batch_size if keep_tail else len(rows)
+        for start in range(0, n_full, self.batch_size):
+            yield rows[start:start + self.batch_size]
+        self._parts = [rows[n_full:]] if n_full < len(rows) else []
+        self._n = len(rows) - n_full
+
 class CausalSCM:
     def __init__(self, graph: nx.DiGraph):
         self.graph = graph
         self.models: Dict[str, NodeEstimator] = {}
         self.is_fitted = False
         self.data_stats = {}
+        self.running_stats: Optional[RunningStats] = None
+        self.node_losses: Dict[str, float] = {}
+
+    # Reassigning the graph or the model dict drops the compiled plan.
+    # In-place edits (e.g. graph.remove_edge) must call invalidate_plan().
+    @property
+    def graph(self) -> nx.DiGraph:
+        return self._graph
+
+    @graph.setter
+    def graph(self, graph: nx.DiGraph):
+        self._graph = graph
+        self._plan = None
+
+    @property
+    def models(self) -> Dict[str, NodeEstimator]:
+        return self._models
 
-    def fit(self, data: pd.DataFrame, epochs=100, lr=0.01):
+    @models.setter
+    def models(self, models: Dict[str, NodeEstimator]):
+        self._models = models
+        self._plan = None
+
+    @property
+    def plan(self) -> SCMPlan:
+        """Cached execution plan; compiled on first use after any graph/model change."""
+        if self._plan is None:
+            self.compile()
+        return self._plan
+
+    def compile(self) -> SCMPlan:
+        """Builds the index-based execution plan used by the simulator and counterfactual engine."""
+        self._plan = SCMPlan(self.graph, self.models, self.data_stats)
+        return self._plan
+
+    def invalidate_plan(self):
+        self._plan = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_plan'] = None
+        return state
+
+    def __setstate__(self, state):
+        # Pickles written before the plan existed store plain 'graph'/'models' attributes
+        if 'graph' in state:
+            state['_graph'] = state.pop('graph')
+        if 'models' in state:
+            state['_models'] = state.pop('models')
+        state.setdefault('running_stats', None)
+        state.setdefault('node_losses', {})
+        state['_plan'] = None
+        self.__dict__.update(state)
+
+    def fit(self, data: pd.DataFrame, epochs=100, lr=0.01,
+            callback: Optional[Callable[[Dict], None]] = None,
+            mode: str = "sequential",
+            n_jobs: Optional[int] = None):
         """
         Trains the SCM and logs the run to MLflow.
+        `callback` receives progress dicts ({'node', 'node_index', 'n_nodes', 'epoch', 'epochs'});
+        raising from it aborts the fit.
+
+        Args:
+            mode: 'sequential' (one node after another), 'parallel' (node models spread
+                  over a process pool of n_jobs workers) or 'fused' (all node MLPs trained
+                  as one block-diagonal batched network with a single optimizer)
         """
-        logger.info("Fitting SCM with MLflow tracking...")
+        if mode not in ("sequential", "parallel", "fused"):
+            raise ValueError(f"Unknown fit mode: {mode}")
+
+        logger.info(f"Fitting SCM ({mode}) with MLflow tracking...")
 
         mlflow.set_experiment("RCIE_Causal_Training")
         
@@ -47,89 +243,389 @@ class CausalSCM:
             mlflow.log_param("lr", lr)
             mlflow.log_param("num_nodes", len(self.graph.nodes()))
             mlflow.log_param("num_edges", len(self.graph.edges()))
+            mlflow.log_param("fit_mode", mode)
 
             self.data_stats = {
                 'mean': data.mean(),
                 'std': data.std().replace(0, 1.0) 
             }
+            nodes = list(self.graph.nodes())
+            self.running_stats = RunningStats(nodes).update(data)
             
             data_norm = (data - self.data_stats['mean']) / self.data_stats['std']
-            
-            total_loss = 0.0
-            
-            for node in self.graph.nodes():
-                parents = list(self.graph.predecessors(node))
-                if not parents:
-                    continue
-                    
-                X = torch.tensor(data_norm[parents].fillna(0).values, dtype=torch.float32)
-                y = torch.tensor(data_norm[[node]].fillna(0).values, dtype=torch.float32)
-                
-                model = NodeEstimator(len(parents))
-                optimizer = optim.Adam(model.parameters(), lr=lr)
-                criterion = nn.MSELoss()
-
-                for _ in range(epochs):
-                    optimizer.zero_grad()
-                    preds = model(X)
-                    loss = criterion(preds, y)
-                    loss.backward()
-                    optimizer.step()
-
-                final_loss = loss.item()
-                total_loss += final_loss
-                self.models[node] = model
+            tasks = self._build_tasks(data_norm)
+
+            if mode == "parallel":
+                losses = self._fit_parallel(tasks, epochs, lr, len(nodes), callback, n_jobs)
+            elif mode == "fused":
+                losses = self._fit_fused(tasks, epochs, lr, len(nodes), callback)
+            else:
+                losses = self._fit_sequential(tasks, epochs, lr, len(nodes), callback)
+
+            total_loss = sum(losses.values())
+            self.node_losses = losses
             
             self.is_fitted = True
+            self.compile()
 
             avg_loss = total_loss / max(1, len(self.models))
             mlflow.log_metric("avg_mse_loss", avg_loss)
 
-            os.makedirs("data/temp", exist_ok=True)
-            temp_path = "data/temp/model_artifact.pkl"
-            with open(temp_path, 'wb') as f:
-                pickle.dump(self, f)
-            
-            mlflow.log_artifact(temp_path, artifact_path="model")
+            self._log_artifact()
             logger.info(f"Training complete. Loss: {avg_loss:.4f}. Logged to MLflow.")
 
+    def _build_tasks(self, data_norm: pd.DataFrame) -> list:
+        """(node index, node, parents, X, y) for every node that has a structural equation."""
+        tasks = []
+        for k, node in enumerate(self.graph.nodes()):
+            parents = list(self.graph.predecessors(node))
+            if not parents:
+                continue
+            X = data_norm[parents].fillna(0).to_numpy(dtype=np.float32)
+            y = data_norm[[node]].fillna(0).to_numpy(dtype=np.float32)
+            tasks.append((k, node, parents, X, y))
+        return tasks
+
+    def _log_artifact(self):
+        temp_path = "data/temp/model_artifact.scm"
+        save_scm(self, temp_path)
+        mlflow.log_artifact(temp_path, artifact_path="model")
+
+    def fit_stream(self, batches: Callable[[], Iterable[pd.DataFrame]], epochs=10, lr=0.01,
+                   batch_size: int = 1024,
+                   shuffle_buffer: int = 65536,
+                   holdout_fraction: float = 0.1,
+                   patience: int = 3,
+                   stats: Optional[RunningStats] = None,
+                   callback: Optional[Callable[[Dict], None]] = None,
+                   seed: int = 0):
+        """
+        Mini-batch training for data larger than memory.
+        `batches()` must return a fresh iterator of DataFrame chunks in a stable order
+        (e.g. DatasetManager.iter_batches); one pass over it is one epoch.
+
+        Without `stats` (e.g. from a SQL aggregate), an extra pass computes the normalization stats.
+        A fixed `holdout_fraction` of rows (chosen per chunk from `seed`) is never trained on and is
+        scored as the pass goes (progressive validation, no second read); training stops after `patience` epochs without a held-out improvement and keeps the best weights.
+        `callback` receives ({'epoch', 'epochs', 'train_loss', 'holdout_loss'}) after each epoch.
+        """
+        nodes = list(self.graph.nodes())
+        logger.info(f"Fitting SCM (stream, batch_size={batch_size}) with MLflow tracking...")
+
+        if stats is None:
+            stats = RunningStats(nodes)
+            for chunk in batches():
+                stats.update(chunk)
+        self.running_stats = stats
+        self.data_stats = stats.to_data_stats()
+        mean = self.data_stats['mean'].reindex(nodes).fillna(0.0).to_numpy(dtype=np.float32)
+        std = self.data_stats['std'].reindex(nodes).fillna(1.0).to_numpy(dtype=np.float32)
+
+        index = {node: i for i, node in enumerate(nodes)}
+        targets = [node for node in nodes if self.graph.in_degree(node) > 0]
+        if not targets:
+            self.models = {}
+            self.is_fitted = True
+            self.compile()
+            return
+
+        # Parent slots beyond a node's in-degree point at an all-zero column (index len(nodes))
+        parent_lists = [[index[p] for p in self.graph.predecessors(node)] for node in targets]
+        width = max(len(p) for p in parent_lists)
+        parent_index = torch.full((len(targets), width), len(nodes), dtype=torch.long)
+        for j, parents in enumerate(parent_lists):
+            parent_index[j, :len(parents)] = torch.tensor(parents)
+        target_index = torch.tensor([index[node] for node in targets])
+
+        def node_errors(rows: np.ndarray) -> torch.Tensor:
+            """(K,) summed squared errors over a normalized (n x D) batch."""
+            B = torch.from_numpy(rows)
+            B = torch.cat([B, torch.zeros(B.shape[0], 1)], dim=1)
+            X = B[:, parent_index].transpose(0, 1)
+            y = B[:, target_index].T.unsqueeze(-1)
+            return ((net(X) - y) ** 2).sum(dim=(1, 2))
+
+        def train_steps(mini_batches: Iterable[np.ndarray]):
+            nonlocal train_sse, train_n
+            for rows in mini_batches:
+                optimizer.zero_grad()
+                sse = node_errors(rows)
+                (sse.sum() / len(rows)).backward()
+                optimizer.step()
+                train_sse += sse.sum().item()
+                train_n += len(rows)
+
+        net = StackedNodeEstimator([len(p) for p in parent_lists])
+        optimizer = optim.Adam(net.parameters(), lr=lr)
+        best_loss, best_state, stale = float("inf"), None, 0
+        train_sse, train_n = 0.0, 0
+
+        mlflow.set_experiment("RCIE_Causal_Training")
+        with mlflow.start_run():
+            mlflow.log_param("epochs", epochs)
+            mlflow.log_param("lr", lr)
+            mlflow.log_param("num_nodes", len(nodes))
+            mlflow.log_param("num_edges", len(self.graph.edges()))
+            mlflow.log_param("fit_mode", "stream")
+            mlflow.log_param("batch_size", batch_size)
+
+            for epoch in range(epochs):
+                buffer = ShuffleBuffer(batch_size, shuffle_buffer, np.random.default_rng((seed, epoch)))
+                train_sse, train_n = 0.0, 0
+                holdout_sse, holdout_n = torch.zeros(len(targets)), 0
+
+                for train_rows, holdout_rows in _split_chunks(batches(), nodes, mean, std, holdout_fraction, seed):
+                    if len(holdout_rows):
+                        with torch.no_grad():
+                            holdout_sse += node_errors(holdout_rows)
+                        holdout_n += len(holdout_rows)
+                    train_steps(buffer.add(train_rows))
+                train_steps(buffer.flush())
+
+                train_loss = train_sse / max(1, train_n) / len(targets)
+                holdout_loss = holdout_sse.sum().item() / holdout_n / len(targets) if holdout_n else None
+                mlflow.log_metric("train_mse", train_loss, step=epoch)
+                if holdout_loss is not None:
+                    mlflow.log_metric("holdout_mse", holdout_loss, step=epoch)
+                if callback:
+                    callback({'epoch': epoch, 'epochs': epochs, 'train_loss': train_loss, 'holdout_loss': holdout_loss})
+
+                monitored = holdout_loss if holdout_loss is not None else train_loss
+                if monitored < best_loss:
+                    best_loss, stale = monitored, 0
+                    best_state = {k: v.detach().clone() for k, v in net.state_dict().items()}
+                    per_node = (holdout_sse / holdout_n) if holdout_n else torch.full((len(targets),), train_loss)
+                    self.node_losses = dict(zip(targets, per_node.tolist()))
+                else:
+                    stale += 1
+                    if stale >= patience:
+                        logger.info(f"Early stopping after epoch {epoch}")
+                        break
+
+            if best_state is not None:
+                net.load_state_dict(best_state)
+            self.models = dict(zip(targets, net.to_estimators()))
+            self.is_fitted = True
+            self.compile()
+
+            mlflow.log_metric("avg_mse_loss", best_loss)
+            self._log_artifact()
+            logger.info(f"Training complete. Loss: {best_loss:.4f}. Logged to MLflow.")
+
+    def _fit_sequential(self, tasks, epochs, lr, n_nodes, callback) -> Dict[str, float]:
+        losses = {}
+        for k, node, parents, X, y in tasks:
+            report = None
+            if callback:
+                def report_epoch(epoch, k=k, node=node):
+                    callback({'node': node, 'node_index': k, 'n_nodes': n_nodes, 'epoch': epoch, 'epochs': epochs})
+                report = report_epoch
+
+            self.models[node], losses[node] = train_node(X, y, epochs, lr, report)
+        return losses
+
+    def _fit_parallel(self, tasks, epochs, lr, n_nodes, callback, n_jobs) -> Dict[str, float]:
+        """
+        Node models are independent given the data, so each one trains in its own worker.
+        Workers are spawned per fit; the start-up cost pays off on large graphs or long fits.
+        """
+        losses = {}
+        with spawn_pool(n_jobs or os.cpu_count()) as pool:
+            futures = {
+                pool.submit(_train_node_worker, X, y, epochs, lr): (k, node, parents)
+                for k, node, parents, X, y in tasks
+            }
+            for future in as_completed(futures):
+                k, node, parents = futures[future]
+                state_dict, losses[node] = future.result()
+                model = NodeEstimator(len(parents))
+                model.load_state_dict(state_dict)
+                self.models[node] = model
+                if callback:
+                    callback({'node': node, 'node_index': k, 'n_nodes': n_nodes, 'epoch': epochs, 'epochs': epochs})
+        return losses
+
+    def _fit_fused(self, tasks, epochs, lr, n_nodes, callback, warm_start: bool = False) -> Dict[str, float]:
+        """
+        Trains every node MLP at once as a StackedNodeEstimator.
+        The summed per-node losses have block-diagonal gradients and Adam is element-wise,
+        so each node follows the same updates it would get when trained alone.
+        With warm_start, training continues from the current node models.
+        """
+        if not tasks:
+            return {}
+
+        n_rows = tasks[0][3].shape[0]
+        width = max(len(parents) for _, _, parents, _, _ in tasks)
+        X = torch.zeros(len(tasks), n_rows, width)
+        y = torch.zeros(len(tasks), n_rows, 1)
+        for j, (_, _, parents, X_node, y_node) in enumerate(tasks):
+            X[j, :, :len(parents)] = torch.from_numpy(X_node)
+            y[j] = torch.from_numpy(y_node)
+
+        if warm_start:
+            net = StackedNodeEstimator.from_estimators([self.models[node] for _, node, _, _, _ in tasks])
+        else:
+            net = StackedNodeEstimator([len(parents) for _, _, parents, _, _ in tasks])
+        optimizer = optim.Adam(net.parameters(), lr=lr)
+
+        for epoch in range(epochs):
+            if callback and epoch % 10 == 0:
+                callback({'node': None, 'node_index': None, 'n_nodes': n_nodes, 'epoch': epoch, 'epochs': epochs})
+            optimizer.zero_grad()
+            node_losses = ((net(X) - y) ** 2).mean(dim=(1, 2))
+            node_losses.sum().backward()
+            optimizer.step()
+
+        losses = {}
+        for (_, node, _, _, _), model, loss in zip(tasks, net.to_estimators(), node_losses.tolist()):
+            self.models[node] = model
+            losses[node] = loss
+        return losses
+
+    def check_drift(self, data: pd.DataFrame, max_mean_shift: float = 0.5, max_loss_ratio: float = 2.0) -> Dict:
+        """
+        Compares a batch of new rows with what the model was trained on.
+        Flags a refit when a node's batch mean moved more than `max_mean_shift` historical
+        standard deviations, or a structural equation's error grew beyond `max_loss_ratio`
+        times its training loss.
+        """
+        plan = self.plan
+        report = {'rows': len(data), 'refit_required': False, 'reasons': [], 'mean_shift': {}, 'loss_ratio': {}}
+        if self.running_stats is None:
+            report['refit_required'] = True
+            report['reasons'].append("model has no running statistics")
+            return report
+
+        batch_mean = data.reindex(columns=plan.nodes).mean()
+        hist = self.running_stats.to_data_stats()
+        shift = ((batch_mean - hist['mean']).abs() / hist['std']).dropna()
+        report['mean_shift'] = shift.to_dict()
+        for node, value in shift.items():
+            if value > max_mean_shift:
+                report['reasons'].append(f"mean of {node} shifted by {value:.2f} std")
+
+        X = plan.normalize(data.reindex(columns=plan.nodes).to_numpy(dtype=np.float32))
+        X = np.nan_to_num(X, nan=0.0)
+        with torch.no_grad():
+            for i, model in enumerate(plan.models):
+                node = plan.nodes[i]
+                baseline = self.node_losses.get(node)
+                if model is None or not baseline:
+                    continue
+                preds = model(torch.from_numpy(X[:, plan.parents[i]])).numpy().ravel()
+                ratio = float(np.mean((preds - X[:, i]) ** 2) / baseline)
+                report['loss_ratio'][node] = ratio
+                if ratio > max_loss_ratio:
+                    report['reasons'].append(f"error of {node} grew {ratio:.2f}x")
+
+        report['refit_required'] = bool(report['reasons'])
+        return report
+
+    def partial_fit(self, data: pd.DataFrame, epochs: int = 20, lr: float = 0.005,
+                    max_mean_shift: float = 0.5, max_loss_ratio: float = 2.0, force: bool = False) -> Dict:
+        """
+        Absorbs a batch of new rows without a full retrain: the running mean/std are updated,
+        node models are re-expressed exactly in the new normalization and then warm-started
+        on the new rows only. Returns the check_drift report plus 'updated'; when a refit
+        is required (and not `force`), the model is left unchanged.
+        """
+        if not self.is_fitted:
+            raise ValueError("partial_fit needs a fitted model; call fit first")
+        if data.empty:
+            raise ValueError("No rows to ingest")
+
+        report = self.check_drift(data, max_mean_shift, max_loss_ratio)
+        report['updated'] = False
+        if report['refit_required'] and (not force or self.running_stats is None):
+            return report
+
+        nodes = list(self.graph.nodes())
+        old_stats = self.data_stats
+        self.running_stats.update(data)
+        self.data_stats = self.running_stats.to_data_stats()
+        self._rescale_models(old_stats, self.data_stats)
+
+        data_norm = (data.reindex(columns=nodes) - self.data_stats['mean']) / self.data_stats['std']
+        tasks = self._build_tasks(data_norm)
+        losses = self._fit_fused(tasks, epochs, lr, len(nodes), None, warm_start=True)
+
+        # Track the error on fresh data so slow drift is judged against the recent fit
+        for node, loss in losses.items():
+            self.node_losses[node] = loss
+        self.compile()
+        report['updated'] = True
+        report['losses'] = losses
+        logger.info(f"Partial fit on {len(data)} rows complete.")
+        return report
+
+    def _rescale_models(self, old_stats: Dict[str, pd.Series], new_stats: Dict[str, pd.Series]):
+        """
+        Folds a change of normalization into the first and last layers so every node model
+        computes the same function of the raw values as before.
+        """
+        old_mean, old_std = old_stats['mean'], old_stats['std']
+        new_mean, new_std = new_stats['mean'], new_stats['std']
+        with torch.no_grad():
+            for node, model in self.models.items():
+                parents = list(self.graph.predecessors(node))
+                lin1, lin2 = model.net[0], model.net[2]
+
+                # x_old = x_new * scale + offset for each parent input
+                scale = torch.tensor((new_std[parents] / old_std[parents]).to_numpy(), dtype=torch.float32)
+                offset = torch.tensor(((new_mean[parents] - old_mean[parents]) / old_std[parents]).to_numpy(), dtype=torch.float32)
+                lin1.bias.add_(lin1.weight @ offset)
+                lin1.weight.mul_(scale)
+
+                # y_new = (y_old * s_old + m_old - m_new) / s_new for the output
+                s_old, s_new = float(old_std[node]), float(new_std[node])
+                shift = float(old_mean[node] - new_mean[node])
+                lin2.weight.mul_(s_old / s_new)
+                lin2.bias.copy_((lin2.bias * s_old + shift) / s_new)
+
     def predict_node(self, node: str, parent_values: pd.DataFrame) -> np.ndarray:
         """
         Predicts a specific node's value given parent values using the learned SCM.
         """
-        if node not in self.models:
+        plan = self.plan
+        i = plan.index[node]
+        model = plan.models[i]
+
+        if model is None:
             n = len(parent_values)
-            return np.random.normal(
-                self.data_stats['mean'][node], 
-                self.data_stats['std'][node], 
-                n
-            )
+            return np.random.normal(plan.mean[i], plan.std[i], n)
             
-        model = self.models[node]
-        parents = list(self.graph.predecessors(node))
+        parents = plan.parents[i]
+        parent_names = [plan.nodes[p] for p in parents]
 
-        inputs = (parent_values[parents] - self.data_stats['mean'][parents]) / self.data_stats['std'][parents]
-        inputs = inputs.fillna(0)
+        inputs = (parent_values[parent_names].to_numpy(dtype=np.float32) - plan.mean[parents]) / plan.std[parents]
+        inputs = np.nan_to_num(inputs, nan=0.0)
         
         with torch.no_grad():
-            X_tensor = torch.tensor(inputs.values, dtype=torch.float32)
-            preds_norm = model(X_tensor).numpy().flatten()
+            preds_norm = model(torch.from_numpy(inputs)).numpy().flatten()
             
-        preds = preds_norm * self.data_stats['std'][node] + self.data_stats['mean'][node]
+        preds = preds_norm * plan.std[i] + plan.mean[i]
         return preds
 
     def save(self, path: str):
-        """Serialize the entire SCM object to disk (Persistence)."""
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, 'wb') as f:
-            pickle.dump(self, f)
+        """Writes the compact format (JSON header + float32 weight blob, see src.scm.serialization)."""
+        save_scm(self, path)
         logger.info(f"Model saved to {path}")
 
     @staticmethod
-    def load(path: str):
-        """Load SCM object from disk."""
-        with open(path, 'rb') as f:
-            return pickle.load(f)
+    def load(path: str, mmap: bool = True):
+        """
+        Loads a compact SCM file (weights memory-mapped unless mmap=False).
+        Whole-object pickles written by earlier versions are still read.
+        """
+        if is_scm_file(path):
+            scm = load_scm(path, mmap=mmap)
+        else:
+            with open(path, 'rb') as f:
+                scm = pickle.load(f)
+        if scm.is_fitted:
+            scm.compile()
+        return scm
 
 if __name__ == "__main__":
     g = nx.DiGraph()
@@ -0,0 +1,52 @@
+# src/scm/plan.py
+import numpy as np
+import networkx as nx
+import torch.nn as nn
+from typing import Dict, List, Optional
+
+
+class SCMPlan:
+    """
+    Compiled, index-based view of a fitted SCM.
+    Built once after fit/load so per-query code never touches networkx or pandas:
+    nodes are addressed by integer position and stats are contiguous float32 vectors.
+    """
+    def __init__(self, graph: nx.DiGraph, models: Dict[str, nn.Module], data_stats: Dict):
+        self.nodes: List[str] = list(graph.nodes())
+        self.index: Dict[str, int] = {node: i for i, node in enumerate(self.nodes)}
+
+        self.topo_order = np.array(
+            [self.index[node] for node in nx.topological_sort(graph)], dtype=np.int64
+        )
+        self.parents: List[np.ndarray] = [
+            np.array([self.index[p] for p in graph.predecessors(node)], dtype=np.int64)
+            for node in self.nodes
+        ]
+        self.models: List[Optional[nn.Module]] = [models.get(node) for node in self.nodes]
+
+        self.mean = np.ascontiguousarray(
+            data_stats['mean'].reindex(self.nodes).fillna(0.0).to_numpy(dtype=np.float32)
+        )
+        self.std = np.ascontiguousarray(
+            data_stats['std'].reindex(self.nodes).fillna(1.0).to_numpy(dtype=np.float32)
+        )
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def encode(self, values: Dict[str, float]) -> Dict[int, float]:
+        """Maps {node: raw value} to {node index: normalized value}."""
+        encoded = {}
+        for node, val in values.items():
+            if node not in self.index:
+                raise ValueError(f"Unknown node: {node}")
+            i = self.index[node]
+            encoded[i] = (val - self.mean[i]) / self.std[i]
+        return encoded
+
+    def normalize(self, X: np.ndarray) -> np.ndarray:
+        """(N x D) raw values in plan node order -> normalized float32."""
+        return (np.asarray(X, dtype=np.float32) - self.mean) / self.std
+
+    def denormalize(self, X: np.ndarray) -> np.ndarray:
+        return X * self.std + self.mean
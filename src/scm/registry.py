@@ -0,0 +1,220 @@
+# src/scm/registry.py
+import os
+import re
+import uuid
+import shutil
+import logging
+import fcntl
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from src.scm.estimator import CausalSCM
+from src.utils.graph import make_acyclic
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "default"
+_NAME = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+def parse_model_id(model_id: Optional[str]) -> Tuple[str, Optional[int]]:
+    """'name' -> (name, None) for the current version; 'name:3' -> (name, 3). None is the default model."""
+    if not model_id:
+        return DEFAULT_MODEL, None
+    name, _, version = model_id.partition(":")
+    if not _NAME.match(name) or name.startswith(".") or (version and not version.isdigit()):
+        raise ValueError(f"Invalid model id: {model_id}")
+    return name, int(version) if version else None
+
+
+def model_nbytes(scm: CausalSCM) -> int:
+    """Approximate resident size of a model: its weights plus a small per-node overhead."""
+    weights = sum(p.numel() * p.element_size() for m in scm.models.values() for p in m.parameters())
+    return weights + 2048 * scm.graph.number_of_nodes()
+
+
+class ModelRegistry:
+    """
+    Named, versioned SCMs on disk with an in-memory LRU of loaded models bounded by bytes.
+
+      <root>/<name>/v<k>.scm   immutable model versions
+      <root>/<name>/CURRENT    the served version number, replaced atomically
+
+    A model is only published to the cache after it is fully loaded and compiled, and
+    the current-version pointer is swapped with a single assignment, so a request sees
+    either the old or the new version, never a half-loaded one. Models handed out stay
+    valid after eviction or a swap; the registry just stops returning them.
+
+    Several processes (e.g. gunicorn workers) can share one root: versions are claimed
+    with an exclusive hard link, every lookup re-stats CURRENT and reloads when another
+    process moved it, and the memory-mapped weights are shared through the page cache.
+    """
+    def __init__(self, root: str = "data/models/registry", max_bytes: int = 1024 * 1024 * 1024):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._loading: Dict[Tuple[str, int], threading.Lock] = {}
+        self._models: "OrderedDict[Tuple[str, int], Tuple[CausalSCM, int]]" = OrderedDict()
+        # name -> ((inode, mtime, size) of CURRENT when read, version)
+        self._current: Dict[str, Tuple[Tuple[int, int, int], int]] = {}
+        self._bytes = 0
+
+    # --- Paths ---
+
+    def _dir(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def path(self, name: str, version: int) -> str:
+        return os.path.join(self._dir(name), f"v{version}.scm")
+
+    def versions(self, name: str) -> List[int]:
+        if not os.path.isdir(self._dir(name)):
+            return []
+        found = (re.match(r"^v(\d+)\.scm$", f) for f in os.listdir(self._dir(name)))
+        return sorted(int(m.group(1)) for m in found if m)
+
+    def names(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(n for n in os.listdir(self.root) if self.versions(n))
+
+    def current_version(self, name: str) -> Optional[int]:
+        """Version CURRENT points to; one stat per call, re-read only when the file was replaced."""
+        pointer = os.path.join(self._dir(name), "CURRENT")
+        try:
+            st = os.stat(pointer)
+        except OSError:
+            return None
+        stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._current.get(name)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+        try:
+            with open(pointer) as f:
+                version = int(f.read().strip())
+        except (OSError, ValueError):
+            # Replaced between stat and read: keep serving the last known version
+            return None if cached is None else cached[1]
+        with self._lock:
+            self._current[name] = (stamp, version)
+        return version
+
+    def describe(self) -> Dict[str, Dict]:
+        return {name: {"current": self.current_version(name), "versions": self.versions(name)}
+                for name in self.names()}
+
+    # --- Publishing ---
+
+    @contextmanager
+    def publish_lock(self, name: str):
+        """Exclusive across processes sharing the root, for check-then-register sequences."""
+        os.makedirs(self._dir(name), exist_ok=True)
+        with open(os.path.join(self._dir(name), ".lock"), "w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def register(self, name: str, scm: Optional[CausalSCM] = None, path: Optional[str] = None,
+                 activate: bool = True) -> int:
+        """
+        Stores a new version of `name` from an in-memory model or a saved file (moved into
+        the registry) and, with activate, makes it the current version. Returns the version.
+        """
+        parse_model_id(name)
+        if (scm is None) == (path is None):
+            raise ValueError("Pass exactly one of scm or path")
+        if scm is None:
+            scm = self._prepare(CausalSCM.load(path))
+
+        os.makedirs(self._dir(name), exist_ok=True)
+        incoming = os.path.join(self._dir(name), f".incoming-{uuid.uuid4().hex}.scm")
+        if path is not None:
+            shutil.move(path, incoming)
+        else:
+            scm.save(incoming)
+        # link() fails if the name exists, so concurrent publishers never share a version
+        version = max(self.versions(name), default=0) + 1
+        while True:
+            try:
+                os.link(incoming, self.path(name, version))
+                break
+            except FileExistsError:
+                version += 1
+        os.remove(incoming)
+        self._put((name, version), scm)
+        if activate:
+            self.activate(name, version)
+        logger.info(f"Registered model {name}:{version}")
+        return version
+
+    def activate(self, name: str, version: int):
+        """Points `name` at an existing version (also used to roll back)."""
+        if not os.path.exists(self.path(name, version)):
+            raise KeyError(f"Unknown model version {name}:{version}")
+        pointer = os.path.join(self._dir(name), "CURRENT")
+        tmp_path = f"{pointer}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(str(version))
+        os.replace(tmp_path, pointer)
+
+    # --- Serving ---
+
+    def get(self, name: str = DEFAULT_MODEL, version: Optional[int] = None) -> CausalSCM:
+        """Loaded model for name (current version unless given); KeyError when it does not exist."""
+        version = self.current_version(name) if version is None else version
+        if version is None:
+            raise KeyError(f"No model named {name}")
+        key = (name, version)
+
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key][0]
+            loading = self._loading.setdefault(key, threading.Lock())
+
+        # One loader per version; concurrent requests for it wait instead of loading twice
+        try:
+            with loading:
+                with self._lock:
+                    if key in self._models:
+                        return self._models[key][0]
+                path = self.path(name, version)
+                if not os.path.exists(path):
+                    raise KeyError(f"Unknown model version {name}:{version}")
+                scm = self._prepare(CausalSCM.load(path))
+                self._put(key, scm)
+                return scm
+        finally:
+            # Also on failure: ids come from requests, so missing versions must not pile up
+            with self._lock:
+                if self._loading.get(key) is loading:
+                    del self._loading[key]
+
+    @staticmethod
+    def _prepare(scm: CausalSCM) -> CausalSCM:
+        scm.graph = make_acyclic(scm.graph)
+        if scm.is_fitted:
+            scm.compile()
+        return scm
+
+    def _put(self, key: Tuple[str, int], scm: CausalSCM):
+        with self._lock:
+            if key in self._models:
+                self._bytes -= self._models.pop(key)[1]
+            size = model_nbytes(scm)
+            self._models[key] = (scm, size)
+            self._bytes += size
+            # The newest entry always stays, even when it alone exceeds the budget
+            while self._bytes > self.max_bytes and len(self._models) > 1:
+                old_key, (_, old_size) = next(iter(self._models.items()))
+                del self._models[old_key]
+                self._bytes -= old_size
+                logger.info(f"Evicted model {old_key[0]}:{old_key[1]} from memory")
+
+    def loaded(self) -> List[str]:
+        with self._lock:
+            return [f"{name}:{version}" for name, version in self._models]
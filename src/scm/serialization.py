@@ -0,0 +1,146 @@
+# src/scm/serialization.py
+# Compact SCM file: 8-byte magic, 8-byte little-endian header length, a JSON header
+# (graph, normalization stats, tensor index) and one contiguous float32 weight blob
+# aligned to 64 bytes, so the weights can be memory-mapped instead of unpickled.
+import os
+import json
+import math
+import struct
+import logging
+import numpy as np
+import networkx as nx
+import pandas as pd
+import torch
+import torch.nn as nn
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"RCIESCM\x00"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+
+def is_scm_file(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _series(stats: Dict[str, list]) -> pd.Series:
+    return pd.Series(stats["values"], index=stats["index"], dtype=np.float64)
+
+
+def _tensors(models: Dict[str, nn.Module]) -> List[Tuple[str, np.ndarray]]:
+    tensors = []
+    for node, model in models.items():
+        lin1, lin2 = model.net[0], model.net[2]
+        for name, param in (("w1", lin1.weight), ("b1", lin1.bias), ("w2", lin2.weight), ("b2", lin2.bias)):
+            tensors.append((f"{node}/{name}", param.detach().cpu().numpy().astype(np.float32)))
+    return tensors
+
+
+def save_scm(scm, path: str):
+    """Writes a CausalSCM in the compact format (atomically)."""
+    tensors, index, offset = _tensors(scm.models), {}, 0
+    for name, array in tensors:
+        index[name] = {"shape": list(array.shape), "offset": offset}
+        offset += array.size
+
+    stats = scm.running_stats
+    header = {
+        "format": "rcie-scm",
+        "version": FORMAT_VERSION,
+        "dtype": "float32",
+        "nodes": list(scm.graph.nodes()),
+        # Grouped by child so predecessor order (= node model input order) survives the round trip
+        "edges": [[u, v, d] for v in scm.graph.nodes() for u, d in scm.graph.pred[v].items()],
+        "is_fitted": scm.is_fitted,
+        "data_stats": {
+            key: {"index": series.index.tolist(), "values": series.tolist()}
+            for key, series in scm.data_stats.items()
+        },
+        "running_stats": None if stats is None else {
+            "columns": stats.columns,
+            "count": stats.count.tolist(),
+            "mean": stats.mean.tolist(),
+            "m2": stats.m2.tolist(),
+        },
+        "node_losses": scm.node_losses,
+        "models": {node: model.net[0].in_features for node, model in scm.models.items()},
+        "tensors": index,
+    }
+    raw = json.dumps(header, default=float).encode()
+    # Pad the header with spaces so the blob starts on an aligned boundary
+    start = len(MAGIC) + 8 + len(raw)
+    raw += b" " * (-start % ALIGNMENT)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(raw)))
+        f.write(raw)
+        for _, array in tensors:
+            f.write(np.ascontiguousarray(array, dtype="<f4").tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_header(path: str) -> Tuple[dict, int]:
+    """(header, byte offset of the weight blob)."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not an SCM file")
+        (length,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(length))
+    if header.get("version", 0) > FORMAT_VERSION:
+        raise ValueError(f"{path} uses SCM format version {header['version']}; this build reads up to {FORMAT_VERSION}")
+    return header, len(MAGIC) + 8 + length
+
+
+def load_scm(path: str, mmap: bool = True):
+    """
+    Reads a compact SCM file. With mmap, weights stay in a copy-on-write mapping of the file:
+    nothing is read until a layer is used, and processes loading the same file share the
+    pages through the OS page cache. In-place updates (e.g. partial_fit) copy only the pages they touch.
+    """
+    from src.scm.estimator import CausalSCM, NodeEstimator
+    from src.scm.stats import RunningStats
+
+    header, data_start = read_header(path)
+    n_values = sum(math.prod(t["shape"]) for t in header["tensors"].values())
+    if mmap and n_values:
+        blob = np.memmap(path, dtype="<f4", mode="c", offset=data_start, shape=(n_values,))
+    else:
+        blob = np.fromfile(path, dtype="<f4", count=n_values, offset=data_start)
+
+    def tensor(name: str) -> nn.Parameter:
+        spec = header["tensors"][name]
+        size = math.prod(spec["shape"])
+        array = blob[spec["offset"]:spec["offset"] + size].reshape(spec["shape"])
+        return nn.Parameter(torch.from_numpy(array))
+
+    graph = nx.DiGraph()
+    graph.add_nodes_from(header["nodes"])
+    graph.add_edges_from((u, v, d) for u, v, d in header["edges"])
+
+    models = {}
+    for node, n_inputs in header["models"].items():
+        model = NodeEstimator(n_inputs)
+        lin1, lin2 = model.net[0], model.net[2]
+        lin1.weight, lin1.bias = tensor(f"{node}/w1"), tensor(f"{node}/b1")
+        lin2.weight, lin2.bias = tensor(f"{node}/w2"), tensor(f"{node}/b2")
+        models[node] = model
+
+    scm = CausalSCM(graph)
+    scm.models = models
+    scm.is_fitted = header["is_fitted"]
+    scm.data_stats = {key: _series(stats) for key, stats in header["data_stats"].items()}
+    scm.node_losses = header["node_losses"]
+    stats = header["running_stats"]
+    if stats is not None:
+        running = RunningStats(stats["columns"])
+        running.count = np.asarray(stats["count"], dtype=np.float64)
+        running.mean = np.asarray(stats["mean"], dtype=np.float64)
+        running.m2 = np.asarray(stats["m2"], dtype=np.float64)
+        scm.running_stats = running
+    return scm
@@ -0,0 +1,68 @@
+# src/scm/stats.py
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+
+class RunningStats:
+    """
+    Per-column count / mean / sum of squared deviations, updated batch by batch
+    with Chan's parallel form of Welford's algorithm. NaNs are skipped per column.
+    """
+    def __init__(self, columns: List[str]):
+        self.columns = list(columns)
+        d = len(self.columns)
+        self.count = np.zeros(d)
+        self.mean = np.zeros(d)
+        self.m2 = np.zeros(d)
+
+    @classmethod
+    def from_moments(cls, columns: List[str], count, mean, std) -> "RunningStats":
+        """Rebuilds the accumulators from (count, mean, sample std), e.g. from a SQL aggregate."""
+        stats = cls(columns)
+        stats.count = np.nan_to_num(np.asarray(count, dtype=np.float64))
+        stats.mean = np.nan_to_num(np.asarray(mean, dtype=np.float64))
+        std = np.nan_to_num(np.asarray(std, dtype=np.float64))
+        stats.m2 = std ** 2 * np.maximum(stats.count - 1, 0)
+        return stats
+
+    def update(self, batch: pd.DataFrame) -> "RunningStats":
+        return self.update_array(batch.reindex(columns=self.columns).to_numpy(dtype=np.float64))
+
+    def update_array(self, X: np.ndarray) -> "RunningStats":
+        """Same as update for an (n x columns) array already in column order."""
+        X = np.asarray(X, dtype=np.float64)
+        n_b = np.sum(~np.isnan(X), axis=0).astype(np.float64)
+        seen = n_b > 0
+        if not seen.any():
+            return self
+
+        mean_b = np.zeros_like(self.mean)
+        m2_b = np.zeros_like(self.m2)
+        mean_b[seen] = np.nanmean(X[:, seen], axis=0)
+        m2_b[seen] = np.nansum((X[:, seen] - mean_b[seen]) ** 2, axis=0)
+
+        n = self.count + n_b
+        delta = mean_b - self.mean
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.mean = np.where(seen, self.mean + delta * n_b / n, self.mean)
+            self.m2 = np.where(seen, self.m2 + m2_b + delta ** 2 * self.count * n_b / n, self.m2)
+        self.count = n
+        return self
+
+    @property
+    def var(self) -> np.ndarray:
+        """Sample variance (ddof=1), matching pandas.DataFrame.std()."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 1, self.m2 / (self.count - 1), np.nan)
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.var)
+
+    def to_data_stats(self) -> Dict[str, pd.Series]:
+        """Same layout as CausalSCM.data_stats."""
+        return {
+            'mean': pd.Series(self.mean, index=self.columns),
+            'std': pd.Series(self.std, index=self.columns).fillna(1.0).replace(0, 1.0),
+        }
@@ -0,0 +1,136 @@
+# src/simulator/cache.py
+import time
+import logging
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
+from src.simulator.simulator import CausalSimulator, SAMPLE_BLOCK
+from src.simulator.streaming import stream_summary
+
+logger = logging.getLogger(__name__)
+
+QUANTILES = (0.05, 0.95)
+
+
+def summarize(samples: np.ndarray, nodes: Sequence[str], quantiles: Sequence[float] = QUANTILES) -> Dict[str, Dict]:
+    """Per-node mean, lower/upper quantiles and standard deviation of an (n x nodes) sample matrix."""
+    lower, upper = np.quantile(samples, quantiles, axis=0)
+    mean = samples.mean(axis=0, dtype=np.float64)
+    std = samples.std(axis=0, ddof=1, dtype=np.float64) if len(samples) > 1 else np.full(len(nodes), np.nan)
+    return {
+        "mean": dict(zip(nodes, mean.tolist())),
+        "lower": dict(zip(nodes, lower.tolist())),
+        "upper": dict(zip(nodes, upper.tolist())),
+        "std": dict(zip(nodes, std.tolist())),
+    }
+
+
+class _Entry:
+    def __init__(self, pool: np.ndarray, expires: float):
+        self.pool = pool
+        self.summaries: Dict[int, Dict] = {}
+        self.expires = expires
+
+    @property
+    def nbytes(self) -> int:
+        return self.pool.nbytes + 1024 * len(self.summaries)
+
+
+class SimulationCache:
+    """
+    Do-query results per (model version, rounded intervention, seed, backend), LRU-bounded
+    by bytes and dropped `ttl` seconds after they were first computed.
+
+    Each entry keeps the seeded sample pool and the summaries computed from it. A request
+    for more samples extends the pool with the missing blocks instead of starting over;
+    because blocks are seeded by index, the result equals a fresh draw of that size.
+    Pools are only kept up to `max_pool_rows`; larger requests are streamed in chunks
+    (exact means, sketched quantiles, constant memory) and cache just their summary.
+    """
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, ttl: float = 600.0,
+                 max_pool_rows: int = 200_000, decimals: int = 6):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_pool_rows = max_pool_rows
+        self.decimals = decimals
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def round(self, interventions: Dict[str, float]) -> Dict[str, float]:
+        """Interventions as they are simulated and keyed; nearby values share an entry."""
+        return {node: round(float(value), self.decimals) for node, value in interventions.items()}
+
+    def key(self, model_key: str, interventions: Dict[str, float], seed: int, backend: str) -> Tuple:
+        return (model_key, tuple(sorted(self.round(interventions).items())), seed, backend)
+
+    def summary(self, sim: CausalSimulator, model_key: str, interventions: Dict[str, float],
+                n_samples: int, seed: int = 0) -> Dict[str, Dict]:
+        """Summary of n_samples seeded draws under do(interventions), computed at most once per key."""
+        key = self.key(model_key, interventions, seed, sim.backend)
+        entry = self._get(key)
+        if entry is not None and n_samples in entry.summaries:
+            with self._lock:
+                self.hits += 1
+            return entry.summaries[n_samples]
+        with self._lock:
+            self.misses += 1
+
+        if n_samples > self.max_pool_rows:
+            result = stream_summary(sim, self.round(interventions), n_samples, seed)
+            pool = entry.pool if entry is not None else np.empty((0, len(sim.scm.plan)), dtype=np.float32)
+            self._store(key, pool, n_samples, result)
+            return result
+
+        pool = entry.pool if entry is not None else np.empty((0, len(sim.scm.plan)), dtype=np.float32)
+        n_blocks = -(-n_samples // SAMPLE_BLOCK)
+        have = len(pool) // SAMPLE_BLOCK
+        if have < n_blocks:
+            extra = sim.sample_blocks(self.round(interventions), have, n_blocks, seed)
+            pool = np.concatenate([pool, extra]) if len(pool) else extra
+        result = summarize(pool[:n_samples], sim.scm.plan.nodes)
+        self._store(key, pool, n_samples, result)
+        return result
+
+    def _get(self, key: Tuple) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires < time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, key: Tuple, pool: np.ndarray, n_samples: int, result: Dict):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry(pool, time.monotonic() + self.ttl)
+            else:
+                # Pools of one key are prefixes of each other, so the longest one wins
+                self._bytes -= entry.nbytes
+                if len(pool) > len(entry.pool):
+                    entry.pool = pool
+            entry.summaries[n_samples] = result
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._bytes += entry.nbytes
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: Tuple):
+        self._bytes -= self._entries.pop(key).nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
@@ -1,65 +1,155 @@
 import pandas as pd
 import numpy as np
 import torch
-import networkx as nx
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 from src.scm.estimator import CausalSCM
+from src.simulator.fused import FusedProgram
 
 logger = logging.getLogger(__name__)
 
+# Seeded sampling draws whole blocks, so the first n rows do not depend on how many more are drawn
+SAMPLE_BLOCK = 1024
+
 class CausalSimulator:
-    def __init__(self, scm: CausalSCM):
+    def __init__(self, scm: CausalSCM, backend: str = "loop"):
+        """
+        Args:
+            backend: 'loop' (one forward pass per node) or 'fused'
+                     (one stacked forward pass per topological layer)
+        """
         self.scm = scm
+        self.backend = backend.lower()
         if not scm.is_fitted:
             raise ValueError("SCM must be fitted before running simulations.")
+        if self.backend not in ("loop", "fused"):
+            raise ValueError(f"Unknown backend: {backend}")
 
     def run_do_query(self, 
                      interventions: Dict[str, float], 
-                     n_samples: int = 1000) -> pd.DataFrame:
+                     n_samples: int = 1000,
+                     seed: Optional[int] = None) -> pd.DataFrame:
         """
         Simulates the effect of interventions do(X=x) on the system.
         Returns a DataFrame of simulated samples for all nodes.
+        With a seed the samples are reproducible (see sample_blocks).
         """
         
-        topo_order = list(nx.topological_sort(self.scm.graph))
-        
-        sim_data = {node: np.zeros(n_samples) for node in topo_order}
-        
-        norm_interventions = {}
-        for node, val in interventions.items():
-            mean = self.scm.data_stats['mean'][node]
-            std = self.scm.data_stats['std'][node]
-            norm_interventions[node] = (val - mean) / std
-
-        for node in topo_order:
-            if node in norm_interventions:
-                sim_data[node] = np.full(n_samples, norm_interventions[node])
+        plan = self.scm.plan
+        if seed is not None:
+            n_blocks = -(-n_samples // SAMPLE_BLOCK)
+            return pd.DataFrame(self.sample_blocks(interventions, 0, n_blocks, seed)[:n_samples], columns=plan.nodes)
+
+        norm_interventions = plan.encode(interventions)
+
+        if self.backend == "fused":
+            with torch.no_grad():
+                sim_data = FusedProgram.for_plan(plan).run(n_samples, norm_interventions).numpy()
+        else:
+            sim_data = self._run_loop(n_samples, norm_interventions)
+
+        return pd.DataFrame(plan.denormalize(sim_data), columns=plan.nodes)
+
+    def sample_blocks(self, interventions: Dict[str, float], start: int, stop: int, seed: int) -> np.ndarray:
+        """
+        De-normalized samples of blocks [start, stop) under do(interventions), shaped
+        ((stop - start) * SAMPLE_BLOCK x nodes) in scm.plan.nodes order. Block k is seeded
+        by (seed, k), so a sample pool can be extended later with exactly the rows a
+        single larger draw would have produced.
+        """
+        plan = self.scm.plan
+        norm_interventions = plan.encode(interventions)
+        blocks = []
+        for k in range(start, stop):
+            entropy = [seed, k]
+            if self.backend == "fused":
+                generator = torch.Generator().manual_seed(int(np.random.SeedSequence(entropy).generate_state(1)[0]))
+                with torch.no_grad():
+                    block = FusedProgram.for_plan(plan).run(SAMPLE_BLOCK, norm_interventions, generator).numpy()
+            else:
+                block = self._run_loop(SAMPLE_BLOCK, norm_interventions, np.random.default_rng(entropy))
+            blocks.append(plan.denormalize(block))
+        if not blocks:
+            return np.empty((0, len(plan)), dtype=np.float32)
+        return np.concatenate(blocks)
+
+    def run_do_query_batch(self,
+                           control_node: str,
+                           values: Sequence[float],
+                           n_samples: int = 100,
+                           interventions: Optional[Dict[str, float]] = None,
+                           seed: Optional[int] = None) -> np.ndarray:
+        """
+        Simulates do(control_node = v) for every candidate v in one pass.
+        Returns de-normalized samples shaped (candidates x n_samples x nodes),
+        with nodes in scm.plan.nodes order. `interventions` are held fixed for all candidates.
+        With a seed, every candidate (and every call with that seed) uses the same noise
+        draws (common random numbers), so differences between candidates are not Monte Carlo noise.
+        """
+        plan = self.scm.plan
+        norm_interventions = plan.encode(interventions or {})
+
+        if control_node not in plan.index:
+            raise ValueError(f"Unknown node: {control_node}")
+        i = plan.index[control_node]
+        norm_values = (np.asarray(values, dtype=np.float32) - plan.mean[i]) / plan.std[i]
+        n_candidates = len(norm_values)
+
+        # Rows are candidate-major: row c * n_samples + s
+        norm_interventions[i] = np.repeat(norm_values, n_samples)
+        n_rows = n_candidates * n_samples
+
+        noise = None
+        if seed is not None:
+            base = np.random.default_rng(seed).standard_normal((n_samples, len(plan)), dtype=np.float32)
+            noise = np.tile(base, (n_candidates, 1))
+
+        if self.backend == "fused":
+            with torch.no_grad():
+                sim_data = FusedProgram.for_plan(plan).run(
+                    n_rows, norm_interventions, noise=None if noise is None else torch.from_numpy(noise)).numpy()
+        else:
+            sim_data = self._run_loop(n_rows, norm_interventions, noise=noise)
+
+        return plan.denormalize(sim_data).reshape(n_candidates, n_samples, len(plan))
+
+    def expected_outcomes(self,
+                          control_node: str,
+                          values: Sequence[float],
+                          target: str,
+                          n_samples: int = 100,
+                          seed: Optional[int] = None) -> np.ndarray:
+        """Mean of `target` under do(control_node = v) for each candidate v (common random numbers with a seed)."""
+        samples = self.run_do_query_batch(control_node, values, n_samples, seed=seed)
+        return samples[:, :, self.scm.plan.index[target]].mean(axis=1)
+
+    def _run_loop(self, n_samples: int, norm_interventions: Dict[int, float],
+                  rng: Optional[np.random.Generator] = None, noise: Optional[np.ndarray] = None) -> np.ndarray:
+        plan = self.scm.plan
+        normal = np.random.normal if rng is None else rng.normal
+
+        def draw(i: int) -> np.ndarray:
+            return normal(0, 1, n_samples) if noise is None else noise[:, i]
+
+        sim_data = np.zeros((n_samples, len(plan)), dtype=np.float32)
+
+        for i in plan.topo_order:
+            if i in norm_interventions:
+                sim_data[:, i] = norm_interventions[i]
                 continue
             
-            parents = list(self.scm.graph.predecessors(node))
+            parents = plan.parents[i]
             
-            if not parents:
-                sim_data[node] = np.random.normal(0, 1, n_samples)
+            if len(parents) == 0:
+                sim_data[:, i] = draw(i)
             else:
-
-                parent_vals = np.stack([sim_data[p] for p in parents], axis=1)
-                
-                model = self.scm.models[node]
+                model = plan.models[i]
                 with torch.no_grad():
-                    X_tensor = torch.tensor(parent_vals, dtype=torch.float32)
-                    effect = model(X_tensor).numpy().flatten()
+                    effect = model(torch.from_numpy(sim_data[:, parents])).numpy().flatten()
                 
-                noise = np.random.normal(0, 1, n_samples)
-                sim_data[node] = effect + noise
-
-        df_sim = pd.DataFrame(sim_data)
-        for node in df_sim.columns:
-            mean = self.scm.data_stats['mean'][node]
-            std = self.scm.data_stats['std'][node]
-            df_sim[node] = df_sim[node] * std + mean
-            
-        return df_sim
+                sim_data[:, i] = effect + draw(i)
+
+        return sim_data
 
     def compute_uplift(self, 
                        control: Dict[str, float], 
@@ -0,0 +1,111 @@
+# src/simulator/streaming.py
+import math
+import numpy as np
+from typing import Dict, Sequence, Tuple
+from src.scm.stats import RunningStats
+from src.simulator.simulator import CausalSimulator, SAMPLE_BLOCK
+
+# Rows simulated per chunk when streaming; memory stays at one chunk whatever n_samples is
+STREAM_BLOCKS = 64
+
+
+class QuantileSketch:
+    """
+    Merging t-digest over several columns at once, for quantiles of data seen in chunks.
+
+    Each column keeps at most compression / 2 + 1 centroids. New values are merged with the
+    existing centroids and regrouped by the k1 scale function k(q) = c / 2pi * asin(2q - 1),
+    whose bins are narrow near q = 0 and 1, so tail quantiles stay accurate. Sketches of
+    the same columns can be merged, e.g. from parallel workers.
+    """
+    def __init__(self, n_columns: int, compression: int = 500):
+        self.compression = compression
+        self.n_groups = compression // 2 + 1
+        self.means = np.full((n_columns, 0), np.nan)
+        self.weights = np.zeros((n_columns, 0))
+        self.min = np.full(n_columns, np.inf)
+        self.max = np.full(n_columns, -np.inf)
+
+    def update(self, X: np.ndarray) -> "QuantileSketch":
+        """Adds an (n x columns) chunk; NaNs are skipped."""
+        values = np.asarray(X, dtype=np.float64).T
+        if values.shape[1] == 0:
+            return self
+        self.min = np.fmin(self.min, np.nanmin(values, axis=1, initial=np.inf))
+        self.max = np.fmax(self.max, np.nanmax(values, axis=1, initial=-np.inf))
+        # Digest the chunk on its own (a plain sort, no weights to carry), then merge digests
+        values = np.sort(values, axis=1)
+        self._merge(*self._compress(values, np.where(np.isnan(values), 0.0, 1.0)))
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        self._merge(other.means, other.weights)
+        return self
+
+    def _merge(self, means: np.ndarray, weights: np.ndarray):
+        m = np.concatenate([self.means, means], axis=1)
+        w = np.concatenate([self.weights, weights], axis=1)
+        # NaNs (empty slots) sort last and carry no weight
+        order = np.argsort(m, axis=1)
+        self.means, self.weights = self._compress(np.take_along_axis(m, order, axis=1),
+                                                  np.take_along_axis(w, order, axis=1))
+
+    def _compress(self, m: np.ndarray, w: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Groups row-wise sorted (means, weights) into n_groups bins of k, placing each entry by its midpoint q."""
+        total = w.sum(axis=1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            q = np.clip((np.cumsum(w, axis=1) - w / 2) / total, 0.0, 1.0)
+        k = self.compression / (2 * math.pi) * np.arcsin(2 * np.nan_to_num(q) - 1)
+        group = np.minimum(np.floor(k + self.compression / 4), self.n_groups - 1).astype(np.int64)
+
+        d = m.shape[0]
+        flat = (group + np.arange(d)[:, None] * self.n_groups).ravel()
+        size = d * self.n_groups
+        group_w = np.bincount(flat, weights=w.ravel(), minlength=size).reshape(d, self.n_groups)
+        group_s = np.bincount(flat, weights=(w * np.nan_to_num(m)).ravel(), minlength=size).reshape(d, self.n_groups)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(group_w > 0, group_s / group_w, np.nan), group_w
+
+    def quantile(self, qs: Sequence[float]) -> np.ndarray:
+        """(len(qs) x columns) estimates; NaN for columns without data."""
+        out = np.full((len(qs), len(self.min)), np.nan)
+        for j in range(len(self.min)):
+            keep = self.weights[j] > 0
+            w, m = self.weights[j][keep], self.means[j][keep]
+            if not len(w):
+                continue
+            # Centroid means sit at the middle of their weight; min and max bound the ends
+            total = w.sum()
+            x = np.concatenate([[0.0], np.cumsum(w) - w / 2, [total]])
+            y = np.concatenate([[self.min[j]], m, [self.max[j]]])
+            out[:, j] = np.interp(np.asarray(qs) * total, x, y)
+        return out
+
+
+def stream_summary(sim: CausalSimulator, interventions: Dict[str, float], n_samples: int, seed: int = 0,
+                   quantiles: Sequence[float] = (0.05, 0.95), chunk_blocks: int = STREAM_BLOCKS) -> Dict[str, Dict]:
+    """
+    Same summary as simulator.cache.summarize over n_samples seeded draws (the same rows as
+    sample_blocks), computed chunk by chunk: means are exact, quantiles come from a sketch.
+    """
+    nodes = sim.scm.plan.nodes
+    stats = RunningStats(nodes)
+    sketch = QuantileSketch(len(nodes))
+    n_blocks = -(-n_samples // SAMPLE_BLOCK)
+    for start in range(0, n_blocks, chunk_blocks):
+        stop = min(start + chunk_blocks, n_blocks)
+        chunk = sim.sample_blocks(interventions, start, stop, seed)
+        # The last block is cut to n_samples
+        chunk = chunk[:n_samples - start * SAMPLE_BLOCK]
+        stats.update_array(chunk)
+        sketch.update(chunk)
+
+    lower, upper = sketch.quantile(quantiles)
+    return {
+        "mean": dict(zip(nodes, stats.mean.tolist())),
+        "lower": dict(zip(nodes, lower.tolist())),
+        "upper": dict(zip(nodes, upper.tolist())),
+        "std": dict(zip(nodes, stats.std.tolist())),
+    }
@@ -0,0 +1,264 @@
+# src/utils/datasets.py
+import os
+import hashlib
+import threading
+import logging
+import duckdb
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.causal_discovery.stats import SufficientStats
+from src.utils.db import DB_PATH, Database, Query, is_file_source, quote_ident, relation_sql
+
+logger = logging.getLogger(__name__)
+
+
+class DatasetManager:
+    """
+    Process-wide access to datasets.
+    Keeps one DuckDB connection, caches materialized frames keyed by source and
+    modification time (LRU, bounded by bytes) and answers summaries with SQL.
+    Cached frames are shared between requests: treat them as read-only.
+
+    DuckDB lets only one process open a database file for writing; with read_only several
+    processes (e.g. API workers) can share it, and appends fail instead.
+    """
+    def __init__(self, db_path: str = DB_PATH, max_bytes: int = 512 * 1024 * 1024, read_only: bool = False):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.read_only = read_only
+        self._conn = None
+        self._in_memory = False
+        self._lock = threading.RLock()
+        self._frames: "OrderedDict[Tuple, Tuple[pd.DataFrame, int]]" = OrderedDict()
+        self._bytes = 0
+
+    @property
+    def conn(self) -> duckdb.DuckDBPyConnection:
+        with self._lock:
+            # A read-only connection cannot create the file; until it exists, an in-memory
+            # connection still queries CSV/Parquet files, and the file is retried on every use
+            if self.read_only and (self._conn is None or self._in_memory) and os.path.exists(self.db_path):
+                self._conn = duckdb.connect(self.db_path, read_only=True)
+                self._in_memory = False
+            if self._conn is None:
+                if self.read_only:
+                    self._conn = duckdb.connect(":memory:")
+                    self._in_memory = True
+                else:
+                    os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+                    self._conn = duckdb.connect(self.db_path)
+            return self._conn
+
+    def cursor(self) -> duckdb.DuckDBPyConnection:
+        """A cursor on the pooled connection; cursors can be used from different threads."""
+        return self.conn.cursor()
+
+    def database(self) -> Database:
+        return Database(conn=self.cursor())
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self.clear()
+
+    # --- Sources ---
+
+    @staticmethod
+    def is_file(source: str) -> bool:
+        return is_file_source(source)
+
+    def relation_sql(self, source: str) -> str:
+        return relation_sql(source)
+
+    def version(self, source: str) -> Tuple:
+        """Changes whenever the underlying data may have changed."""
+        if self.is_file(source):
+            if not os.path.exists(source):
+                raise FileNotFoundError(source)
+            return (os.path.getmtime(source), os.path.getsize(source))
+
+        # Writes land in the WAL before a checkpoint touches the main file
+        mtimes = tuple(os.path.getmtime(p) for p in (self.db_path, self.db_path + ".wal") if os.path.exists(p))
+        n_rows = self.cursor().execute(f"SELECT count(*) FROM {quote_ident(source)}").fetchone()[0]
+        return mtimes + (n_rows,)
+
+    def fingerprint(self, source: str, columns: Optional[List[str]] = None, sample_rows: int = 1000) -> str:
+        """
+        Content address of a source: its version (modification time and row count) plus
+        a hash of the first `sample_rows` rows of `columns`. Changes whenever the data does.
+        """
+        query = Query(source).limit(sample_rows)
+        if columns is not None:
+            query.select(*columns)
+        sample = Database(conn=self.cursor()).fetch(query)
+        digest = hashlib.sha1(repr((source, self.version(source), list(sample.columns))).encode())
+        digest.update(pd.util.hash_pandas_object(sample, index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    def prefix_digest(self, source: str, columns: List[str], n_rows: int, sample_rows: int = 1000) -> str:
+        """
+        Hash of the first and last `sample_rows` of the first `n_rows` rows of `columns`.
+        Unchanged by appends, changed when the rows already read were rewritten (e.g. a re-upload).
+        """
+        digest = hashlib.sha1(repr((source, list(columns), n_rows)).encode())
+        db = Database(conn=self.cursor())
+        size = min(sample_rows, n_rows)
+        for start in sorted({0, n_rows - size}):
+            rows = db.fetch(Query(source).select(*columns).offset(start).limit(size))
+            digest.update(pd.util.hash_pandas_object(rows, index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    # --- Frames ---
+
+    def get_frame(self, source: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Materializes a table or file (optionally only some columns), cached while its version is unchanged."""
+        query = Query(source)
+        if columns is not None:
+            query.select(*columns)
+        return self.fetch(query)
+
+    def fetch(self, query: Query) -> pd.DataFrame:
+        """
+        Runs a Query, reusing a cached result for the same query and source version.
+        A projection of an already cached full frame is served from memory.
+        """
+        version = self.version(query.source)
+        key = (query.source, version) + query.key()
+
+        with self._lock:
+            if key in self._frames:
+                self._frames.move_to_end(key)
+                return self._frames[key][0]
+
+            full_key = (query.source, version) + Query(query.source).key()
+            if query.is_projection_only and full_key in self._frames:
+                self._frames.move_to_end(full_key)
+                full = self._frames[full_key][0]
+                if all(c in full.columns for c in query.columns):
+                    return full[query.columns]
+
+        df = Database(conn=self.cursor()).fetch(query)
+        self._put(key, df)
+        return df
+
+    def fetch_matrix(self, query: Query) -> pd.DataFrame:
+        """
+        Like fetch, for numeric columns: the frame wraps one column-major float64 matrix
+        (Database.fetch_numpy), so its to_numpy() returns that matrix without a copy.
+        """
+        key = (query.source, self.version(query.source), "matrix") + query.key()
+        with self._lock:
+            if key in self._frames:
+                self._frames.move_to_end(key)
+                return self._frames[key][0]
+
+        X, names = Database(conn=self.cursor()).fetch_numpy(query)
+        df = pd.DataFrame(X, columns=names, copy=False)
+        self._put(key, df)
+        return df
+
+    def iter_batches(self, query: Query, chunk_rows: int = 100_000) -> Iterator[pd.DataFrame]:
+        """Streams a Query in chunks on its own cursor; nothing is cached."""
+        return Database(conn=self.cursor()).iter_batches(query, chunk_rows)
+
+    def _put(self, key: Tuple, df: pd.DataFrame):
+        size = int(df.memory_usage(deep=True).sum())
+        if size > self.max_bytes:
+            logger.info(f"Dataset {key[0]} ({size} bytes) exceeds the cache budget; not cached.")
+            return
+
+        with self._lock:
+            # Drop results computed on stale versions of the same source first
+            for old in [k for k in self._frames if k[0] == key[0] and k[1] != key[1]]:
+                self._evict(old)
+            self._frames[key] = (df, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._evict(next(iter(self._frames)))
+
+    def _evict(self, key: Tuple):
+        _, size = self._frames.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self._bytes = 0
+
+    # --- Summaries (SQL pushdown) ---
+
+    def columns(self, source: str) -> list:
+        return self.cursor().execute(f"SELECT * FROM {self.relation_sql(source)} LIMIT 0").df().columns.tolist()
+
+    def row_count(self, source: str) -> int:
+        return self.cursor().execute(f"SELECT count(*) FROM {self.relation_sql(source)}").fetchone()[0]
+
+    def covariance(self, source: str, columns: Iterable[str],
+                   chunk_rows: int = 100_000) -> Tuple[int, np.ndarray, np.ndarray]:
+        """
+        (n, means, sample covariance) over rows complete in `columns`, streamed through
+        SufficientStats chunk by chunk (X^T X in numpy; as SQL, the d^2 pairwise aggregates
+        cost far more than the scan). Memory is O(chunk_rows * d + d^2) however many rows the source has.
+        """
+        columns = list(columns)
+        if not columns:
+            return self.row_count(source), np.zeros(0), np.zeros((0, 0))
+        query = Query(source).select(*columns)
+        for c in columns:
+            query.where(f"{quote_ident(c)} IS NOT NULL")
+
+        stats = SufficientStats(columns)
+        for chunk in self.iter_batches(query, chunk_rows):
+            stats.update(chunk)
+        mean = stats.mean if stats.n else np.full(len(columns), np.nan)
+        return stats.n, mean, stats.cov()
+
+    def summarize(self,
+                  source: str,
+                  columns: Iterable[str],
+                  quantiles: Iterable[float] = ()) -> Dict[str, Dict[str, float]]:
+        """
+        Per-column non-null count/min/max/mean/std (+ requested quantiles) computed inside DuckDB.
+        Returns {column: {'count': .., 'min': .., 'max': .., 'mean': .., 'std': .., 'q0.05': ..}}.
+        """
+        columns = list(columns)
+        quantiles = list(quantiles)
+        if not columns:
+            return {}
+        stats = ["count", "min", "max", "mean", "std"] + [f"q{q:g}" for q in quantiles]
+
+        exprs = []
+        for col in columns:
+            c = quote_ident(col)
+            exprs += [f"count({c})", f"min({c})", f"max({c})", f"avg({c})", f"stddev_samp({c})"]
+            exprs += [f"quantile_cont({c}, {q})" for q in quantiles]
+
+        row = self.cursor().execute(f"SELECT {', '.join(exprs)} FROM {self.relation_sql(source)}").fetchone()
+
+        summary = {}
+        for k, col in enumerate(columns):
+            values = row[k * len(stats):(k + 1) * len(stats)]
+            summary[col] = {name: (None if v is None else float(v)) for name, v in zip(stats, values)}
+        return summary
+
+
+_MANAGER: Optional[DatasetManager] = None
+_MANAGER_LOCK = threading.Lock()
+
+
+def get_dataset_manager() -> DatasetManager:
+    """
+    Lazily created per-process DatasetManager (cache size from RCIE_DATASET_CACHE_MB;
+    RCIE_DB_READ_ONLY=1 opens the database read-only, as needed with several API workers).
+    """
+    global _MANAGER
+    with _MANAGER_LOCK:
+        if _MANAGER is None:
+            max_mb = int(os.getenv("RCIE_DATASET_CACHE_MB", "512"))
+            read_only = os.getenv("RCIE_DB_READ_ONLY", "0").lower() in ("1", "true", "yes")
+            _MANAGER = DatasetManager(max_bytes=max_mb * 1024 * 1024, read_only=read_only)
+        return _MANAGER
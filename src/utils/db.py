@@ -1,18 +1,127 @@
+import os
 import duckdb
+import numpy as np
 import pandas as pd
 import logging
+from typing import Iterator, List, Optional, Tuple, Union
 
 DB_PATH = "data/rcie.duckdb"
 
+FILE_SUFFIXES = (".csv", ".parquet")
+
+
+def quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def quote_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def is_file_source(source: str) -> bool:
+    return source.lower().endswith(FILE_SUFFIXES) or os.path.sep in source or os.path.isfile(source)
+
+
+def relation_sql(source: str) -> str:
+    """FROM-clause expression for a table name or a CSV/Parquet path."""
+    if not is_file_source(source):
+        return quote_ident(source)
+    if source.lower().endswith(".parquet"):
+        return f"read_parquet({quote_literal(source)})"
+    return f"read_csv_auto({quote_literal(source)})"
+
+
+class Query:
+    """
+    SELECT builder with column projection, row filters, deterministic sampling and limit,
+    so each stage only reads the columns and rows it uses.
+
+        Query("events").select("ad_spend", "sales").where("region = ?", "EU").sample(10_000, seed=7)
+    """
+    def __init__(self, source: str = "events"):
+        self.source = source
+        self.columns: Optional[List[str]] = None
+        self.filters: List[str] = []
+        self.params: List = []
+        self.sample_size: Optional[Union[int, float]] = None
+        self.seed = 42
+        self.row_limit: Optional[int] = None
+        self.row_offset: Optional[int] = None
+
+    def select(self, *columns: str) -> "Query":
+        self.columns = list(columns)
+        return self
+
+    def where(self, predicate: str, *params) -> "Query":
+        """SQL predicate with '?' placeholders; multiple calls are AND-ed."""
+        self.filters.append(predicate)
+        self.params.extend(params)
+        return self
+
+    def sample(self, size: Union[int, float], seed: int = 42) -> "Query":
+        """An int samples that many rows (reservoir); a float in (0, 1] samples a fraction (bernoulli)."""
+        self.sample_size = size
+        self.seed = seed
+        return self
+
+    def limit(self, n: int) -> "Query":
+        self.row_limit = n
+        return self
+
+    def offset(self, n: int) -> "Query":
+        """Skips the first n rows (in scan order, which DuckDB keeps as insertion order)."""
+        self.row_offset = n
+        return self
+
+    @property
+    def is_projection_only(self) -> bool:
+        return not self.filters and self.sample_size is None and self.row_limit is None and not self.row_offset
+
+    def to_sql(self) -> Tuple[str, List]:
+        cols = "*" if self.columns is None else ", ".join(quote_ident(c) for c in self.columns)
+        relation = relation_sql(self.source)
+        if self.filters:
+            where = " WHERE " + " AND ".join(f"({f})" for f in self.filters)
+            # USING SAMPLE runs before WHERE, so sample from the filtered subquery instead
+            if self.sample_size is not None:
+                relation, where = f"(SELECT * FROM {relation}{where})", ""
+        else:
+            where = ""
+        sql = f"SELECT {cols} FROM {relation}{where}"
+        if self.sample_size is not None:
+            if isinstance(self.sample_size, float):
+                sql += f" USING SAMPLE {self.sample_size * 100:g} PERCENT (bernoulli, {int(self.seed)})"
+            else:
+                sql += f" USING SAMPLE reservoir({int(self.sample_size)} ROWS) REPEATABLE ({int(self.seed)})"
+        if self.row_limit is not None:
+            sql += f" LIMIT {int(self.row_limit)}"
+        if self.row_offset:
+            sql += f" OFFSET {int(self.row_offset)}"
+        return sql, list(self.params)
+
+    def key(self) -> Tuple:
+        sql, params = self.to_sql()
+        return (sql, tuple(params))
+
+
 class Database:
-    def __init__(self):
-        self.conn = duckdb.connect(DB_PATH)
-    
+    def __init__(self, conn: duckdb.DuckDBPyConnection = None):
+        # Reuse a pooled connection/cursor when given (see src/utils/datasets.py)
+        self.conn = conn if conn is not None else duckdb.connect(DB_PATH)
+
     def import_csv(self, csv_path: str, table_name: str = "events"):
         """Loads a CSV into DuckDB table"""
         self.conn.execute(f"CREATE TABLE IF NOT EXISTS {table_name} AS SELECT * FROM read_csv_auto('{csv_path}')")
         logging.info(f"Data loaded into table '{table_name}'")
 
+    def append_df(self, df: pd.DataFrame, table_name: str = "events"):
+        """Appends rows to an existing table, matching columns by name (missing ones become NULL)."""
+        self.conn.register("_append_batch", df)
+        try:
+            self.conn.execute(f"INSERT INTO {quote_ident(table_name)} BY NAME SELECT * FROM _append_batch")
+        finally:
+            self.conn.unregister("_append_batch")
+
     def get_data(self, table_name: str = "events") -> pd.DataFrame:
         """Fetches data as Pandas DataFrame"""
         return self.conn.execute(f"SELECT * FROM {table_name}").df()
@@ -20,7 +129,50 @@ class Database:
     def query(self, sql: str):
         return self.conn.execute(sql).df()
 
+    def fetch(self, query: Query) -> pd.DataFrame:
+        """Runs a Query and returns a DataFrame with only the projected columns/rows."""
+        sql, params = query.to_sql()
+        return self.conn.execute(sql, params).df()
+
+    def fetch_numpy(self, query: Query, dtype=np.float64) -> Tuple[np.ndarray, List[str]]:
+        """
+        Runs a Query into a column-major (rows x columns) matrix plus the column names; NULLs become NaN.
+        DuckDB hands over one numpy array per column, and each is copied once, straight into its
+        column of the result, without a DataFrame in between.
+        """
+        sql, params = query.to_sql()
+        columns = self.conn.execute(sql, params).fetchnumpy()
+        names = list(columns.keys())
+        n_rows = len(columns[names[0]]) if names else 0
+        X = np.empty((n_rows, len(names)), dtype=dtype, order="F")
+        for j, name in enumerate(names):
+            values = columns[name]
+            X[:, j] = np.ma.getdata(values)
+            if isinstance(values, np.ma.MaskedArray):
+                X[np.ma.getmaskarray(values), j] = np.nan
+        return X, names
+
+    def fetch_arrow(self, query: Query):
+        """Runs a Query into a pyarrow.Table (pyarrow is optional); null-free numeric columns export to numpy without copies."""
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("fetch_arrow needs pyarrow. Run `pip install pyarrow`.")
+        sql, params = query.to_sql()
+        return self.conn.execute(sql, params).fetch_arrow_table()
+
+    def iter_batches(self, query: Query, chunk_rows: int = 100_000) -> Iterator[pd.DataFrame]:
+        """Streams a Query as DataFrame chunks of roughly chunk_rows rows (DuckDB vectors hold 2048 rows)."""
+        sql, params = query.to_sql()
+        result = self.conn.execute(sql, params)
+        vectors = max(1, chunk_rows // 2048)
+        while True:
+            chunk = result.fetch_df_chunk(vectors)
+            if chunk.empty:
+                break
+            yield chunk
+
 if __name__ == "__main__":
     db = Database()
     db.import_csv("data/raw/ecommerce_data.csv")
-    print(db.query("SELECT count(*) FROM events"))
\ No newline at end of file
+    print(db.query("SELECT count(*) FROM events"))
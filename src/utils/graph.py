@@ -0,0 +1,105 @@
+# src/utils/graph.py
+import heapq
+import logging
+import networkx as nx
+from collections import deque
+from typing import Hashable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+Edge = Tuple[Hashable, Hashable]
+
+
+def eades_ordering(g: nx.DiGraph, weight: str = "confidence", default: float = 1.0) -> List[Hashable]:
+    """
+    Greedy Eades-Lin-Smyth vertex ordering: sinks go to the back, sources to the front,
+    otherwise the vertex with the largest (outgoing - incoming) remaining weight goes next.
+    Edges pointing backwards in the ordering form a feedback arc set.
+    O((V + E) log V) with a lazily updated heap.
+    """
+    index = {v: k for k, v in enumerate(g.nodes())}
+    out_w = {v: 0.0 for v in g}
+    in_w = {v: 0.0 for v in g}
+    out_deg = {v: 0 for v in g}
+    in_deg = {v: 0 for v in g}
+    for u, v, d in g.edges(data=True):
+        if u == v:
+            continue
+        w = d.get(weight, default)
+        out_w[u] += w
+        in_w[v] += w
+        out_deg[u] += 1
+        in_deg[v] += 1
+
+    remaining = set(g)
+    sinks = deque(v for v in g if out_deg[v] == 0)
+    sources = deque(v for v in g if in_deg[v] == 0 and out_deg[v] > 0)
+    heap = [(in_w[v] - out_w[v], index[v], v) for v in g]
+    heapq.heapify(heap)
+    front, back = [], deque()
+
+    def remove(u):
+        remaining.discard(u)
+        for p in g.predecessors(u):
+            if p in remaining and p != u:
+                out_w[p] -= g[p][u].get(weight, default)
+                out_deg[p] -= 1
+                if out_deg[p] == 0:
+                    sinks.append(p)
+                heapq.heappush(heap, (in_w[p] - out_w[p], index[p], p))
+        for s in g.successors(u):
+            if s in remaining and s != u:
+                in_w[s] -= g[u][s].get(weight, default)
+                in_deg[s] -= 1
+                if in_deg[s] == 0:
+                    sources.append(s)
+                heapq.heappush(heap, (in_w[s] - out_w[s], index[s], s))
+
+    while remaining:
+        while sinks:
+            u = sinks.popleft()
+            if u in remaining:
+                back.appendleft(u)
+                remove(u)
+        while sources:
+            u = sources.popleft()
+            if u in remaining and in_deg[u] == 0:
+                front.append(u)
+                remove(u)
+        while remaining and not sinks and not sources:
+            key, _, u = heapq.heappop(heap)
+            # Skip stale heap entries
+            if u in remaining and key == in_w[u] - out_w[u]:
+                front.append(u)
+                remove(u)
+    return front + list(back)
+
+
+def feedback_arc_set(g: nx.DiGraph, weight: str = "confidence", default: float = 1.0) -> List[Edge]:
+    """
+    Edges whose removal leaves g acyclic, preferring to keep heavy edges.
+    Only strongly connected components can hold cycles, so each one is ordered on its own.
+    """
+    removed = [(u, v) for u, v in nx.selfloop_edges(g)]
+    for component in nx.strongly_connected_components(g):
+        if len(component) < 2:
+            continue
+        sub = g.subgraph(component)
+        position = {v: k for k, v in enumerate(eades_ordering(sub, weight, default))}
+        removed += [(u, v) for u, v in sub.edges() if u != v and position[u] > position[v]]
+    return removed
+
+
+def make_acyclic(g: nx.DiGraph, weight: str = "confidence") -> nx.DiGraph:
+    """
+    Copy of g without a feedback arc set, so it is a DAG (required for SCM and counterfactual math).
+    Edges are weighted by their `weight` attribute when present (e.g. ensemble confidence), else 1.
+    """
+    g_copy = g.copy()
+    removed = feedback_arc_set(g_copy, weight)
+    if removed:
+        g_copy.remove_edges_from(removed)
+        logger.warning(f"Cycles detected! Removed {len(removed)} edge(s) to enforce DAG: "
+                       + ", ".join(f"{u} -> {v}" for u, v in removed[:20])
+                       + (" ..." if len(removed) > 20 else ""))
+    return g_copy
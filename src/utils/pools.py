@@ -0,0 +1,14 @@
+# src/utils/pools.py
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+# Spawned workers avoid forking a process that already runs threads and torch
+SPAWN = multiprocessing.get_context("spawn")
+
+
+def spawn_pool(max_workers: Optional[int] = None, initializer: Optional[Callable] = None,
+               initargs: tuple = ()) -> ProcessPoolExecutor:
+    """Process pool whose workers start from a fresh interpreter; tasks and arguments must be picklable."""
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=SPAWN,
+                               initializer=initializer, initargs=initargs)
@@ -0,0 +1,54 @@
+import os
+from typing import Dict, Optional
+
+import mlflow
+import networkx as nx
+import pandas as pd
+import pytest
+import torch
+
+from src.scm.estimator import CausalSCM, NodeEstimator
+
+
+def untrained_scm(graph: nx.DiGraph, mean: Optional[Dict[str, float]] = None,
+                  std: Optional[Dict[str, float]] = None, seed: int = 0) -> CausalSCM:
+    """SCM over `graph` with random node models; enough for sampling and format tests."""
+    torch.manual_seed(seed)
+    model = CausalSCM(graph)
+    model.models = {node: NodeEstimator(graph.in_degree(node)) for node in graph if graph.in_degree(node)}
+    nodes = list(graph.nodes())
+    model.data_stats = {"mean": pd.Series(mean or {node: 0.5 * k - 1.0 for k, node in enumerate(nodes)}),
+                        "std": pd.Series(std or {node: 0.5 + 0.25 * k for k, node in enumerate(nodes)})}
+    model.is_fitted = True
+    return model
+
+
+@pytest.fixture
+def make_scm():
+    return untrained_scm
+
+
+@pytest.fixture
+def scm():
+    """Small untrained SCM a -> b -> c, a -> c."""
+    return untrained_scm(nx.DiGraph([("a", "b"), ("b", "c"), ("a", "c")]),
+                         mean={"a": 1.0, "b": -2.0, "c": 0.5}, std={"a": 2.0, "b": 0.5, "c": 3.0})
+
+
+@pytest.fixture
+def wide_scm():
+    """Three layers deep, with several roots, a diamond, mixed in-degrees and an isolated node."""
+    graph = nx.DiGraph([("a", "c"), ("b", "c"), ("a", "d"), ("c", "e"), ("d", "e"), ("b", "e"), ("e", "f")])
+    graph.add_node("g")
+    return untrained_scm(graph)
+
+
+@pytest.fixture
+def tracking(tmp_path, monkeypatch):
+    """Runs a test in tmp_path with its own MLflow store, so fits log and write artifacts there."""
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("data/temp")
+    previous = mlflow.get_tracking_uri()
+    mlflow.set_tracking_uri(f"sqlite:///{tmp_path}/mlflow.db")
+    yield tmp_path
+    mlflow.set_tracking_uri(previous)
@@ -0,0 +1,74 @@
+import pytest
+
+from src.simulator.cache import SimulationCache, summarize
+from src.simulator.simulator import SAMPLE_BLOCK, CausalSimulator
+
+
+@pytest.fixture
+def sim(wide_scm):
+    return CausalSimulator(wide_scm, backend="fused")
+
+
+def fresh(sim, interventions, n, seed=0):
+    n_blocks = -(-n // SAMPLE_BLOCK)
+    return summarize(sim.sample_blocks(interventions, 0, n_blocks, seed)[:n], sim.scm.plan.nodes)
+
+
+def test_repeated_requests_hit_the_cache(sim):
+    cache = SimulationCache()
+    first = cache.summary(sim, "m:1", {"c": 1.0}, 2000)
+    assert cache.summary(sim, "m:1", {"c": 1.0}, 2000) is first
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    # Values equal after rounding share the entry; other seeds and models do not
+    assert cache.summary(sim, "m:1", {"c": 1.0 + 1e-9}, 2000) is first
+    cache.summary(sim, "m:1", {"c": 1.0}, 2000, seed=1)
+    cache.summary(sim, "m:2", {"c": 1.0}, 2000)
+    assert cache.stats()["entries"] == 3
+
+
+def test_extended_pool_equals_a_fresh_draw(sim):
+    cache = SimulationCache()
+    small = cache.summary(sim, "m:1", {"a": -0.5}, 1500)
+    large = cache.summary(sim, "m:1", {"a": -0.5}, 5000)
+
+    assert small == fresh(sim, {"a": -0.5}, 1500)
+    assert large == fresh(sim, {"a": -0.5}, 5000)
+    assert cache.stats()["entries"] == 1
+    # The longer pool also serves smaller requests it has not summarized yet
+    assert cache.summary(sim, "m:1", {"a": -0.5}, 3000) == fresh(sim, {"a": -0.5}, 3000)
+
+
+def test_entries_expire_after_ttl(sim):
+    cache = SimulationCache(ttl=-1.0)
+    cache.summary(sim, "m:1", {}, 1000)
+    cache.summary(sim, "m:1", {}, 1000)
+    assert cache.stats()["misses"] == 2 and cache.stats()["hits"] == 0
+
+
+def test_least_recently_used_entries_are_evicted(sim):
+    pool_bytes = SAMPLE_BLOCK * len(sim.scm.plan) * 4
+    cache = SimulationCache(max_bytes=2 * pool_bytes + 4096)
+    for value in (0.0, 1.0, 2.0):
+        cache.summary(sim, "m:1", {"c": value}, SAMPLE_BLOCK)
+        cache.summary(sim, "m:1", {"c": 0.0}, SAMPLE_BLOCK)     # keep the first one fresh
+
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["bytes"] <= cache.max_bytes
+    hits = stats["hits"]
+    cache.summary(sim, "m:1", {"c": 0.0}, SAMPLE_BLOCK)
+    cache.summary(sim, "m:1", {"c": 2.0}, SAMPLE_BLOCK)
+    assert cache.stats()["hits"] == hits + 2
+    cache.summary(sim, "m:1", {"c": 1.0}, SAMPLE_BLOCK)
+    assert cache.stats()["hits"] == hits + 2
+
+
+def test_large_requests_stream_and_keep_no_pool(sim):
+    cache = SimulationCache(max_pool_rows=2000)
+    result = cache.summary(sim, "m:1", {"d": 0.5}, 5000)
+    exact = fresh(sim, {"d": 0.5}, 5000)
+
+    for node in sim.scm.plan.nodes:
+        assert result["mean"][node] == pytest.approx(exact["mean"][node], rel=1e-6, abs=1e-6)
+    assert cache.stats()["bytes"] < SAMPLE_BLOCK * len(sim.scm.plan) * 4
+    assert cache.summary(sim, "m:1", {"d": 0.5}, 5000) is result
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.counterfactuals.engine import CounterfactualEngine
+
+
+def observations(nodes, n: int = 12, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(rng.normal(size=(n, len(nodes))), columns=nodes)
+
+
+def test_no_intervention_gives_back_the_observation(wide_scm):
+    obs = observations(list(wide_scm.graph))
+    (cf,) = CounterfactualEngine(wide_scm).estimate_counterfactual_batch(obs, [{}])
+    np.testing.assert_allclose(cf[obs.columns], obs, rtol=1e-4, atol=1e-4)
+
+
+def test_batch_matches_one_observation_at_a_time(wide_scm):
+    engine = CounterfactualEngine(wide_scm)
+    obs = observations(list(wide_scm.graph))
+    obs.iloc[::3, obs.columns.get_loc("c")] = np.nan      # partially observed units
+    interventions = [{"a": 1.0}, {"c": -0.5, "d": 2.0}]
+
+    batch = engine.estimate_counterfactual_batch(obs, interventions)
+    for k, intervention in enumerate(interventions):
+        for row in range(len(obs)):
+            single = engine.estimate_counterfactual(obs.iloc[row], intervention)
+            np.testing.assert_allclose(batch[k].iloc[row], single[batch[k].columns], rtol=1e-5, atol=1e-5)
+        for node, value in intervention.items():
+            np.testing.assert_allclose(batch[k][node], value, rtol=1e-5)
+
+
+def test_only_descendants_of_the_intervention_change(wide_scm):
+    obs = observations(list(wide_scm.graph))
+    (cf,) = CounterfactualEngine(wide_scm).estimate_counterfactual_batch(obs, [{"d": 3.0}])
+    for node in ("a", "b", "c", "g"):
+        np.testing.assert_allclose(cf[node], obs[node], rtol=1e-4, atol=1e-4)
+    assert not np.allclose(cf["e"], obs["e"])
+
+
+def test_single_counterfactual_keeps_columns_outside_the_graph(scm):
+    scm.data_stats = {key: pd.concat([value, pd.Series({"z": 1.0})]) for key, value in scm.data_stats.items()}
+    result = CounterfactualEngine(scm).estimate_counterfactual(pd.Series({"a": 1.0, "b": 0.0, "c": 2.0}), {"b": 1.0})
+    assert list(result.index) == ["a", "b", "c", "z"]
+    assert np.isnan(result["z"])
+    assert result["b"] == pytest.approx(1.0)
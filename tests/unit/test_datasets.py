@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.datasets import DatasetManager
+from src.utils.db import Query
+
+
+@pytest.fixture
+def datasets(tmp_path):
+    manager = DatasetManager(db_path=str(tmp_path / "db.duckdb"))
+    frame = pd.DataFrame(np.random.default_rng(0).normal(size=(1000, 3)), columns=["a", "b", "c"])
+    conn = manager.cursor()
+    conn.register("frame", frame)
+    conn.execute("CREATE TABLE events AS SELECT * FROM frame")
+    yield manager
+    manager.close()
+
+
+def test_frames_are_cached_until_the_source_changes(datasets):
+    full = datasets.get_frame("events")
+    assert datasets.get_frame("events") is full
+    # Projections of a cached full frame are served from memory
+    pd.testing.assert_frame_equal(datasets.get_frame("events", ["c", "a"]), full[["c", "a"]])
+
+    datasets.database().append_df(full.head(10), "events")
+    fresh = datasets.get_frame("events")
+    assert fresh is not full and len(fresh) == 1010
+    assert len(datasets._frames) == 1                # results on the stale version were dropped
+
+
+def test_cache_stays_within_its_byte_budget(datasets):
+    size = int(datasets.get_frame("events", ["a"]).memory_usage(deep=True).sum())
+    datasets.clear()
+    datasets.max_bytes = 2 * size
+
+    first = datasets.get_frame("events", ["a"])
+    datasets.get_frame("events", ["b"])
+    datasets.get_frame("events", ["c"])
+    assert datasets._bytes <= datasets.max_bytes
+    assert datasets.get_frame("events", ["a"]) is not first
+
+    datasets.max_bytes = size // 2
+    datasets.clear()
+    datasets.get_frame("events")
+    assert datasets._bytes == 0 and not datasets._frames
+
+
+def test_filtered_queries_are_keyed_by_their_parameters(datasets):
+    low = datasets.fetch(Query("events").select("a").where("a < ?", 0.0))
+    high = datasets.fetch(Query("events").select("a").where("a < ?", 1.0))
+    assert (low["a"] < 0).all() and len(high) > len(low)
+
+
+def test_summaries_match_pandas(datasets):
+    full = datasets.get_frame("events")
+    summary = datasets.summarize("events", ["a", "b"], quantiles=[0.5])
+    for column in ("a", "b"):
+        assert summary[column]["count"] == len(full)
+        assert summary[column]["mean"] == pytest.approx(full[column].mean())
+        assert summary[column]["std"] == pytest.approx(full[column].std())
+        assert summary[column]["q0.5"] == pytest.approx(full[column].median())
+    assert datasets.row_count("events") == len(full)
+    assert datasets.columns("events") == ["a", "b", "c"]
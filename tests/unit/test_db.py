@@ -0,0 +1,49 @@
+import duckdb
+import numpy as np
+import pandas as pd
+
+from src.utils.datasets import DatasetManager
+from src.utils.db import Database, Query
+
+
+def test_fetch_numpy_matches_fetch_with_nulls():
+    conn = duckdb.connect()
+    conn.execute("CREATE TABLE t AS SELECT range::DOUBLE AS a, "
+                 "CASE WHEN range % 3 = 0 THEN NULL ELSE range END::INTEGER AS b FROM range(10)")
+    db = Database(conn)
+
+    X, names = db.fetch_numpy(Query("t"))
+    expected = db.fetch(Query("t")).to_numpy(dtype=np.float64)
+
+    assert names == ["a", "b"]
+    assert X.flags.f_contiguous
+    np.testing.assert_array_equal(X, expected)
+    assert db.fetch_numpy(Query("t").where("a > 100"))[0].shape == (0, 2)
+
+
+def test_fetch_matrix_frames_export_without_copy(tmp_path):
+    path = str(tmp_path / "data.csv")
+    pd.DataFrame(np.random.default_rng(0).normal(size=(500, 3)), columns=["x", "y", "z"]).to_csv(path, index=False)
+    datasets = DatasetManager(db_path=str(tmp_path / "db.duckdb"))
+
+    df = datasets.fetch_matrix(Query(path))
+
+    assert datasets.fetch_matrix(Query(path)) is df
+    assert np.shares_memory(df.to_numpy(dtype=np.float64), df.to_numpy())
+    np.testing.assert_allclose(df.to_numpy(), datasets.fetch(Query(path)).to_numpy())
+
+
+def test_covariance_matches_numpy_on_complete_rows(tmp_path):
+    X = np.random.default_rng(1).normal(size=(20_000, 6))
+    X[::7, 2] = np.nan
+    df = pd.DataFrame(X, columns=[f"c{i}" for i in range(6)])
+    path = str(tmp_path / "data.parquet")
+    df.to_parquet(path)
+    datasets = DatasetManager(db_path=str(tmp_path / "db.duckdb"))
+
+    n, mean, cov = datasets.covariance(path, df.columns, chunk_rows=4096)
+
+    complete = df.dropna().to_numpy()
+    assert n == len(complete)
+    np.testing.assert_allclose(mean, complete.mean(axis=0))
+    np.testing.assert_allclose(cov, np.cov(complete.T))
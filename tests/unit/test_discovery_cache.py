@@ -0,0 +1,70 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.causal_discovery.cache import DiscoveryCache
+from src.utils.datasets import DatasetManager
+
+
+def result(n_edges: int) -> dict:
+    return {"nodes": ["a", "b"], "edges": [{"source": "a", "target": "b", "weight": k} for k in range(n_edges)]}
+
+
+def test_keys_depend_on_data_method_and_options():
+    key = DiscoveryCache.key("fp1", "PC", {"alpha": 0.05, "max_depth": 2})
+    assert key == DiscoveryCache.key("fp1", "pc", {"max_depth": 2, "alpha": 0.05})
+    assert key != DiscoveryCache.key("fp2", "pc", {"alpha": 0.05, "max_depth": 2})
+    assert key != DiscoveryCache.key("fp1", "ges", {"alpha": 0.05, "max_depth": 2})
+    assert key != DiscoveryCache.key("fp1", "pc", {"alpha": 0.01, "max_depth": 2})
+
+
+def test_round_trip_and_unreadable_entries(tmp_path):
+    cache = DiscoveryCache(directory=str(tmp_path / "cache"))
+    assert cache.get("missing") is None
+    cache.put("k", result(2))
+    assert cache.get("k") == result(2)
+
+    with open(os.path.join(cache.directory, "broken.json"), "w") as f:
+        f.write("{not json")
+    assert cache.get("broken") is None
+    cache.clear()
+    assert cache.get("k") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = DiscoveryCache(directory=str(tmp_path / "cache"))
+    cache.put("first", result(50))
+    size = os.path.getsize(os.path.join(cache.directory, "first.json"))
+    cache.max_bytes = int(2.5 * size)
+
+    cache.put("second", result(50))
+    old = time.time() - 60
+    for k, name in enumerate(("first", "second")):
+        os.utime(os.path.join(cache.directory, f"{name}.json"), (old + k, old + k))
+    assert cache.get("first") is not None          # a hit makes it the most recent entry
+    cache.put("third", result(50))
+
+    assert cache.get("second") is None
+    assert cache.get("first") is not None and cache.get("third") is not None
+
+
+def test_fingerprint_changes_with_the_data(tmp_path):
+    datasets = DatasetManager(db_path=str(tmp_path / "db.duckdb"))
+    frame = pd.DataFrame(np.random.default_rng(0).normal(size=(100, 3)), columns=["a", "b", "c"])
+    datasets.cursor().execute("CREATE TABLE events AS SELECT * FROM frame")
+
+    before = datasets.fingerprint("events")
+    assert datasets.fingerprint("events") == before
+    assert datasets.fingerprint("events", ["a", "b"]) != before
+
+    datasets.database().append_df(frame.head(5), "events")
+    assert datasets.fingerprint("events") != before
+
+    path = str(tmp_path / "data.csv")
+    frame.to_csv(path, index=False)
+    csv_before = datasets.fingerprint(path)
+    frame.assign(a=frame["a"] + 1).to_csv(path, index=False)
+    os.utime(path, (time.time() + 5, time.time() + 5))
+    assert datasets.fingerprint(path) != csv_before
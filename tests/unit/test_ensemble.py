@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.causal_discovery.ensemble import EnsembleDiscovery, bootstrap_indices
+
+
+def collider(n: int = 1500, seed: int = 0) -> pd.DataFrame:
+    """a -> c <- b, with an unrelated column d."""
+    rng = np.random.default_rng(seed)
+    a, b, d = rng.normal(size=(3, n))
+    return pd.DataFrame({"a": a, "b": b, "c": a + b + 0.5 * rng.normal(size=n), "d": d})
+
+
+def test_bootstrap_indices_are_reproducible_and_sorted():
+    first = bootstrap_indices(100, seed=7, b=3)
+    np.testing.assert_array_equal(first, bootstrap_indices(100, seed=7, b=3))
+    assert np.all(np.diff(first) >= 0)
+    assert first.min() >= 0 and first.max() < 100
+    assert not np.array_equal(first, bootstrap_indices(100, seed=7, b=4))
+    assert not np.array_equal(first, bootstrap_indices(100, seed=8, b=3))
+
+
+def test_confidences_are_run_fractions():
+    ensemble = EnsembleDiscovery(methods=["pc", "ges"], n_bootstrap=4, threshold=0.5, n_workers=1)
+    graph = ensemble.run(collider())
+
+    assert set(graph.nodes()) == {"a", "b", "c", "d"}
+    assert set(graph.edges()) >= {("a", "c"), ("b", "c")}
+    assert not any("d" in edge for edge in graph.edges())
+    for (u, v), confidence in ensemble.frequencies.items():
+        expected = sum(ensemble.method_frequencies[m].get((u, v), 0.0) for m in ensemble.methods) / 2
+        assert confidence == pytest.approx(expected)
+        assert (confidence >= 0.5) == graph.has_edge(u, v)
+        if graph.has_edge(u, v):
+            assert graph[u][v]["confidence"] == confidence
+        assert confidence * 8 == pytest.approx(round(confidence * 8))
+
+
+def test_workers_do_not_change_the_result():
+    data = collider(seed=1)
+    serial = EnsembleDiscovery(methods=["pc"], n_bootstrap=4, n_workers=1, seed=3)
+    pooled = EnsembleDiscovery(methods=["pc"], n_bootstrap=4, n_workers=2, seed=3)
+    serial.run(data)
+    pooled.run(data)
+    assert pooled.frequencies == serial.frequencies
+
+
+def test_rejects_bad_settings():
+    with pytest.raises(ValueError):
+        EnsembleDiscovery(methods=["pc", "lingam"])
+    with pytest.raises(ValueError):
+        EnsembleDiscovery(methods=[])
+    with pytest.raises(ValueError):
+        EnsembleDiscovery(n_bootstrap=0)
@@ -0,0 +1,79 @@
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.scm.estimator import CausalSCM, ShuffleBuffer
+from src.scm.stats import RunningStats
+
+
+def chunks(n_chunks: int = 10, rows: int = 500, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    out = []
+    for _ in range(n_chunks):
+        a = rng.normal(size=rows)
+        b = np.sin(2 * a) + 0.1 * rng.normal(size=rows)
+        out.append(pd.DataFrame({"a": a, "b": b}))
+    return out
+
+
+class Source:
+    """Replays the same chunks on every call and counts the passes."""
+    def __init__(self, parts):
+        self.parts = parts
+        self.passes = 0
+
+    def __call__(self):
+        self.passes += 1
+        return iter(self.parts)
+
+
+def test_shuffle_buffer_emits_every_row_once():
+    buffer = ShuffleBuffer(batch_size=64, size=300, rng=np.random.default_rng(0))
+    batches = []
+    for start in range(0, 1000, 130):
+        batches.extend(buffer.add(np.arange(start, min(start + 130, 1000))))
+    assert all(len(b) == 64 for b in batches)
+    batches.extend(buffer.flush())
+
+    rows = np.concatenate(batches)
+    assert sorted(rows.tolist()) == list(range(1000))
+    assert not np.array_equal(rows, np.arange(1000))
+
+
+def test_stream_fit_learns_and_scores_a_holdout(tracking):
+    parts = chunks()
+    source = Source(parts)
+    reports = []
+    scm = CausalSCM(nx.DiGraph([("a", "b")]))
+    scm.fit_stream(source, epochs=15, lr=0.01, batch_size=128, shuffle_buffer=1000, callback=reports.append)
+
+    data = pd.concat(parts)
+    assert source.passes == 1 + len(reports)        # one stats pass, then one per epoch
+    np.testing.assert_allclose(scm.data_stats["mean"], data.mean())
+    np.testing.assert_allclose(scm.data_stats["std"], data.std())
+    assert all(r["holdout_loss"] is not None for r in reports)
+    assert reports[-1]["train_loss"] < reports[0]["train_loss"]
+
+    preds = scm.predict_node("b", data[["a"]])
+    assert np.mean((preds - data["b"]) ** 2) < 0.1 * data["b"].var()
+    assert scm.node_losses["b"] == pytest.approx(min(r["holdout_loss"] for r in reports))
+
+
+def test_precomputed_stats_skip_the_extra_pass(tracking):
+    parts = chunks(4)
+    source = Source(parts)
+    stats = RunningStats(["a", "b"]).update(pd.concat(parts))
+    scm = CausalSCM(nx.DiGraph([("a", "b")]))
+    scm.fit_stream(source, epochs=3, stats=stats, holdout_fraction=0.0)
+
+    assert source.passes == 3
+    assert scm.running_stats is stats
+
+
+def test_training_stops_once_the_holdout_stalls(tracking):
+    source = Source(chunks(4))
+    reports = []
+    scm = CausalSCM(nx.DiGraph([("a", "b")]))
+    scm.fit_stream(source, epochs=50, lr=0.0, patience=2, callback=reports.append)
+    assert len(reports) == 3                         # the best epoch, then two without improvement
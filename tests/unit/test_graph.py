@@ -0,0 +1,57 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from src.utils.graph import eades_ordering, feedback_arc_set, make_acyclic
+
+
+def random_digraph(seed: int, n: int = 60, p: float = 0.08) -> nx.DiGraph:
+    rng = np.random.default_rng(seed)
+    g = nx.gnp_random_graph(n, p, seed=seed, directed=True)
+    g.add_edges_from((v, v) for v in rng.choice(n, 3, replace=False))
+    for u, v in g.edges():
+        g[u][v]["confidence"] = float(rng.uniform(0.1, 1.0))
+    return g
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_make_acyclic_returns_dag_subgraph(seed):
+    g = random_digraph(seed)
+    edges = set(g.edges())
+    dag = make_acyclic(g)
+
+    assert nx.is_directed_acyclic_graph(dag)
+    assert set(dag.nodes()) == set(g.nodes())
+    assert set(dag.edges()) <= edges
+    assert set(g.edges()) == edges       # the input is left untouched
+    for u, v in dag.edges():
+        assert dag[u][v] == g[u][v]
+
+
+def test_dag_is_unchanged():
+    g = nx.gnp_random_graph(40, 0.2, seed=1, directed=True)
+    dag = nx.DiGraph([(u, v) for u, v in g.edges() if u < v])
+    assert set(make_acyclic(dag).edges()) == set(dag.edges())
+    assert feedback_arc_set(dag) == []
+
+
+def test_cycles_lose_their_weakest_edge():
+    g = nx.DiGraph()
+    g.add_edge("a", "b", confidence=0.9)
+    g.add_edge("b", "a", confidence=0.2)
+    g.add_edge("x", "y", confidence=0.8)
+    g.add_edge("y", "z", confidence=0.7)
+    g.add_edge("z", "x", confidence=0.1)
+
+    assert sorted(feedback_arc_set(g)) == [("b", "a"), ("z", "x")]
+
+
+def test_eades_ordering_is_a_permutation():
+    g = random_digraph(3, n=200, p=0.05)
+    order = eades_ordering(g)
+    assert sorted(order) == sorted(g.nodes())
+
+
+def test_large_graph():
+    g = nx.gnm_random_graph(5000, 50_000, seed=0, directed=True)
+    assert nx.is_directed_acyclic_graph(make_acyclic(g))
@@ -0,0 +1,78 @@
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.causal_discovery.algorithms import notears_weights
+from src.causal_discovery.incremental import IncrementalDiscovery
+from src.causal_discovery.pc import cpdag_to_digraph, pc_from_corr
+from src.causal_discovery.stats import SufficientStats
+
+
+def linear_frame(seed: int, d: int = 8, n: int = 4000, density: float = 0.3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    W = np.triu(rng.uniform(0.4, 1.2, (d, d)) * (rng.random((d, d)) < density), 1)
+    X = np.zeros((n, d))
+    for j in range(d):
+        X[:, j] = X @ W[:, j] + rng.normal(size=n)
+    return pd.DataFrame(X, columns=[f"x{j}" for j in range(d)])
+
+
+def edges(graph: nx.DiGraph) -> set:
+    return set(graph.edges())
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_pc_updates_match_a_full_run(seed):
+    data = linear_frame(seed)
+    inc = IncrementalDiscovery("pc", data.columns.tolist())
+    for start in range(0, len(data), 1000):
+        graph = inc.update(data.iloc[start:start + 1000])
+
+    stats = SufficientStats.from_data(data)
+    full = pc_from_corr(stats.corr(), stats.n, 0.05)
+    assert inc.rows_seen == len(data)
+    assert edges(graph) == edges(cpdag_to_digraph(full.graph, data.columns.tolist()))
+    assert edges(graph) == edges(inc.refresh())
+
+
+def test_pc_update_reuses_the_previous_result():
+    data = linear_frame(0, d=12)
+    inc = IncrementalDiscovery("pc", data.columns.tolist())
+    inc.update(data.iloc[:3000])
+    tests_before = inc.pc_result.n_tests
+    inc.update(data.iloc[3000:])
+
+    stats = SufficientStats.from_data(data)
+    assert inc.pc_result.n_tests - tests_before < pc_from_corr(stats.corr(), stats.n, 0.05).n_tests
+
+
+def test_notears_warm_starts_from_the_previous_weights():
+    data = linear_frame(1, d=5)
+    inc = IncrementalDiscovery("notears", data.columns.tolist())
+    inc.update(data.iloc[:2000])
+    inc.update(data.iloc[2000:])
+
+    stats = SufficientStats.from_data(data)
+    np.testing.assert_allclose(inc.weights, notears_weights(stats.corr()), atol=0.05)
+
+
+def test_add_defers_discovery_and_state_survives_a_reload(tmp_path):
+    data = linear_frame(2, d=6)
+    inc = IncrementalDiscovery("pc", data.columns.tolist())
+    inc.add(data.iloc[:5])
+    assert inc.graph().number_of_edges() == 0
+    with pytest.raises(ValueError):
+        inc.rediscover()
+
+    inc.update(data.iloc[5:])
+    path = str(tmp_path / "state" / "inc.pkl")
+    inc.save(path)
+    loaded = IncrementalDiscovery.load(path)
+    assert loaded.rows_seen == len(data)
+    assert edges(loaded.graph()) == edges(inc.graph())
+
+
+def test_rejects_unsupported_methods():
+    with pytest.raises(ValueError):
+        IncrementalDiscovery("ges", ["a", "b"])
@@ -0,0 +1,42 @@
+import os
+import time
+
+from src.jobs.manager import FINISHED, RUNNING, SUCCEEDED, JobManager
+
+
+def reporting_task(ctx, release_path: str):
+    # Reports like a fit does, until the test lets it finish
+    step = 0
+    while not os.path.exists(release_path):
+        ctx.report(step=step)
+        step += 1
+        time.sleep(0.05)
+    return step
+
+
+def poll(manager: JobManager, job_id: str, predicate, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job is not None and predicate(job):
+            return job
+        time.sleep(0.1)
+    raise AssertionError(f"Job {job_id} did not reach the expected state")
+
+
+def test_other_process_sees_progress_and_result(tmp_path):
+    owner = JobManager(max_workers=1, state_dir=str(tmp_path))
+    other = JobManager(state_dir=str(tmp_path))
+    release = tmp_path / "release"
+    try:
+        job = owner.submit("test", reporting_task, str(release))
+
+        seen = poll(other, job.id, lambda j: j.status == RUNNING and j.progress.get("step", 0) > 0)
+        assert seen.future is None
+
+        release.touch()
+        done = poll(other, job.id, lambda j: j.status in FINISHED)
+        assert done.status == SUCCEEDED
+        assert done.result > 0
+    finally:
+        owner.shutdown()
@@ -0,0 +1,54 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from src.causal_discovery.algorithms import notears_weights, run_notears, weights_to_graph
+
+
+def linear_sem(W: np.ndarray, n: int = 2000, seed: int = 0) -> np.ndarray:
+    """Samples X = X W + noise from an upper-triangular weight matrix."""
+    rng = np.random.default_rng(seed)
+    X = np.zeros((n, W.shape[0]))
+    for j in range(W.shape[0]):
+        X[:, j] = X @ W[:, j] + rng.normal(size=n)
+    return X
+
+
+CHAIN = np.array([[0.0, 1.5, 0.0, 0.0],
+                  [0.0, 0.0, -1.2, 0.0],
+                  [0.0, 0.0, 0.0, 0.8],
+                  [0.0, 0.0, 0.0, 0.0]])
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_recovers_a_linear_chain(seed):
+    labels = ["a", "b", "c", "d"]
+    graph = run_notears(linear_sem(CHAIN, seed=seed), labels=labels)
+
+    assert set(graph.edges()) == {("a", "b"), ("b", "c"), ("c", "d")}
+    for u, v in graph.edges():
+        assert graph[u][v]["weight"] == pytest.approx(CHAIN[labels.index(u), labels.index(v)], abs=0.15)
+
+
+def test_solution_is_acyclic_without_self_loops():
+    rng = np.random.default_rng(1)
+    W = np.triu(rng.uniform(0.5, 1.5, (6, 6)) * (rng.random((6, 6)) < 0.5), 1)
+    X = linear_sem(W, seed=3)
+    W_est = notears_weights(X.T @ X / len(X))
+
+    assert np.all(np.diag(W_est) == 0)
+    assert nx.is_directed_acyclic_graph(weights_to_graph(W_est, 0.3))
+
+
+def test_warm_start_from_the_solution_stays_put():
+    X = linear_sem(CHAIN, seed=4)
+    C = X.T @ X / len(X)
+    W = notears_weights(C)
+    np.testing.assert_allclose(notears_weights(C, w_init=W), W, atol=0.05)
+
+
+def test_weights_to_graph_thresholds_and_labels():
+    W = np.array([[0.0, 0.5, -0.1], [0.0, 0.0, -0.4], [0.0, 0.0, 0.0]])
+    graph = weights_to_graph(W, 0.3, ["x", "y", "z"])
+    assert list(graph.nodes()) == ["x", "y", "z"]
+    assert {(u, v): d["weight"] for u, v, d in graph.edges(data=True)} == {("x", "y"): 0.5, ("y", "z"): -0.4}
@@ -0,0 +1,65 @@
+import networkx as nx
+import pytest
+import torch
+
+from src.optimization.optimizer import InterventionOptimizer, Objective
+
+
+def linear_estimator(model, weights):
+    """Sets a NodeEstimator to compute exactly weights . x, as relu(w.x) - relu(-w.x)."""
+    w = torch.tensor(weights, dtype=torch.float32)
+    with torch.no_grad():
+        for layer in (model.net[0], model.net[2]):
+            layer.weight.zero_()
+            layer.bias.zero_()
+        model.net[0].weight[0] = w
+        model.net[0].weight[1] = -w
+        model.net[2].weight[0, :2] = torch.tensor([1.0, -1.0])
+    return model
+
+
+@pytest.fixture
+def linear_scm(make_scm):
+    """y = 2 x + z + noise, in raw units (zero means, unit stds)."""
+    graph = nx.DiGraph([("x", "y"), ("z", "y")])
+    zeros, ones = {n: 0.0 for n in graph}, {n: 1.0 for n in graph}
+    scm = make_scm(graph, mean=zeros, std=ones)
+    linear_estimator(scm.models["y"], [2.0, 1.0])
+    return scm
+
+
+def test_hits_a_target_with_one_control(linear_scm):
+    optimizer = InterventionOptimizer(linear_scm, n_samples=1024)
+    result = optimizer.optimize({"x": (-5.0, 5.0)}, [Objective("y", "target", 3.0)])
+    assert result["values"]["x"] == pytest.approx(1.5, abs=0.1)
+    assert result["outcomes"]["y"] == pytest.approx(3.0, abs=0.1)
+    assert result["cost"] is None
+
+
+def test_maximizing_pushes_every_control_to_its_bound(linear_scm):
+    optimizer = InterventionOptimizer(linear_scm, steps=400, lr=0.2)
+    result = optimizer.optimize({"x": (-1.0, 2.0), "z": (-1.0, 1.0)}, [Objective("y", "maximize")])
+    assert result["values"]["x"] == pytest.approx(2.0, abs=0.05)
+    assert result["values"]["z"] == pytest.approx(1.0, abs=0.05)
+    assert result["outcomes"]["y"] == pytest.approx(5.0, abs=0.2)
+
+
+def test_budget_goes_to_the_better_control(linear_scm):
+    optimizer = InterventionOptimizer(linear_scm, steps=400, lr=0.2)
+    result = optimizer.optimize({"x": (0.0, 2.0), "z": (0.0, 2.0)}, [Objective("y", "maximize")],
+                                costs={"x": 1.0, "z": 1.0}, budget=1.0)
+    assert result["cost"] <= 1.0 + 1e-5
+    assert result["values"]["x"] == pytest.approx(1.0, abs=0.1)
+    assert result["values"]["z"] == pytest.approx(0.0, abs=0.1)
+
+
+def test_rejects_bad_problems(linear_scm):
+    optimizer = InterventionOptimizer(linear_scm, steps=1)
+    with pytest.raises(ValueError):
+        optimizer.optimize({"w": (0.0, 1.0)}, [Objective("y", "maximize")])
+    with pytest.raises(ValueError):
+        optimizer.optimize({"x": (1.0, 2.0)}, [Objective("y", "maximize")], costs={"x": 1.0}, budget=0.5)
+    with pytest.raises(ValueError):
+        Objective("y", "target")
+    with pytest.raises(ValueError):
+        Objective("y", "median")
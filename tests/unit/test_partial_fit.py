@@ -0,0 +1,90 @@
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.scm.stats import RunningStats
+
+
+def chain_data(n: int, seed: int = 0, shift: float = 0.0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    a = rng.normal(shift, 1.0, n)
+    b = 2.0 * a + rng.normal(0.0, 0.5, n)
+    c = np.tanh(b) - a + rng.normal(0.0, 0.3, n)
+    return pd.DataFrame({"a": a, "b": b, "c": c})
+
+
+@pytest.fixture
+def model(make_scm):
+    scm = make_scm(nx.DiGraph([("a", "b"), ("b", "c"), ("a", "c")]), seed=5)
+    scm.running_stats = RunningStats(["a", "b", "c"]).update(chain_data(500))
+    scm.data_stats = scm.running_stats.to_data_stats()
+    scm.node_losses = {"b": 1.0, "c": 1.0}
+    return scm
+
+
+def predictions(scm, frame: pd.DataFrame) -> dict:
+    return {"b": scm.predict_node("b", frame), "c": scm.predict_node("c", frame)}
+
+
+def test_running_stats_match_the_combined_data():
+    first, second = chain_data(300, seed=1), chain_data(200, seed=2, shift=0.7)
+    stats = RunningStats(["a", "b", "c"]).update(first).update(second)
+    combined = pd.concat([first, second])
+
+    assert stats.count.tolist() == [500, 500, 500]
+    np.testing.assert_allclose(stats.to_data_stats()["mean"], combined.mean())
+    np.testing.assert_allclose(stats.to_data_stats()["std"], combined.std(ddof=1))
+
+
+def test_rescale_keeps_the_function_of_raw_values(model):
+    frame = chain_data(64, seed=3)
+    before = predictions(model, frame)
+
+    old = model.data_stats
+    new = {"mean": old["mean"] + pd.Series({"a": 0.4, "b": -1.0, "c": 2.0}),
+           "std": old["std"] * pd.Series({"a": 1.5, "b": 0.7, "c": 2.0})}
+    model._rescale_models(old, new)
+    model.data_stats = new
+    model.invalidate_plan()
+
+    after = predictions(model, frame)
+    for node in before:
+        np.testing.assert_allclose(after[node], before[node], rtol=1e-4, atol=1e-4)
+
+
+def test_partial_fit_absorbs_rows_from_the_same_distribution(model):
+    batch = chain_data(200, seed=4)
+    combined = pd.concat([chain_data(500), batch])
+
+    report = model.partial_fit(batch, epochs=5)
+    assert report["updated"] and not report["refit_required"]
+    assert set(report["losses"]) == {"b", "c"}
+    np.testing.assert_allclose(model.data_stats["mean"], combined.mean())
+    np.testing.assert_allclose(model.data_stats["std"], combined.std(ddof=1))
+    np.testing.assert_allclose(model.plan.mean, combined.mean().to_numpy(), rtol=1e-6)
+
+
+def test_drift_blocks_the_update_unless_forced(model):
+    batch = chain_data(200, seed=5, shift=3.0)
+    frame = chain_data(16, seed=6)
+    before = predictions(model, frame)
+    mean = model.data_stats["mean"].copy()
+
+    report = model.partial_fit(batch, epochs=5)
+    assert report["refit_required"] and not report["updated"]
+    assert any("mean of a" in reason for reason in report["reasons"])
+    pd.testing.assert_series_equal(model.data_stats["mean"], mean)
+    assert model.running_stats.count.tolist() == [500, 500, 500]
+    for node, values in predictions(model, frame).items():
+        np.testing.assert_array_equal(values, before[node])
+
+    report = model.partial_fit(batch, epochs=5, force=True)
+    assert report["updated"]
+    assert model.running_stats.count.tolist() == [700, 700, 700]
+
+
+def test_partial_fit_needs_running_stats(model):
+    model.running_stats = None
+    report = model.partial_fit(chain_data(50), force=True)
+    assert report["refit_required"] and not report["updated"]
@@ -0,0 +1,80 @@
+from collections import Counter
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.causal_discovery.partition import PartitionedDiscovery, partition, screen
+from src.causal_discovery.stats import SufficientStats
+
+
+def chains(n_chains: int, length: int, n: int = 2000, seed: int = 0) -> pd.DataFrame:
+    """Independent linear chains x{k}_0 -> x{k}_1 -> ... plus one pure-noise column."""
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for k in range(n_chains):
+        prev = rng.normal(size=n)
+        columns[f"x{k}_0"] = prev
+        for j in range(1, length):
+            prev = 1.2 * prev + rng.normal(size=n)
+            columns[f"x{k}_{j}"] = prev
+    columns["noise"] = rng.normal(size=n)
+    return pd.DataFrame(columns)
+
+
+def chain_edges(n_chains: int, length: int) -> set:
+    return {(f"x{k}_{j}", f"x{k}_{j + 1}") for k in range(n_chains) for j in range(length - 1)}
+
+
+def test_screen_keeps_the_moral_graph():
+    data = chains(2, 4)
+    stats = SufficientStats.from_data(data)
+    adj, strength = screen(stats.corr(), stats.n)
+    columns = data.columns.tolist()
+
+    found = {(columns[i], columns[j]) for i, j in zip(*np.nonzero(np.triu(adj)))}
+    assert found == chain_edges(2, 4)
+    np.testing.assert_array_equal(adj, adj.T)
+    assert np.all(np.diag(strength) == 0)
+
+
+def test_partition_bounds_cores_and_skips_isolated_columns():
+    data = chains(3, 5)
+    stats = SufficientStats.from_data(data)
+    adj, strength = screen(stats.corr(), stats.n)
+    clusters = partition(adj, strength, max_cluster_size=3, max_overlap=1)
+
+    cores = [i for core, _ in clusters for i in core]
+    assert sorted(cores) == list(range(15))            # every chain column once, not the noise
+    for core, cluster in clusters:
+        assert len(core) <= 3
+        assert set(core) <= set(cluster)
+        assert len(cluster) - len(core) <= 1
+
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_recovers_chains_split_across_clusters(n_workers):
+    data = chains(2, 5)
+    discovery = PartitionedDiscovery(method="notears", max_cluster_size=3, n_workers=n_workers)
+    graph = discovery.run(data)
+
+    assert len(discovery.clusters) > 2
+    assert nx.is_directed_acyclic_graph(graph)
+    assert set(graph.nodes()) == set(data.columns)
+    # A chain's orientation is not identifiable from standardized data, so compare skeletons
+    assert {frozenset(e) for e in graph.edges()} == {frozenset(e) for e in chain_edges(2, 5)}
+
+
+def test_merge_prefers_votes_and_never_closes_a_cycle():
+    votes = Counter({("a", "b"): 3, ("b", "a"): 1, ("b", "c"): 2, ("c", "a"): 1})
+    graph = PartitionedDiscovery._merge(["a", "b", "c"], votes)
+    assert set(graph.edges()) == {("a", "b"), ("b", "c")}
+    assert graph["a"]["b"]["votes"] == 3
+
+
+def test_rejects_bad_settings():
+    with pytest.raises(ValueError):
+        PartitionedDiscovery(method="lingam")
+    with pytest.raises(ValueError):
+        PartitionedDiscovery(max_cluster_size=1)
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from causallearn.search.ConstraintBased.PC import pc
+
+from src.causal_discovery.pc import pc_from_corr
+from src.causal_discovery.stats import SufficientStats
+
+
+def random_linear_data(seed: int, d: int = 10, n: int = 2000, density: float = 0.25) -> np.ndarray:
+    """Samples from a random linear Gaussian DAG over d nodes (upper-triangular weights)."""
+    rng = np.random.default_rng(seed)
+    W = np.triu(rng.uniform(0.3, 1.5, (d, d)) * (rng.random((d, d)) < density), 1)
+    X = np.zeros((n, d))
+    for j in range(d):
+        X[:, j] = X @ W[:, j] + rng.normal(size=n)
+    return X
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_batched_pc_matches_causal_learn(seed):
+    X = random_linear_data(seed)
+    expected = pc(X, 0.05, "fisherz", True, 0, -1, show_progress=False).G.graph
+
+    stats = SufficientStats(list(range(X.shape[1]))).update(X)
+    result = pc_from_corr(stats.corr(), stats.n, 0.05)
+
+    np.testing.assert_array_equal(result.graph, expected)
+
+
+def test_batched_pc_threads_match_single_thread():
+    X = random_linear_data(0, d=15)
+    stats = SufficientStats(list(range(X.shape[1]))).update(X)
+
+    single = pc_from_corr(stats.corr(), stats.n, 0.05)
+    threaded = pc_from_corr(stats.corr(), stats.n, 0.05, n_jobs=4)
+
+    np.testing.assert_array_equal(threaded.graph, single.graph)
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+import torch
+
+from src.scm.estimator import NodeEstimator
+
+
+def test_plan_is_cached_until_graph_or_models_change(wide_scm):
+    plan = wide_scm.plan
+    assert wide_scm.plan is plan
+
+    wide_scm.models = dict(wide_scm.models)
+    assert wide_scm.plan is not plan
+
+    plan = wide_scm.plan
+    wide_scm.graph.add_edge("f", "g")
+    wide_scm.models["g"] = NodeEstimator(1)
+    wide_scm.invalidate_plan()
+    assert wide_scm.plan is not plan
+    assert wide_scm.plan.parents[wide_scm.plan.index["g"]].tolist() == [wide_scm.plan.index["f"]]
+
+
+def test_plan_matches_graph(wide_scm):
+    plan = wide_scm.plan
+    position = {i: k for k, i in enumerate(plan.topo_order)}
+
+    for node in wide_scm.graph:
+        i = plan.index[node]
+        parents = [plan.nodes[p] for p in plan.parents[i]]
+        assert parents == list(wide_scm.graph.predecessors(node))
+        assert all(position[p] < position[i] for p in plan.parents[i])
+        assert plan.models[i] is wide_scm.models.get(node)
+    np.testing.assert_allclose(plan.mean, wide_scm.data_stats["mean"].reindex(plan.nodes))
+    np.testing.assert_allclose(plan.std, wide_scm.data_stats["std"].reindex(plan.nodes))
+
+
+def test_plan_encodes_and_rejects_unknown_nodes(scm):
+    plan = scm.plan
+    assert plan.encode({"b": 0.0}) == {plan.index["b"]: pytest.approx(4.0)}   # (0 - -2) / 0.5
+    with pytest.raises(ValueError):
+        plan.encode({"z": 1.0})
+
+    X = np.random.default_rng(0).normal(size=(5, len(plan))).astype(np.float32)
+    np.testing.assert_allclose(plan.denormalize(plan.normalize(X)), X, rtol=1e-5, atol=1e-6)
+
+
+def test_predict_node_uses_parents_in_model_input_order(wide_scm):
+    parents = pd.DataFrame(np.random.default_rng(1).normal(size=(8, 3)), columns=["d", "c", "b"])
+    preds = wide_scm.predict_node("e", parents)
+
+    mean, std = wide_scm.data_stats["mean"], wide_scm.data_stats["std"]
+    names = list(wide_scm.graph.predecessors("e"))
+    inputs = ((parents[names] - mean[names]) / std[names]).to_numpy(dtype=np.float32)
+    with torch.no_grad():
+        expected = wide_scm.models["e"](torch.from_numpy(inputs)).numpy().ravel() * std["e"] + mean["e"]
+    np.testing.assert_allclose(preds, expected, rtol=1e-5)
@@ -0,0 +1,98 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.scm.registry import ModelRegistry, model_nbytes, parse_model_id
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ModelRegistry(root=str(tmp_path / "registry"))
+
+
+def graph() -> nx.DiGraph:
+    return nx.DiGraph([("a", "b"), ("b", "c")])
+
+
+def prediction(scm) -> np.ndarray:
+    return scm.predict_node("c", pd.DataFrame({"b": np.linspace(-1, 1, 8)}))
+
+
+def test_parse_model_id():
+    assert parse_model_id(None) == ("default", None)
+    assert parse_model_id("sales") == ("sales", None)
+    assert parse_model_id("sales:3") == ("sales", 3)
+    for bad in ("../x", ".hidden", "a b", "sales:x", "sales:-1"):
+        with pytest.raises(ValueError):
+            parse_model_id(bad)
+
+
+def test_publish_activate_and_roll_back(registry, make_scm):
+    first, second = make_scm(graph(), seed=1), make_scm(graph(), seed=2)
+    assert registry.register("sales", scm=first) == 1
+    assert registry.register("sales", scm=second) == 2
+    assert registry.current_version("sales") == 2
+    np.testing.assert_array_equal(prediction(registry.get("sales")), prediction(second))
+
+    registry.activate("sales", 1)
+    with open(os.path.join(registry.root, "sales", "CURRENT")) as f:
+        assert f.read() == "1"
+    np.testing.assert_array_equal(prediction(registry.get("sales")), prediction(first))
+    assert registry.describe() == {"sales": {"current": 1, "versions": [1, 2]}}
+
+    assert registry.register("sales", scm=make_scm(graph(), seed=3), activate=False) == 3
+    assert registry.current_version("sales") == 1
+    with pytest.raises(KeyError):
+        registry.activate("sales", 9)
+
+
+def test_other_registries_on_the_root_follow_current(registry, make_scm):
+    other = ModelRegistry(root=registry.root)
+    registry.register("sales", scm=make_scm(graph(), seed=1))
+    assert other.current_version("sales") == 1
+
+    second = make_scm(graph(), seed=2)
+    registry.register("sales", scm=second)
+    assert other.current_version("sales") == 2
+    np.testing.assert_array_equal(prediction(other.get("sales")), prediction(second))
+
+
+def test_register_from_path_moves_the_file(registry, make_scm, tmp_path):
+    path = str(tmp_path / "fit.scm")
+    make_scm(graph()).save(path)
+    assert registry.register("sales", path=path) == 1
+    assert not os.path.exists(path)
+    assert os.path.exists(registry.path("sales", 1))
+
+
+def test_missing_models_raise_key_error(registry, make_scm):
+    with pytest.raises(KeyError):
+        registry.get("sales")
+    registry.register("sales", scm=make_scm(graph()))
+    for _ in range(3):
+        with pytest.raises(KeyError):
+            registry.get("sales", 7)
+    assert registry._loading == {}
+
+
+def test_concurrent_publishers_get_distinct_versions(registry, make_scm):
+    models = [make_scm(graph(), seed=k) for k in range(8)]
+    with ThreadPoolExecutor(4) as pool:
+        versions = list(pool.map(lambda scm: registry.register("sales", scm=scm), models))
+    assert sorted(versions) == list(range(1, 9))
+    assert registry.versions("sales") == list(range(1, 9))
+
+
+def test_cache_is_bounded_and_reloads_evicted_versions(tmp_path, make_scm):
+    models = [make_scm(graph(), seed=k) for k in range(3)]
+    registry = ModelRegistry(root=str(tmp_path / "registry"), max_bytes=int(model_nbytes(models[0]) * 1.5))
+    for scm in models:
+        registry.register("sales", scm=scm)
+    assert registry.loaded() == ["sales:3"]
+
+    np.testing.assert_array_equal(prediction(registry.get("sales", 1)), prediction(models[0]))
+    assert registry.loaded() == ["sales:1"]
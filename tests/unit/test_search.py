@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from src.optimization.search import adaptive_search, grid_search
+from src.simulator.simulator import CausalSimulator
+
+
+class CountingPredictor:
+    """Monotone test response that records every batch it is asked for."""
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, values: np.ndarray) -> np.ndarray:
+        self.calls.append(len(values))
+        return values ** 3 + values
+
+
+@pytest.mark.parametrize("search", [grid_search, adaptive_search])
+def test_search_finds_the_value_reaching_the_target(search):
+    predict = CountingPredictor()
+    best, pred = search(predict, 2.0, -3.0, 3.0, n_candidates=48)   # x^3 + x = 2 at x = 1
+
+    assert sum(predict.calls) <= 48
+    assert pred == pytest.approx(best ** 3 + best)
+    assert best == pytest.approx(1.0, abs=0.15 if search is grid_search else 0.01)
+
+
+def test_adaptive_is_finer_than_grid_on_the_same_budget():
+    grid, _ = grid_search(CountingPredictor(), 2.0, -3.0, 3.0, n_candidates=48)
+    adaptive, _ = adaptive_search(CountingPredictor(), 2.0, -3.0, 3.0, n_candidates=48)
+    assert abs(adaptive - 1.0) < abs(grid - 1.0)
+
+
+def test_unreachable_targets_pick_the_nearest_bound():
+    best, _ = adaptive_search(CountingPredictor(), 100.0, -3.0, 3.0)
+    assert best == pytest.approx(3.0)
+
+
+def test_expected_outcomes_use_common_random_numbers(wide_scm):
+    sim = CausalSimulator(wide_scm, backend="fused")
+    values = np.array([-1.0, 0.5, 2.0])
+    batched = sim.expected_outcomes("c", values, "e", n_samples=400, seed=5)
+
+    assert batched.shape == (3,)
+    for k, value in enumerate(values):
+        alone = sim.expected_outcomes("c", [value], "e", n_samples=400, seed=5)
+        assert batched[k] == pytest.approx(alone[0], rel=1e-5)
+    np.testing.assert_array_equal(batched, sim.expected_outcomes("c", values, "e", n_samples=400, seed=5))
@@ -0,0 +1,72 @@
+import pickle
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pytest
+import torch
+
+from src.scm.estimator import CausalSCM
+from src.scm.serialization import ALIGNMENT, is_scm_file, read_header
+from src.scm.stats import RunningStats
+from src.simulator.simulator import CausalSimulator
+
+
+@pytest.fixture
+def model(make_scm):
+    # Edges added out of order, so predecessor order (= model input order) is not alphabetical
+    graph = nx.DiGraph([("c", "d"), ("b", "d"), ("a", "d"), ("a", "b"), ("b", "c")])
+    scm = make_scm(graph, seed=3)
+    rng = np.random.default_rng(0)
+    scm.running_stats = RunningStats(list(graph)).update(pd.DataFrame(rng.normal(size=(50, 4)), columns=list(graph)))
+    scm.node_losses = {"b": 0.25, "c": 0.5, "d": 0.125}
+    return scm
+
+
+def parent_frame(n: int = 64) -> pd.DataFrame:
+    return pd.DataFrame(np.random.default_rng(1).normal(size=(n, 4)), columns=["a", "b", "c", "d"])
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_round_trip_keeps_model_and_predictions(model, tmp_path, mmap):
+    path = str(tmp_path / "model.scm")
+    model.save(path)
+    loaded = CausalSCM.load(path, mmap=mmap)
+
+    assert is_scm_file(path)
+    assert read_header(path)[1] % ALIGNMENT == 0
+    assert list(loaded.graph.nodes()) == list(model.graph.nodes())
+    for node in model.graph:
+        assert list(loaded.graph.predecessors(node)) == list(model.graph.predecessors(node))
+    for key in ("mean", "std"):
+        pd.testing.assert_series_equal(loaded.data_stats[key], model.data_stats[key], check_names=False)
+    np.testing.assert_array_equal(loaded.running_stats.m2, model.running_stats.m2)
+    assert loaded.node_losses == model.node_losses
+
+    frame = parent_frame()
+    for node in ("b", "c", "d"):
+        np.testing.assert_array_equal(loaded.predict_node(node, frame), model.predict_node(node, frame))
+    np.testing.assert_array_equal(CausalSimulator(loaded).sample_blocks({"b": 0.5}, 0, 2, seed=4),
+                                  CausalSimulator(model).sample_blocks({"b": 0.5}, 0, 2, seed=4))
+
+
+def test_in_place_updates_do_not_touch_the_file(model, tmp_path):
+    path = str(tmp_path / "model.scm")
+    model.save(path)
+    loaded = CausalSCM.load(path, mmap=True)
+
+    with torch.no_grad():
+        loaded.models["d"].net[0].weight.add_(1.0)
+    reloaded = CausalSCM.load(path)
+    torch.testing.assert_close(reloaded.models["d"].net[0].weight, model.models["d"].net[0].weight)
+
+
+def test_legacy_pickles_still_load(model, tmp_path):
+    path = str(tmp_path / "model.pkl")
+    with open(path, "wb") as f:
+        pickle.dump(model, f)
+
+    loaded = CausalSCM.load(path)
+    assert not is_scm_file(path)
+    frame = parent_frame()
+    np.testing.assert_array_equal(loaded.predict_node("d", frame), model.predict_node("d", frame))
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from src.simulator.cache import summarize
+from src.simulator.simulator import CausalSimulator
+from src.simulator.streaming import QuantileSketch, stream_summary
+
+QS = [0.01, 0.05, 0.5, 0.95, 0.99]
+
+
+def sample_columns(n: int = 500_000) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return np.column_stack([rng.normal(size=n), rng.exponential(size=n), rng.uniform(size=n)])
+
+
+def test_sketch_matches_exact_quantiles():
+    X = sample_columns()
+    sketch = QuantileSketch(X.shape[1])
+    for start in range(0, len(X), 65536):
+        sketch.update(X[start:start + 65536])
+
+    np.testing.assert_allclose(sketch.quantile(QS), np.quantile(X, QS, axis=0), atol=5e-3)
+
+
+def test_merged_sketches_match_single_sketch():
+    X = sample_columns()
+    parts = [QuantileSketch(X.shape[1]).update(part) for part in np.array_split(X, 4)]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+
+    np.testing.assert_allclose(merged.quantile(QS), np.quantile(X, QS, axis=0), atol=5e-3)
+
+
+def test_sketch_skips_nans():
+    X = sample_columns(100_000)
+    X[::7, 1] = np.nan
+    sketch = QuantileSketch(X.shape[1]).update(X)
+
+    np.testing.assert_allclose(sketch.quantile([0.5])[0], np.nanquantile(X, 0.5, axis=0), atol=5e-3)
+    assert np.isnan(QuantileSketch(2).update(np.full((10, 2), np.nan)).quantile([0.5])).all()
+
+
+@pytest.mark.parametrize("backend", ["fused", "loop"])
+def test_stream_summary_matches_summarize(scm, backend):
+    sim = CausalSimulator(scm, backend=backend)
+    n_samples = 100_000 + 123   # ends inside a block
+    exact = summarize(sim.run_do_query({"b": 1.0}, n_samples, seed=7).to_numpy(), scm.plan.nodes)
+    streamed = stream_summary(sim, {"b": 1.0}, n_samples, seed=7, chunk_blocks=8)
+
+    for node in scm.plan.nodes:
+        assert streamed["mean"][node] == pytest.approx(exact["mean"][node], abs=1e-6)
+        assert streamed["std"][node] == pytest.approx(exact["std"][node], rel=1e-6)
+        assert streamed["lower"][node] == pytest.approx(exact["lower"][node], abs=1e-2)
+        assert streamed["upper"][node] == pytest.approx(exact["upper"][node], abs=1e-2)